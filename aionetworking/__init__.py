@@ -1,9 +1,38 @@
-from .receivers import TCPServer, UDPServer, UnixSocketServer, WindowsPipeServer, PipeServer
-from .senders import TCPClient, UDPClient, UnixSocketClient, WindowsPipeClient, PipeClient
-from .networking import (StreamServerProtocolFactory, StreamClientProtocolFactory, DatagramServerProtocolFactory,
-                         DatagramClientProtocolFactory, ServerSideSSL, ClientSideSSL)
-from .actions import FileStorage, BufferedFileStorage
-from .logging import Logger
-from .futures import TaskScheduler, Counters, Counter, ValueWaiter
-from .formats import JSONObject, JSONCodec
+import importlib
+from aionetworking.compatibility import py37
 
+
+_lazy_imports = {
+    'TCPServer': 'receivers', 'UDPServer': 'receivers', 'UnixSocketServer': 'receivers',
+    'WindowsPipeServer': 'receivers', 'PipeServer': 'receivers',
+    'TCPClient': 'senders', 'UDPClient': 'senders', 'UnixSocketClient': 'senders', 'WindowsPipeClient': 'senders',
+    'PipeClient': 'senders', 'ClientPool': 'senders',
+    'StreamServerProtocolFactory': 'networking', 'StreamClientProtocolFactory': 'networking',
+    'DatagramServerProtocolFactory': 'networking', 'DatagramClientProtocolFactory': 'networking',
+    'ServerSideSSL': 'networking', 'ClientSideSSL': 'networking',
+    'FileStorage': 'actions', 'BufferedFileStorage': 'actions',
+    'Logger': 'logging',
+    'TaskScheduler': 'futures', 'Counters': 'futures', 'Counter': 'futures', 'ValueWaiter': 'futures',
+    'WorkQueue': 'futures', 'KeyedExecutor': 'futures',
+    'JSONObject': 'formats', 'JSONCodec': 'formats',
+}
+
+__all__ = list(_lazy_imports)
+
+
+def __getattr__(name):
+    module = _lazy_imports.get(name)
+    if not module:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'{__name__}.{module}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
+
+
+if not py37:
+    from pep562 import Pep562
+    Pep562(__name__)
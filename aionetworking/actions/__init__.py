@@ -1,3 +1,6 @@
 from .base import BaseAction, EmptyAction
 from .echo import EchoAction
+from .broadcast import Broadcaster, BroadcastAction, Subscriber
 from .file_storage import FileStorage, BufferedFileStorage, ManagedFile
+from .router import Route, RouterAction
+from .response_cache import ResponseCache
@@ -5,10 +5,11 @@ from aionetworking.logging.loggers import get_logger_receiver
 from aionetworking.types.logging import LoggerType
 from aionetworking.types.formats import MessageObjectType
 from aionetworking.futures.value_waiters import StatusWaiter
-from aionetworking.utils import dataclass_getstate, dataclass_setstate
+from aionetworking.utils import dataclass_getstate, dataclass_setstate, FilterType
 from .protocols import ActionProtocol
+from .response_cache import ResponseCache
 
-from typing import Any, TypeVar, AsyncGenerator
+from typing import Any, TypeVar, AsyncGenerator, Iterable, List
 
 
 ActionType = TypeVar('ActionType', bound='BaseAction')
@@ -23,6 +24,8 @@ class BaseAction(ActionProtocol, Protocol):
     _status: StatusWaiter = field(default_factory=StatusWaiter, compare=False, repr=False)
 
     timeout: int = 5
+    exclude: FilterType = None
+    response_cache: ResponseCache = None
 
     def _set_logger(self, logger: LoggerType = None) -> None:
         parent_logger = logger or self.logger
@@ -38,8 +41,16 @@ class BaseAction(ActionProtocol, Protocol):
         dataclass_setstate(self, state)
 
     def filter(self, msg: MessageObjectType) -> bool:
+        if self.exclude and self.exclude(msg):
+            return True
         return msg.filter()
 
+    def filter_many(self, msgs: Iterable[MessageObjectType]) -> List[bool]:
+        msgs = list(msgs)
+        if self.exclude:
+            return [excluded or msg.filter() for msg, excluded in zip(msgs, self.exclude.filter_many(msgs))]
+        return [msg.filter() for msg in msgs]
+
     async def get_notifications(self, peer: str) -> AsyncGenerator[None, None]:
         yield
 
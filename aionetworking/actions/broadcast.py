@@ -0,0 +1,149 @@
+from dataclasses import dataclass, field
+from collections import defaultdict
+
+from aionetworking.types.formats import MessageObjectType, CodecType
+from aionetworking.types.logging import LoggerType
+from aionetworking.logging.loggers import get_logger_receiver
+from .base import BaseAction
+
+from typing import Any, Callable, DefaultDict, Dict, Iterable, Optional, Set, Type
+
+
+class Subscriber:
+    """
+    A connection which can receive broadcasts. Writes go straight to the connection's transport so no task is needed
+    per connection.
+    """
+    __slots__ = ('peer', 'dataformat', 'send', 'close', 'write_buffer_size', 'dropped')
+
+    def __init__(self, peer: str, dataformat: Type[MessageObjectType], send: Callable[[bytes], Any],
+                 close: Callable[[], None] = None, write_buffer_size: Callable[[], int] = None):
+        self.peer = peer
+        self.dataformat = dataformat
+        self.send = send
+        self.close = close
+        self.write_buffer_size = write_buffer_size
+        self.dropped = 0
+
+    def is_slow(self, max_buffer_size: int) -> bool:
+        return self.write_buffer_size is not None and self.write_buffer_size() > max_buffer_size
+
+
+@dataclass
+class Broadcaster:
+    """
+    Topic based publish/subscribe for connections. Each published item is encoded once per dataformat and the same
+    bytes are written to every subscriber. Subscribers whose transport buffer grows beyond max_buffer_size are either
+    skipped until they catch up (drop) or disconnected (disconnect). Subscribers which cannot be closed, such as
+    datagram connections sharing one transport, are only removed by the disconnect policy.
+    """
+    slow_subscriber_policy: str = 'drop'
+    max_buffer_size: Optional[int] = 1048576
+    logger: LoggerType = field(default_factory=get_logger_receiver, compare=False, repr=False)
+    _subscribers: Dict[str, Subscriber] = field(default_factory=dict, init=False, compare=False, repr=False)
+    _topics: DefaultDict[str, Set[str]] = field(default_factory=lambda: defaultdict(set), init=False, compare=False,
+                                                repr=False)
+    _codecs: Dict[Type[MessageObjectType], CodecType] = field(default_factory=dict, init=False, compare=False,
+                                                              repr=False)
+
+    def __post_init__(self):
+        if self.slow_subscriber_policy not in ('drop', 'disconnect'):
+            raise ValueError(f'Slow subscriber policy must be drop or disconnect, not {self.slow_subscriber_policy}')
+
+    def add_subscriber(self, subscriber: Subscriber) -> None:
+        self._subscribers[subscriber.peer] = subscriber
+
+    def remove_subscriber(self, peer: str) -> None:
+        if self._subscribers.pop(peer, None):
+            for topic in list(self._topics):
+                self._unsubscribe(topic, peer)
+
+    def subscribe(self, peer: str, topic: str) -> None:
+        if peer not in self._subscribers:
+            raise KeyError(f'{peer} is not connected')
+        self._topics[topic].add(peer)
+
+    def _unsubscribe(self, topic: str, peer: str) -> None:
+        peers = self._topics.get(topic)
+        if peers:
+            peers.discard(peer)
+            if not peers:
+                del self._topics[topic]
+
+    def unsubscribe(self, peer: str, topic: str) -> None:
+        self._unsubscribe(topic, peer)
+
+    def subscriptions(self, peer: str) -> Set[str]:
+        return {topic for topic, peers in self._topics.items() if peer in peers}
+
+    def num_subscribers(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    def _get_codec(self, dataformat: Type[MessageObjectType]) -> CodecType:
+        codec = self._codecs.get(dataformat)
+        if not codec:
+            codec = self._codecs[dataformat] = dataformat.get_codec(None)
+        return codec
+
+    def _write(self, subscriber: Subscriber, encoded: bytes) -> bool:
+        if self.max_buffer_size is not None and subscriber.is_slow(self.max_buffer_size):
+            if self.slow_subscriber_policy == 'disconnect':
+                self.logger.warning('Disconnecting slow subscriber %s', subscriber.peer)
+                self.remove_subscriber(subscriber.peer)
+                if subscriber.close:
+                    subscriber.close()
+            else:
+                subscriber.dropped += 1
+            return False
+        subscriber.send(encoded)
+        return True
+
+    def publish_encoded(self, topic: str, encoded: bytes, peers: Iterable[str] = None) -> int:
+        num_sent = 0
+        for peer in list(peers if peers is not None else self._topics.get(topic, ())):
+            subscriber = self._subscribers.get(peer)
+            if subscriber and self._write(subscriber, encoded):
+                num_sent += 1
+        return num_sent
+
+    async def publish(self, topic: str, decoded: Any) -> int:
+        peers = self._topics.get(topic)
+        if not peers:
+            return 0
+        by_dataformat = defaultdict(list)
+        for peer in peers:
+            by_dataformat[self._subscribers[peer].dataformat].append(peer)
+        num_sent = 0
+        for dataformat, dataformat_peers in by_dataformat.items():
+            msg_obj = await self._get_codec(dataformat).encode_obj(decoded)
+            num_sent += self.publish_encoded(topic, msg_obj.encoded, peers=dataformat_peers)
+        return num_sent
+
+
+@dataclass
+class BroadcastAction(BaseAction):
+    """
+    Base for actions which push updates to subscribed connections. Connections register with the broadcaster when
+    they are opened and are removed when they close, subclasses call subscribe and publish from do_one.
+    """
+    supports_broadcast = True
+    broadcaster: Broadcaster = field(default_factory=Broadcaster, compare=False)
+
+    async def start(self, logger: LoggerType = None) -> None:
+        await super().start(logger=logger)
+        self.broadcaster.logger = self.logger
+
+    def add_subscriber(self, subscriber: Subscriber) -> None:
+        self.broadcaster.add_subscriber(subscriber)
+
+    def remove_subscriber(self, peer: str) -> None:
+        self.broadcaster.remove_subscriber(peer)
+
+    def subscribe(self, msg: MessageObjectType, topic: str) -> None:
+        self.broadcaster.subscribe(msg.context['peer'], topic)
+
+    def unsubscribe(self, msg: MessageObjectType, topic: str) -> None:
+        self.broadcaster.unsubscribe(msg.context['peer'], topic)
+
+    async def publish(self, topic: str, decoded: Any) -> int:
+        return await self.broadcaster.publish(topic, decoded)
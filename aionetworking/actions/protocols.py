@@ -14,6 +14,7 @@ ActionType = TypeVar('ActionType', bound='BaseActionProtocol')
 @dataclass
 class ActionProtocol(Protocol):
     supports_notifications = False
+    supports_broadcast = False
     task_timeout: int = 10
 
     @abstractmethod
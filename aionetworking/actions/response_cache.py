@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import time
+
+from aionetworking.types.formats import MessageObjectType
+from aionetworking.utils import dataclass_getstate, dataclass_setstate
+
+from typing import Any, Hashable, Optional, Sequence, Tuple, Union
+
+
+Template = Tuple[bytes, Optional[bytes]]
+
+
+def freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return dict, tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return list, tuple(freeze(v) for v in value)
+    hash(value)
+    return value.__class__, value
+
+
+@dataclass
+class ResponseCache:
+    """
+    Caches the encoded responses of an action which always gives the same response to the same request. Requests are
+    keyed by method and params so the id does not matter, only the methods given are cached if any. The response is
+    stored as the encoded bytes either side of its id so a hit only joins them around the new request's id, skipping
+    both the action and the encode step. Least recently used responses are evicted to stay within max_entries and
+    max_bytes and entries expire after ttl seconds. Only codecs which support response templates can be cached.
+    """
+    methods: Sequence[str] = field(default_factory=tuple)
+    ttl: Union[int, float] = 60
+    max_entries: int = 10000
+    max_bytes: int = 10 * 1024 * 1024
+    hits: int = field(default=0, init=False, compare=False, repr=False)
+    misses: int = field(default=0, init=False, compare=False, repr=False)
+    _entries: 'OrderedDict[Hashable, Tuple[float, Template]]' = field(default_factory=OrderedDict, init=False,
+                                                                      compare=False, repr=False)
+    _size: int = field(default=0, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.methods = frozenset(self.methods)
+
+    def __getstate__(self):
+        return dataclass_getstate(self)
+
+    def __setstate__(self, state):
+        dataclass_setstate(self, state)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get_key(self, msg: MessageObjectType) -> Optional[Hashable]:
+        decoded = msg.decoded
+        if not isinstance(decoded, dict):
+            return None
+        method = decoded.get('method')
+        if method is None or (self.methods and method not in self.methods):
+            return None
+        try:
+            return method, freeze(decoded.get('params'))
+        except TypeError:
+            return None
+
+    def _remove(self, key: Hashable) -> None:
+        expires, (prefix, suffix) = self._entries.pop(key)
+        self._size -= len(prefix) + len(suffix or b'')
+
+    def get(self, key: Hashable) -> Optional[Template]:
+        entry = self._entries.get(key)
+        if entry:
+            expires, template = entry
+            if expires and expires <= time.monotonic():
+                self._remove(key)
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return template
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, template: Template) -> None:
+        prefix, suffix = template
+        size = len(prefix) + len(suffix or b'')
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires = time.monotonic() + self.ttl if self.ttl else 0
+        self._entries[key] = (expires, template)
+        self._size += size
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
@@ -0,0 +1,226 @@
+import asyncio
+from dataclasses import dataclass, field, replace
+import time
+
+from aionetworking.compatibility import create_task, set_task_name
+from aionetworking.futures.schedulers import TaskScheduler
+from aionetworking.logging.utils_logging import LatencyHistogram
+from aionetworking.networking.allowed_senders import AllowedSenders
+from aionetworking.types.formats import MessageObjectType
+from aionetworking.types.logging import LoggerType
+from aionetworking.utils import FilterType, IPNetwork
+from .base import BaseAction
+from .protocols import ActionProtocol
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+
+@dataclass
+class Route:
+    """
+    Sends messages matching all the given conditions to one child action. Messages are queued and run by up to
+    concurrency workers so a slow action does not hold up the others. If respond is False the router returns as soon
+    as the message is queued, otherwise it waits for the action's result to send back to the peer.
+    """
+    action: ActionProtocol
+    name: str = None
+    methods: Sequence[str] = field(default_factory=tuple)
+    message_types: Sequence[str] = field(default_factory=tuple)
+    peers: Union[AllowedSenders, Sequence[IPNetwork]] = field(default_factory=tuple)
+    when: FilterType = None
+    concurrency: int = 10
+    max_queue_size: int = 1000
+    respond: bool = True
+    _matches: Callable[[MessageObjectType], bool] = field(default=None, init=False, compare=False, repr=False)
+    _queue: asyncio.Queue = field(default=None, init=False, compare=False, repr=False)
+    _workers: List[asyncio.Task] = field(default_factory=list, init=False, compare=False, repr=False)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram, init=False, compare=False, repr=False)
+    processed: int = field(default=0, init=False, compare=False, repr=False)
+    failed: int = field(default=0, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.name = self.name or self.action.__class__.__name__
+        if self.peers and not isinstance(self.peers, AllowedSenders):
+            self.peers = AllowedSenders(self.peers)
+        self._matches = self.compile()
+
+    def compile(self) -> Callable[[MessageObjectType], bool]:
+        checks = []
+        if self.methods:
+            methods = frozenset(self.methods)
+            checks.append(lambda msg: msg.get('method') in methods)
+        if self.message_types:
+            message_types = frozenset(self.message_types)
+            checks.append(lambda msg: msg.name in message_types or msg.__class__.__name__ in message_types)
+        if self.peers:
+            peers = self.peers
+            checks.append(lambda msg: peers.is_allowed(msg.context.get('address'), msg.context.get('host')))
+        if self.when:
+            checks.append(self.when.compile())
+        checks = tuple(checks)
+
+        def matches(msg: MessageObjectType) -> bool:
+            for check in checks:
+                if not check(msg):
+                    return False
+            return True
+        return matches
+
+    def matches(self, msg: MessageObjectType) -> bool:
+        return self._matches(msg)
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def _run(self, msg: MessageObjectType) -> Any:
+        start = time.perf_counter()
+        try:
+            if self.action.filter(msg):
+                return None
+            result = await self.action.do_one(msg)
+        except BaseException:
+            self.failed += 1
+            raise
+        self.latency.record(time.perf_counter() - start)
+        self.processed += 1
+        return result
+
+    def _on_failed(self, msg: MessageObjectType, exc: BaseException) -> None:
+        try:
+            self.action.logger.error('Route %s failed to process %s: %s', self.name, msg, exc)
+        except Exception:
+            # A worker which exits leaves put() waiting on a queue which nothing reads
+            pass
+
+    async def _work(self) -> None:
+        while True:
+            msg, fut = await self._queue.get()
+            try:
+                result = await self._run(msg)
+                if fut and not fut.done():
+                    fut.set_result(result)
+            except asyncio.CancelledError:
+                if fut:
+                    fut.cancel()
+                raise
+            except Exception as exc:
+                if fut and not fut.done():
+                    fut.set_exception(exc)
+                else:
+                    self._on_failed(msg, exc)
+            finally:
+                self._queue.task_done()
+
+    async def put(self, msg: MessageObjectType) -> Any:
+        fut = asyncio.get_event_loop().create_future() if self.respond else None
+        await self._queue.put((msg, fut))
+        if fut:
+            return await fut
+        return None
+
+    async def start(self, logger: LoggerType = None) -> None:
+        await self.action.start(logger=logger)
+        self._queue = asyncio.Queue(self.max_queue_size)
+        for i in range(self.concurrency):
+            task = create_task(self._work())
+            set_task_name(task, f'Route {self.name} worker {i}')
+            self._workers.append(task)
+
+    async def close(self) -> None:
+        if self._queue:
+            await self._queue.join()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        await self.action.close()
+
+
+@dataclass
+class RouterAction(BaseAction):
+    """
+    Dispatches each message to the routes whose conditions it matches, in order. Only the first matching route is used
+    unless fan_out is set, messages which match no route go to the default action if there is one. Latency and
+    throughput are tracked per route and logged every stats_interval seconds.
+    """
+    routes: Sequence[Route] = field(default_factory=tuple)
+    default: ActionProtocol = None
+    fan_out: bool = False
+    stats_interval: Union[int, float] = 0
+    _scheduler: TaskScheduler = field(default_factory=TaskScheduler, init=False, compare=False, repr=False)
+    _last_stats: Dict[str, Tuple[float, int]] = field(default_factory=dict, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.routes = tuple(replace(route, action=replace(route.action)) for route in self.routes)
+        if self.default:
+            self.default = replace(self.default)
+
+    def _get_routes(self, msg: MessageObjectType) -> List[Route]:
+        routes = []
+        for route in self.routes:
+            if route._matches(msg):
+                routes.append(route)
+                if not self.fan_out:
+                    break
+        return routes
+
+    async def do_one(self, msg: MessageObjectType) -> Any:
+        routes = self._get_routes(msg)
+        if not routes:
+            if self.default and not self.default.filter(msg):
+                return await self.default.do_one(msg)
+            return None
+        if len(routes) == 1:
+            return await routes[0].put(msg)
+        results = await asyncio.gather(*[route.put(msg) for route in routes])
+        return next((result for result in results if result is not None), None)
+
+    def _get_action(self, msg: MessageObjectType = None) -> Optional[ActionProtocol]:
+        routes = self._get_routes(msg) if msg is not None else None
+        if routes:
+            return routes[0].action
+        return self.default
+
+    def on_decode_error(self, data: bytes, exc: BaseException) -> Any:
+        action = self._get_action()
+        return action.on_decode_error(data, exc) if action else None
+
+    def on_exception(self, msg: MessageObjectType, exc: BaseException) -> Any:
+        action = self._get_action(msg)
+        return action.on_exception(msg, exc) if action else None
+
+    def route_stats(self) -> Dict[str, Dict[str, float]]:
+        return {route.name: {'processed': route.processed, 'failed': route.failed, 'queued': route.queue_size,
+                             'mean_latency': route.latency.mean, 'p99_latency': route.latency.p99}
+                for route in self.routes}
+
+    def log_route_stats(self) -> None:
+        now = time.monotonic()
+        for route in self.routes:
+            last_time, last_processed = self._last_stats.get(route.name, (now, 0))
+            elapsed = now - last_time
+            rate = (route.processed - last_processed) / elapsed if elapsed else 0.0
+            self.logger.info('Route %s: %s processed, %s failed, %s queued, %.1f/s, latency mean %.3fms p99 %.3fms',
+                             route.name, route.processed, route.failed, route.queue_size, rate, route.latency.mean,
+                             route.latency.p99)
+            self._last_stats[route.name] = (now, route.processed)
+
+    async def start(self, logger: LoggerType = None) -> None:
+        await super().start(logger=logger)
+        coros = [route.start(logger=logger) for route in self.routes]
+        if self.default:
+            coros.append(self.default.start(logger=logger))
+        await asyncio.gather(*coros)
+        if self.stats_interval:
+            now = time.monotonic()
+            self._last_stats = {route.name: (now, route.processed) for route in self.routes}
+            self._scheduler.call_cb_periodic(self.stats_interval, self.log_route_stats, task_name='Log route stats')
+
+    async def close(self) -> None:
+        await self._scheduler.close()
+        coros = [route.close() for route in self.routes]
+        if self.default:
+            coros.append(self.default.close())
+        await asyncio.gather(*coros)
+        await super().close()
@@ -1,7 +1,10 @@
 import yaml
 from .base import EmptyAction
+from .broadcast import Broadcaster
 from .echo import EchoAction
 from .file_storage import FileStorage, BufferedFileStorage
+from .router import Route, RouterAction
+from .response_cache import ResponseCache
 
 
 def echo_action_constructor(loader, node) -> EchoAction:
@@ -24,6 +27,26 @@ def buffered_file_storage_constructor(loader, node) -> BufferedFileStorage:
     return BufferedFileStorage(**value)
 
 
+def broadcaster_constructor(loader, node) -> Broadcaster:
+    value = loader.construct_mapping(node) if node.value else {}
+    return Broadcaster(**value)
+
+
+def route_constructor(loader, node) -> Route:
+    value = loader.construct_mapping(node, deep=True)
+    return Route(**value)
+
+
+def router_action_constructor(loader, node) -> RouterAction:
+    value = loader.construct_mapping(node, deep=True) if node.value else {}
+    return RouterAction(**value)
+
+
+def response_cache_constructor(loader, node) -> ResponseCache:
+    value = loader.construct_mapping(node, deep=True) if node.value else {}
+    return ResponseCache(**value)
+
+
 def load_echo_action(Loader=yaml.SafeLoader):
     yaml.add_constructor('!EchoAction', echo_action_constructor, Loader=Loader)
 
@@ -39,3 +62,19 @@ def load_file_storage(Loader=yaml.SafeLoader):
 def load_buffered_file_storage(Loader=yaml.SafeLoader):
     yaml.add_constructor('!BufferedFileStorage', buffered_file_storage_constructor, Loader=Loader)
 
+
+
+def load_broadcaster(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!Broadcaster', broadcaster_constructor, Loader=Loader)
+
+
+def load_route(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!Route', route_constructor, Loader=Loader)
+
+
+def load_router_action(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!RouterAction', router_action_constructor, Loader=Loader)
+
+
+def load_response_cache(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!ResponseCache', response_cache_constructor, Loader=Loader)
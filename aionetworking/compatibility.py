@@ -40,6 +40,7 @@ if py37:
     all_tasks = asyncio.all_tasks
     WindowsSelectorEventLoopPolicy = getattr(asyncio, 'WindowsSelectorEventLoopPolicy', None)
     WindowsProactorEventLoopPolicy = getattr(asyncio, 'WindowsProactorEventLoopPolicy', None)
+    BufferedProtocol = asyncio.BufferedProtocol
 
     def net_subnet_of(a, b) -> bool:
         return a.subnet_of(b)
@@ -71,6 +72,9 @@ else:
 
     get_running_loop = asyncio.events._get_running_loop
 
+    # No BufferedProtocol before python 3.7, buffered connections fall back to data_received
+    BufferedProtocol = asyncio.Protocol
+
     def create_task(coro: Coroutine) -> asyncio.Task:
         """Schedule the execution of a coroutine object in a spawn task.
         Return a Task object.
@@ -224,6 +228,47 @@ def is_builtin_loop() -> bool:
     return is_selector() or is_proactor()
 
 
+def is_uvloop(loop: asyncio.AbstractEventLoop = None) -> bool:
+    loop = loop or asyncio.get_event_loop()
+    return type(loop).__module__.split('.')[0] == 'uvloop'
+
+
+def get_loop_name(loop: asyncio.AbstractEventLoop = None) -> str:
+    loop = loop or asyncio.get_event_loop()
+    if is_uvloop(loop):
+        return 'uvloop'
+    if is_proactor(loop):
+        return 'proactor'
+    if isinstance(loop, asyncio.SelectorEventLoop):
+        return 'selector'
+    return type(loop).__name__
+
+
+def supports_buffered_protocol(loop: asyncio.AbstractEventLoop = None) -> bool:
+    if not py37:
+        return False
+    loop = loop or asyncio.get_event_loop()
+    if is_proactor(loop):
+        return py38
+    return is_uvloop(loop) or isinstance(loop, asyncio.SelectorEventLoop)
+
+
+def supports_sock_recvfrom_into(loop: asyncio.AbstractEventLoop = None) -> bool:
+    loop = loop or asyncio.get_event_loop()
+    return hasattr(loop, 'sock_recvfrom_into')
+
+
+def loop_capabilities(loop: asyncio.AbstractEventLoop = None) -> Dict[str, Any]:
+    loop = loop or asyncio.get_event_loop()
+    return {
+        'loop': get_loop_name(loop),
+        'buffered_protocol': supports_buffered_protocol(loop),
+        'sock_recvfrom_into': supports_sock_recvfrom_into(loop),
+        'datagram': datagram_supported(loop),
+        'unix_sockets': hasattr(socket, 'AF_UNIX'),
+    }
+
+
 def supports_keyboard_interrupt() -> bool:
     return os.name != 'nt' or (py38 and is_proactor())
 
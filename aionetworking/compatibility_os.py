@@ -3,50 +3,52 @@ import asyncio
 import os
 import platform
 import sys
-from functools import partial
-try:
-    import psutil
-except ImportError:
-    psutil = None
+from functools import lru_cache, partial
 
 from aionetworking.types.logging import LoggerType
 
 
-from typing import Callable
-try:
-    from systemd import daemon
-    from systemd import journal
+from typing import Any, Callable, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def _systemd() -> Optional[Tuple[Any, Any]]:
+    try:
+        from systemd import daemon
+        from systemd import journal
+        return daemon, journal
+    except ImportError:
+        return None
+
+
+def _notify(state: str) -> None:
+    systemd = _systemd()
+    if systemd:
+        systemd[0].notify(state)
+
 
-    def send_to_journal(*args, logger: LoggerType=None, **kwargs):
+def send_to_journal(*args, logger: LoggerType = None, **kwargs):
+    systemd = _systemd()
+    if systemd:
         if logger:
-           logger.info(args[0])
-        journal.send(*args, **kwargs)
+            logger.info(args[0])
+        systemd[1].send(*args, **kwargs)
 
-    def send_ready():
-        daemon.notify('READY=1')
 
-    def send_status(status: str):
-        daemon.notify(f'STATUS={status}')
+def send_ready():
+    _notify('READY=1')
 
-    def send_stopping():
-        daemon.notify('STOPPING=1')
 
-    def send_reloading():
-       daemon.notify('RELOADING=1')
-except ImportError:
-    def send_to_journal(*args, **kwargs): ...
+def send_status(status: str):
+    _notify(f'STATUS={status}')
 
-    def send_ready():
-        pass
 
-    def send_status(status: str):
-        pass
+def send_stopping():
+    _notify('STOPPING=1')
 
-    def send_stopping():
-        pass
 
-    def send_reloading():
-        pass
+def send_reloading():
+    _notify('RELOADING=1')
 
 
 def loop_on_signal(signum: int, callback: Callable, logger: LoggerType = None):
@@ -67,6 +69,12 @@ def loop_on_user1_signal(callback: Callable, logger: LoggerType = None):
         loop.add_signal_handler(signal.SIGUSR1, partial(loop_on_signal, signal.SIGUSR1, callback, logger))
 
 
+def loop_on_user2_signal(callback: Callable, logger: LoggerType = None):
+    if os.name == 'posix':
+        loop = asyncio.get_event_loop()
+        loop.add_signal_handler(signal.SIGUSR2, partial(loop_on_signal, signal.SIGUSR2, callback, logger))
+
+
 def loop_on_close_signal(callback: Callable, logger: LoggerType = None):
     if os.name == 'posix':
         loop = asyncio.get_event_loop()
@@ -80,6 +88,7 @@ def loop_remove_signals():
         loop.remove_signal_handler(signal.SIGTERM)
         loop.remove_signal_handler(signal.SIGINT)
         loop.remove_signal_handler(signal.SIGUSR1)
+        loop.remove_signal_handler(signal.SIGUSR2)
 
 
 def send_notify_start_signal(pid: int):
@@ -96,10 +105,10 @@ def is_aix() -> bool:
 
 
 if os.name == 'posix':
-    import pamela
     authentication_type = 'PAM'
 
     def authenticate(username: str, password: str, pam_service: str = 'sftplogin', **kwargs) -> bool:
+        import pamela
         try:
             pamela.authenticate(username, password, pam_service)
             return True
@@ -129,6 +138,7 @@ def windows_and_is_administrator() -> bool:
 
 
 def has_ip_address(ip: str) -> bool:
+    import psutil
     interfaces = psutil.net_if_addrs().values()
     for i in interfaces:
         if any(a.address == ip for a in i):
@@ -1,32 +1,39 @@
 import asyncio
 import yaml
 import os
+import time
 from dataclasses import dataclass, field
 
 from logging.config import dictConfig
 from aionetworking.actions.yaml_constructors import load_file_storage, load_buffered_file_storage, load_echo_action, \
-    load_empty_action
+    load_empty_action, load_broadcaster, load_route, load_router_action, load_response_cache
+from aionetworking.compatibility import create_task
 from aionetworking.compatibility_os import loop_on_close_signal, loop_on_user1_signal, send_status, \
     send_ready, send_reloading
-from aionetworking.conf.yaml_constructors import load_logger, load_receiver_logger, load_sender_logger
+from aionetworking.conf.yaml_constructors import (load_logger, load_receiver_logger, load_sender_logger,
+                                                  load_metrics_server, load_slow_msg_sampler, load_deferred)
 from aionetworking.formats.contrib.yaml_constructors import load_json, load_pickle
 from aionetworking.logging.loggers import get_logger_receiver
 from aionetworking.networking.yaml_constructors import (load_server_side_ssl, load_client_side_ssl,
                                                         load_stream_server_protocol_factory,
                                                         load_datagram_server_protocol_factory,
                                                         load_stream_client_protocol_factory,
-                                                        load_datagram_client_protocol_factory)
+                                                        load_datagram_client_protocol_factory,
+                                                        load_shared_memory_worker_pool, load_hostname_resolver,
+                                                        load_allowed_senders, load_work_queue,
+                                                        load_keyed_executor, load_deduplicator)
 from aionetworking.receivers.yaml_constructors import load_tcp_server, load_udp_server, load_pipe_server
 from aionetworking.requesters.yaml_constructors import load_echo_requester
 from aionetworking.types.logging import LoggerType
 from aionetworking.types.receivers import ReceiverType
 from aionetworking.types.senders import SenderType
-from aionetworking.senders.yaml_constructors import load_tcp_client, load_udp_client, load_pipe_client
-from .yaml_constructors import load_ip_network, load_path, load_default_ports, load_env_variable
+from aionetworking.senders.yaml_constructors import load_tcp_client, load_udp_client, load_pipe_client, \
+    load_client_pool
+from .yaml_constructors import load_ip_network, load_filter, load_path, load_default_ports, load_env_variable
 from aionetworking import settings
 
 from pathlib import Path
-from typing import Union, Dict, TextIO
+from typing import Union, Dict, Optional, TextIO
 
 
 def get_paths(app_home: Union[str, Path] = None, volatile_home: Union[str, Path] = None,
@@ -51,22 +58,36 @@ def load_minimal_tags() -> None:
     load_logger()
     load_receiver_logger()
     load_sender_logger()
+    load_metrics_server()
+    load_slow_msg_sampler()
     load_tcp_server()
     load_tcp_client()
     load_udp_server()
     load_udp_client()
     load_pipe_server()
     load_pipe_client()
+    load_client_pool()
     load_server_side_ssl()
     load_client_side_ssl()
     load_stream_server_protocol_factory()
     load_datagram_server_protocol_factory()
     load_stream_client_protocol_factory()
     load_datagram_client_protocol_factory()
+    load_shared_memory_worker_pool()
+    load_hostname_resolver()
+    load_allowed_senders()
+    load_work_queue()
+    load_keyed_executor()
+    load_deduplicator()
     load_json()
     load_pickle()
     load_ip_network()
+    load_filter()
     load_echo_action()
+    load_broadcaster()
+    load_route()
+    load_router_action()
+    load_response_cache()
     load_empty_action()
     load_buffered_file_storage()
     load_file_storage()
@@ -75,14 +96,12 @@ def load_minimal_tags() -> None:
 
 def load_all_tags():
     load_minimal_tags()
-    from aionetworking.networking.yaml_constructors_sftp import (load_sftp_server_protocol_factory,
-                                                                 load_sftp_client_protocol_factory)
-    from aionetworking.receivers.yaml_constructors_sftp import load_sftp_server
-    from aionetworking.senders.yaml_constructors_sftp import load_sftp_client
-    load_sftp_server_protocol_factory()
-    load_sftp_client_protocol_factory()
-    load_sftp_server()
-    load_sftp_client()
+    load_deferred('!SFTPServerProtocolFactory', 'aionetworking.networking.yaml_constructors_sftp',
+                  'sftp_server_protocol_factory_constructor')
+    load_deferred('!SFTPClientProtocolFactory', 'aionetworking.networking.yaml_constructors_sftp',
+                  'sftp_client_protocol_factory_constructor')
+    load_deferred('!SFTPServer', 'aionetworking.receivers.yaml_constructors_sftp', 'sftp_server_constructor')
+    load_deferred('!SFTPClient', 'aionetworking.senders.yaml_constructors_sftp', 'sftp_client_constructor')
 
 
 def configure_logging(path: Path):
@@ -158,6 +177,8 @@ class SignalServerManager:
         self._stop_event = asyncio.Event()
         self._restart_event = asyncio.Event()
         self._restart_event.set()
+        self._next_server: Optional[ReceiverType] = None
+        self._reload_task: Optional[asyncio.Task] = None
         self.server = self.get_server()
         loop_on_close_signal(self.close, self.logger)
         loop_on_user1_signal(self.check_reload, self.logger)
@@ -177,7 +198,7 @@ class SignalServerManager:
                 self._last_modified_time = last_modified
                 self.logger.info('Restarting server')
                 send_status('Restarting server')
-                self._restart_event.set()
+                self._reload_task = create_task(self.reload())
             else:
                 send_ready()
         else:
@@ -195,10 +216,42 @@ class SignalServerManager:
     def get_server(self) -> ReceiverType:
         return server_from_config_file(self.conf_path, self.paths)
 
+    async def reload(self) -> None:
+        started = time.monotonic()
+        try:
+            new_server = self.get_server()
+        except Exception as e:
+            self.logger.error('Unable to load %s, keeping current config: %s', self.conf_path, e)
+            send_ready()
+            return
+        changed = self.server.changed_fields(new_server)
+        if not changed:
+            self.logger.info('No changes found in %s', self.conf_path)
+            send_ready()
+        elif self.server.can_reload(new_server):
+            changed = await self.server.reload(new_server)
+            self.logger.info('Reloaded %s in place', ', '.join(sorted(changed)))
+            send_ready()
+        else:
+            await self._handoff(new_server)
+        self.logger.info('Config reload took %.3fs', time.monotonic() - started)
+
+    async def _handoff(self, new_server: ReceiverType) -> None:
+        self.server.hand_off(new_server)
+        try:
+            await new_server.start()
+        except OSError as e:
+            self.logger.warning('Unable to start new server alongside the current one, restarting instead: %s', e)
+        else:
+            self.logger.info('New server started, previous server will close once its connections have drained')
+            self._next_server = new_server
+        self._restart_event.set()
+
     async def serve_until_stopped(self) -> None:
         while self._restart_event.is_set():
             self._restart_event.clear()
             await self.server.serve_until_close_signal(stop_event=self._stop_event, restart_event=self._restart_event,
                                                        notify_pid=self.notify_pid)
             if self._restart_event.is_set():
-                self.server = self.get_server()
+                self.server = self._next_server or self.get_server()
+                self._next_server = None
@@ -1,3 +1,4 @@
+import importlib
 import os
 import re
 import yaml
@@ -5,10 +6,10 @@ from pathlib import Path
 
 from functools import partial
 from aionetworking.compatibility import default_server_port, default_client_port
-from aionetworking.utils import IPNetwork
-from aionetworking.logging import Logger
+from aionetworking.utils import IPNetwork, FilterType, filter_from_string
+from aionetworking.logging import Logger, MetricsServer, SlowMessageSampler
 
-from typing import Optional, Dict, Union, Sequence
+from typing import Any, Optional, Dict, Union, Sequence
 
 
 def port_constructor(default_port_func, loader, node) -> int:
@@ -54,6 +55,15 @@ def load_ip_network(Loader=yaml.SafeLoader):
     yaml.add_constructor('!IPNetwork', ip_network_constructor, Loader=Loader)
 
 
+def filter_constructor(loader, node) -> FilterType:
+    value = loader.construct_scalar(node)
+    return filter_from_string(value)
+
+
+def load_filter(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!Filter', filter_constructor, Loader=Loader)
+
+
 def logger_constructor(loader, node) -> Logger:
     value = loader.construct_mapping(node) if node.value else {}
     return Logger(**value)
@@ -81,6 +91,24 @@ def load_sender_logger(Loader=yaml.SafeLoader):
     yaml.add_constructor('!SenderLogger', sender_logger_constructor, Loader=Loader)
 
 
+def metrics_server_constructor(loader, node) -> MetricsServer:
+    value = loader.construct_mapping(node) if node.value else {}
+    return MetricsServer(**value)
+
+
+def load_metrics_server(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!MetricsServer', metrics_server_constructor, Loader=Loader)
+
+
+def slow_msg_sampler_constructor(loader, node) -> SlowMessageSampler:
+    value = loader.construct_mapping(node) if node.value else {}
+    return SlowMessageSampler(**value)
+
+
+def load_slow_msg_sampler(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!SlowMessageSampler', slow_msg_sampler_constructor, Loader=Loader)
+
+
 env_variable_pattern = re.compile(r'.*?\${(\w+)}.*?')
 
 
@@ -107,3 +135,15 @@ def constructor_env_variables(loader, node):
 def load_env_variable(Loader=yaml.SafeLoader):
     Loader.add_implicit_resolver("!ENV", env_variable_pattern, None)
     yaml.add_constructor('!ENV', constructor_env_variables, Loader=Loader)
+
+
+def deferred_constructor(module: str, constructor: str, loader, node) -> Any:
+    return getattr(importlib.import_module(module), constructor)(loader, node)
+
+
+def load_deferred(tag_name: str, module: str, constructor: str, Loader=yaml.SafeLoader):
+    """
+    Registers a tag without importing the module which constructs it, so optional dependencies are only imported
+    when a config uses the tag.
+    """
+    yaml.add_constructor(tag_name, partial(deferred_constructor, module, constructor), Loader=Loader)
@@ -9,7 +9,7 @@ from aionetworking.types.logging import ConnectionLoggerType
 from aionetworking.utils import aone, dataclass_getstate, dataclass_setstate
 
 from .protocols import MessageObject, Codec
-from typing import AsyncGenerator, Any, Dict, Sequence, Type, Optional
+from typing import AsyncGenerator, Any, Dict, List, Sequence, Tuple, Type, Optional
 from aionetworking.compatibility import Protocol
 from aionetworking.types.formats import MessageObjectType, CodecType
 from aionetworking.types.networking import BaseContext
@@ -128,11 +128,22 @@ class BaseCodec(Codec):
         self.context = self.context or {}
 
     async def decode(self, encoded: bytes, **kwargs) -> AsyncGenerator[Sequence[bytes], None]:
+        encoded = bytes(encoded)
         yield encoded, encoded
 
     async def encode(self, decoded: Any, **kwargs) -> bytes:
         return decoded
 
+    async def encode_many(self, decoded_msgs: Sequence[Any], **kwargs) -> List[bytes]:
+        return [await self.encode(decoded, **kwargs) for decoded in decoded_msgs]
+
+    async def encode_template(self, decoded: Any, request_id: Any) -> Optional[Tuple[bytes, Optional[bytes]]]:
+        return None
+
+    def fill_template(self, template: Tuple[bytes, Optional[bytes]], request_id: Any) -> bytes:
+        prefix, suffix = template
+        return prefix
+
     async def decode_one(self, encoded: bytes, **kwargs) -> Any:
         return await aone(self.decode(encoded, **kwargs))
 
@@ -141,7 +152,8 @@ class BaseCodec(Codec):
 
     async def _from_buffer(self, encoded: bytes, **kwargs) -> AsyncGenerator[MessageObjectType, None]:
         async for encoded, decoded in self.decode(encoded, **kwargs):
-            yield await self.create_object(encoded, decoded, parent_logger=self.logger, **kwargs)
+            # Copy slices of a memoryview received into a reusable read buffer, message objects outlive the buffer
+            yield await self.create_object(bytes(encoded), decoded, parent_logger=self.logger, **kwargs)
 
     async def decode_buffer(self, encoded: bytes, context: BaseContext = None, source: str = 'buffer',
                             **kwargs) -> AsyncGenerator[MessageObjectType, None]:
@@ -4,12 +4,13 @@ from dataclasses import dataclass
 
 from aionetworking.formats.base import BaseCodec, BaseMessageObject
 
-from typing import Any, AsyncGenerator, Tuple
+from typing import Any, AsyncGenerator, List, Optional, Sequence, Tuple
 
 
 @dataclass
 class JSONCodec(BaseCodec):
     codec_name = 'json'
+    id_placeholder = '__aionetworking_request_id__'
 
     """
     Decode & Encode JSON text messages
@@ -18,15 +19,40 @@ class JSONCodec(BaseCodec):
     async def decode(self, encoded: bytes, **kwargs) -> AsyncGenerator[Tuple[bytes, Any], None]:
         pos = 0
         end = len(encoded)
+        data = str(encoded, 'utf-8')
+        raw_decode = json.JSONDecoder().raw_decode
         while pos < end:
             start = pos
-            data = encoded.decode()
-            msg, pos = json.JSONDecoder().raw_decode(data, idx=pos)
+            msg, pos = raw_decode(data, idx=pos)
             yield encoded[start:pos], msg
 
     async def encode(self, decoded: Any, **kwargs) -> bytes:
         return json.dumps(decoded).encode()
 
+    async def encode_many(self, decoded_msgs: Sequence[Any], **kwargs) -> List[bytes]:
+        encode = json.JSONEncoder().encode
+        return [encode(decoded).encode() for decoded in decoded_msgs]
+
+    async def encode_template(self, decoded: Any, request_id: Any) -> Optional[Tuple[bytes, Optional[bytes]]]:
+        if not isinstance(decoded, dict):
+            return None
+        id_attr = self.msg_obj.id_attr
+        if id_attr not in decoded:
+            return await self.encode(decoded), None
+        if decoded[id_attr] != request_id:
+            return None
+        encoded = await self.encode({**decoded, id_attr: self.id_placeholder})
+        parts = encoded.split(json.dumps(self.id_placeholder).encode())
+        if len(parts) != 2:
+            return None
+        return parts[0], parts[1]
+
+    def fill_template(self, template: Tuple[bytes, Optional[bytes]], request_id: Any) -> bytes:
+        prefix, suffix = template
+        if suffix is None:
+            return prefix
+        return prefix + json.dumps(request_id).encode() + suffix
+
 
 @dataclass
 class JSONObject(BaseMessageObject):
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 
 from aionetworking.formats.base import BaseCodec, BaseMessageObject
 
-from typing import Any, AsyncGenerator, Tuple
+from typing import Any, AsyncGenerator, List, Sequence, Tuple
 
 
 @dataclass
@@ -28,6 +28,9 @@ class PickleCodec(BaseCodec):
     async def encode(self, decoded: Any, **kwargs) -> bytes:
         return pickle.dumps(decoded, protocol=self.protocol)
 
+    async def encode_many(self, decoded_msgs: Sequence[Any], **kwargs) -> List[bytes]:
+        return [pickle.dumps(decoded, protocol=self.protocol) for decoded in decoded_msgs]
+
 
 @dataclass
 class PickleObject(BaseMessageObject):
@@ -3,7 +3,7 @@ from .base import BaseMessageObject
 from collections import namedtuple
 from pathlib import Path
 from .contrib.pickle import PickleCodec
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Sequence
 
 
 recorded_packet = namedtuple("recorded_packet", ["sent_by_server", "timestamp", "sender", "data"])
@@ -30,6 +30,9 @@ class BufferCodec(PickleCodec):
         )
         return await super().encode(packet_data, **kwargs)
 
+    async def encode_many(self, decoded_msgs: Sequence[bytes], system_timestamp=None, **kwargs) -> List[bytes]:
+        return [await self.encode(decoded, system_timestamp=system_timestamp, **kwargs) for decoded in decoded_msgs]
+
 
 @dataclass
 class BufferObject(BaseMessageObject):
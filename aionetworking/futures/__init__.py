@@ -1,3 +1,5 @@
 from .counters import Counter, Counters
 from .schedulers import TaskScheduler
 from .value_waiters import ValueWaiter
+from .work_queue import WorkQueue
+from .keyed_executor import KeyedExecutor
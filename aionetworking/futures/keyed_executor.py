@@ -0,0 +1,118 @@
+import asyncio
+from dataclasses import dataclass, field
+import operator
+
+from aionetworking.compatibility import create_task, set_task_name
+
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+@dataclass
+class KeyedExecutor:
+    """
+    Runs coroutine functions one at a time per key, in the order they were put, while different keys run in
+    parallel. Each key has its own bounded queue and a task which drains it, both are removed once the key is idle so
+    only active keys use memory. Messages are keyed by peer unless key_attr names an attribute of the message.
+    max_concurrency limits how many keys run at once.
+    """
+    max_pending_per_key: int = 100
+    max_concurrency: Optional[int] = None
+    key_attr: Optional[str] = None
+    shared: bool = True
+    _queues: Dict[Hashable, asyncio.Queue] = field(default_factory=dict, init=False, compare=False, repr=False)
+    _tasks: Dict[Hashable, asyncio.Task] = field(default_factory=dict, init=False, compare=False, repr=False)
+    _pending: Dict[Hashable, int] = field(default_factory=dict, init=False, compare=False, repr=False)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, init=False, compare=False, repr=False)
+    _get_attr: Optional[Callable[[Any], Hashable]] = field(default=None, init=False, compare=False, repr=False)
+    _started: bool = field(default=False, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.key_attr:
+            self._get_attr = operator.attrgetter(self.key_attr)
+
+    @property
+    def is_started(self) -> bool:
+        return self._started
+
+    @property
+    def num_keys(self) -> int:
+        return len(self._queues)
+
+    @property
+    def qsize(self) -> int:
+        return sum(queue.qsize() for queue in self._queues.values())
+
+    def get_key(self, msg: Any, default: Hashable = None) -> Hashable:
+        if self._get_attr:
+            try:
+                return self._get_attr(msg)
+            except (AttributeError, KeyError):
+                pass
+        return default
+
+    def full(self, key: Hashable = None) -> bool:
+        queue = self._queues.get(key)
+        return bool(queue and queue.full())
+
+    async def put(self, key: Hashable, fn: Callable, *args) -> asyncio.Future:
+        queue = self._queues.get(key)
+        if not queue:
+            queue = self._queues[key] = asyncio.Queue(self.max_pending_per_key)
+            task = self._tasks[key] = create_task(self._drain(key, queue))
+            set_task_name(task, f'KeyedExecutor {key}')
+        fut = asyncio.get_event_loop().create_future()
+        self._pending[key] = self._pending.get(key, 0) + 1
+        try:
+            await queue.put((fut, fn, args))
+        except BaseException:
+            self._pending[key] -= 1
+            raise
+        return fut
+
+    async def _run(self, fn: Callable, args) -> Any:
+        if self._semaphore:
+            async with self._semaphore:
+                return await fn(*args)
+        return await fn(*args)
+
+    async def _drain(self, key: Hashable, queue: asyncio.Queue) -> None:
+        try:
+            while True:
+                fut, fn, args = await queue.get()
+                try:
+                    if not fut.done():
+                        result = await self._run(fn, args)
+                        if not fut.done():
+                            fut.set_result(result)
+                except asyncio.CancelledError:
+                    fut.cancel()
+                    raise
+                except Exception as exc:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                finally:
+                    queue.task_done()
+                    self._pending[key] -= 1
+                if not self._pending[key]:
+                    break
+        finally:
+            if self._queues.get(key) is queue:
+                del self._queues[key]
+                del self._tasks[key]
+                del self._pending[key]
+
+    def start(self) -> None:
+        if self.max_concurrency:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._started = True
+
+    async def join(self) -> None:
+        await asyncio.gather(*[queue.join() for queue in list(self._queues.values())])
+
+    async def close(self) -> None:
+        await self.join()
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._started = False
@@ -56,10 +56,13 @@ class TaskScheduler:
         fut = self._futures.pop(name)
         self.task_done(fut)
 
-    async def run_wait_fut(self, name: Any, callback: Callable, *args, **kwargs) -> Any:
+    async def run_wait_fut(self, name: Any, callback: Callable, *args, timeout: Union[int, float] = None,
+                           **kwargs) -> Any:
         fut = self.create_future(name)
         try:
             callback(*args, **kwargs)
+            if timeout is not None:
+                return await asyncio.wait_for(fut, timeout)
             await fut
             return fut.result()
         finally:
@@ -0,0 +1,90 @@
+import asyncio
+from dataclasses import dataclass, field
+import math
+
+from aionetworking.compatibility import create_task, set_task_name
+
+from typing import Any, Callable, Hashable, List, Optional
+
+
+@dataclass
+class WorkQueue:
+    """
+    Runs coroutine functions with a fixed number of workers taking items from bounded queues, so a large burst of
+    messages waits in the queue instead of all hitting the action at once. With ordered, each key (usually the peer)
+    is always handled by the same worker so items with the same key run one at a time in the order they were put.
+    When shared is False every connection gets its own copy of the queue and its workers.
+    """
+    workers: int = 10
+    max_queue_size: int = 1000
+    ordered: bool = False
+    shared: bool = True
+    _queues: List[asyncio.Queue] = field(default_factory=list, init=False, compare=False, repr=False)
+    _tasks: List[asyncio.Task] = field(default_factory=list, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.workers < 1:
+            raise ValueError('WorkQueue needs at least one worker')
+
+    @property
+    def is_started(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def qsize(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    def get_key(self, msg: Any, default: Hashable = None) -> Hashable:
+        return default
+
+    def _get_queue(self, key: Hashable = None) -> asyncio.Queue:
+        if len(self._queues) == 1:
+            return self._queues[0]
+        return self._queues[hash(key) % len(self._queues)]
+
+    def full(self, key: Hashable = None) -> bool:
+        return self._get_queue(key).full()
+
+    async def put(self, key: Optional[Hashable], fn: Callable, *args) -> asyncio.Future:
+        fut = asyncio.get_event_loop().create_future()
+        await self._get_queue(key).put((fut, fn, args))
+        return fut
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            fut, fn, args = await queue.get()
+            try:
+                if not fut.done():
+                    result = await fn(*args)
+                    if not fut.done():
+                        fut.set_result(result)
+            except asyncio.CancelledError:
+                fut.cancel()
+                raise
+            except Exception as exc:
+                if not fut.done():
+                    fut.set_exception(exc)
+            finally:
+                queue.task_done()
+
+    def start(self) -> None:
+        if self.ordered:
+            maxsize = math.ceil(self.max_queue_size / self.workers) if self.max_queue_size else 0
+            self._queues = [asyncio.Queue(maxsize) for _ in range(self.workers)]
+        else:
+            self._queues = [asyncio.Queue(self.max_queue_size)]
+        for i in range(self.workers):
+            queue = self._queues[i] if self.ordered else self._queues[0]
+            task = create_task(self._work(queue))
+            set_task_name(task, f'WorkQueue worker {i}')
+            self._tasks.append(task)
+
+    async def join(self) -> None:
+        await asyncio.gather(*[queue.join() for queue in self._queues])
+
+    async def close(self) -> None:
+        await self.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
@@ -1,2 +1,5 @@
-from .loggers import Logger, ConnectionLogger, ConnectionLoggerStats, StatsLogger, StatsTracker
-from .log_filters import MessageFilter, PeerFilter
\ No newline at end of file
+from .loggers import Logger, ConnectionLogger, ConnectionLoggerStats, StatsLogger, StatsTracker, StatsAggregator
+from .log_filters import MessageFilter, PeerFilter
+from .metrics import MetricsRegistry, MetricsServer
+
+from .profiling import SlowMessageSampler, SignalProfiler
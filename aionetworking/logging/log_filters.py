@@ -2,9 +2,9 @@
 from logging import Filter, LogRecord
 
 from dataclasses import dataclass
-from aionetworking.utils import Expression
+from aionetworking.utils import FilterType, filter_from_string
 
-from typing import Sequence, Optional
+from typing import Sequence, Optional, Union
 
 
 @dataclass
@@ -26,14 +26,15 @@ class PeerFilter(Filter):
 @dataclass
 class MessageFilter(Filter):
 
-    expr: Expression
+    expr: FilterType
 
-    def __init__(self, expr: Optional[Expression], *args, **kwargs):
-        self.expr = expr
+    def __init__(self, expr: Optional[Union[FilterType, str]], *args, **kwargs):
+        self.expr = filter_from_string(expr) if isinstance(expr, str) else expr
+        self._compiled = self.expr.compile() if self.expr else None
         super().__init__(*args, **kwargs)
 
     def filter(self, record: LogRecord) -> bool:
         msg_obj = getattr(record, 'msg_obj', None)
-        if self.expr and msg_obj:
-            return self.expr(msg_obj)
+        if self._compiled and msg_obj:
+            return self._compiled(msg_obj)
         return True
@@ -1,18 +1,24 @@
 from abc import ABC, abstractmethod
 import binascii
 import datetime
+import heapq
 import logging
+import time
 from dataclasses import dataclass, field
 
 from aionetworking.compatibility import get_current_task_name
 from aionetworking.utils import dataclass_getstate, dataclass_setstate
 from aionetworking.utils import SystemInfo, supports_system_info
-from aionetworking.logging.utils_logging import LoggingDatetime, LoggingTimeDelta, BytesSize, MsgsCount, BytesSizeRate, p
+from aionetworking.logging.utils_logging import (LoggingDatetime, LoggingTimeDelta, BytesSize, MsgsCount, BytesSizeRate,
+                                                LatencyHistogram, p)
 from aionetworking.futures.schedulers import TaskScheduler
 
-from typing import Type, Optional, Dict, Generator, Any, Union
+from typing import Type, Optional, Dict, Generator, Any, List, Sequence, Tuple, Union, TYPE_CHECKING
 from aionetworking.types.formats import MessageObjectType
 
+if TYPE_CHECKING:
+    from aionetworking.logging.metrics import MetricsRegistry
+
 
 class BaseLogger(logging.LoggerAdapter, ABC):
 
@@ -55,14 +61,21 @@ class Logger(BaseLogger):
     extra: dict = None
     stats_interval: Union[float, int] = 60
     stats_fixed_start_time: bool = True
+    stats_aggregate: bool = False
+    stats_top_peers: int = 10
     is_closing: bool = field(default=False, init=False)
 
     def __init__(self, name: str, datefmt: str = '%Y-%m-%d %H:%M:%S.%f', extra: Dict = None,
-                 stats_interval: Optional[Union[int, float]] = 0, stats_fixed_start_time: bool = True):
+                 stats_interval: Optional[Union[int, float]] = 0, stats_fixed_start_time: bool = True,
+                 stats_aggregate: bool = False, stats_top_peers: int = 10, metrics: 'MetricsRegistry' = None):
         self.logger_name = name
         self.datefmt = datefmt
         self.stats_interval = stats_interval
         self.stats_fixed_start_time = stats_fixed_start_time
+        self.stats_aggregate = stats_aggregate
+        self.stats_top_peers = stats_top_peers
+        self._stats_aggregator = None
+        self.metrics = metrics
         logger = logging.getLogger(name)
         super().__init__(logger, extra or {})
 
@@ -94,8 +107,21 @@ class Logger(BaseLogger):
         child_name = f"{self.logger_name}.{name}"
         return logging.getLogger(child_name)
 
+    def _get_stats_aggregator(self) -> 'StatsAggregator':
+        if not self._stats_aggregator:
+            self._stats_aggregator = StatsAggregator(self.get_child('stats', cls=Logger, datefmt=self.datefmt,
+                                                                    extra=default_extra.copy()),
+                                                     stats_interval=self.stats_interval,
+                                                     stats_fixed_start_time=self.stats_fixed_start_time,
+                                                     top_peers=self.stats_top_peers)
+        return self._stats_aggregator
+
     def get_connection_logger(self, name: str = 'connection', **kwargs) -> Any:
         connection_logger_cls = self._get_connection_logger_cls()
+        if self.stats_aggregate and issubclass(connection_logger_cls, ConnectionLoggerStats):
+            kwargs['stats_aggregator'] = self._get_stats_aggregator()
+        if self.metrics:
+            kwargs['metrics'] = self.metrics
         return self.get_child(name, cls=connection_logger_cls, stats_interval=self.stats_interval,
                               stats_fixed_start_time=self.stats_fixed_start_time, **kwargs)
 
@@ -126,6 +152,11 @@ class Logger(BaseLogger):
     def _set_closing(self) -> None:
         self.is_closing = True
 
+    async def wait_closed(self):
+        if self._stats_aggregator:
+            aggregator, self._stats_aggregator = self._stats_aggregator, None
+            await aggregator.close()
+
 
 default_extra: Dict[str, Any] = {
             'endpoint': None,
@@ -143,6 +174,7 @@ class ConnectionLogger(Logger):
     def __init__(self, *args, extra: Dict[str, Any] = None, **kwargs):
         extra = extra or default_extra
         super().__init__(*args, extra=extra, **kwargs)
+        self._metrics = self.metrics.connection_metrics(self.logger.parent.name) if self.metrics else None
         self._raw_received_logger = self.get_sibling('raw_received', cls=Logger)
         self._raw_sent_logger = self.get_sibling('raw_sent', cls=Logger)
         self._msg_received_logger = self.get_sibling('msg_received', cls=Logger)
@@ -170,7 +202,7 @@ class ConnectionLogger(Logger):
     @staticmethod
     def _convert_raw_to_hex(data: bytes):
         try:
-            return data.decode('utf-8')
+            return str(data, 'utf-8')
         except UnicodeDecodeError:
             return binascii.hexlify(data).decode('utf-8')
 
@@ -185,6 +217,8 @@ class ConnectionLogger(Logger):
             self._raw_sent_logger.log(level, msg, *args, **kwargs)
 
     def manage_decode_error(self, buffer: bytes, exc: BaseException):
+        if self._metrics:
+            self._metrics.decode_errors += 1
         self._raw_received(buffer, logging.ERROR)
         self.error('Failed to decode message')
         self.manage_error(exc)
@@ -199,10 +233,15 @@ class ConnectionLogger(Logger):
         self._msg_received(msg_obj)
 
     def new_connection(self) -> None:
+        if self._metrics:
+            self._metrics.connections_opened += 1
         self.info('New %s connection from %s to %s', self.connection_type, self.client, self.server)
         self.info(self.extra)
 
     def on_buffer_received(self, data: bytes) -> None:
+        if self._metrics:
+            self._metrics.buffers_received += 1
+            self._metrics.bytes_received += len(data)
         self.info("Received buffer containing %s bytes", len(data))
 
     def on_buffer_decoded(self, data: bytes, num: int, source: str = 'buffer') -> None:
@@ -222,46 +261,191 @@ class ConnectionLogger(Logger):
         self._raw_sent(data, logging.DEBUG)
 
     def on_msg_sent(self, data: bytes) -> None:
+        if self._metrics:
+            self._metrics.msgs_sent += 1
+            self._metrics.bytes_sent += len(data)
         self.debug('Message sent')
 
+    def on_sending_encoded_msgs(self, msgs: Sequence[bytes]) -> None:
+        self.debug("Sending %s", p.no('message', len(msgs)))
+        if self._raw_sent_logger.isEnabledFor(logging.DEBUG):
+            for data in msgs:
+                self._raw_sent(data, logging.DEBUG)
+
+    def on_msgs_sent(self, msgs: Sequence[bytes]) -> None:
+        if self._metrics:
+            self._metrics.msgs_sent += len(msgs)
+            self._metrics.bytes_sent += sum(map(len, msgs))
+        self.debug('%s sent', p.no('message', len(msgs)))
+
+    def on_batch_sent(self, num_msgs: int, size: int) -> None:
+        if self._metrics:
+            self._metrics.batches_sent += 1
+        self.info('Uploaded batch of %s containing %s bytes', p.no('message', num_msgs), size)
+
     def on_msg_processed(self, msg: MessageObjectType) -> None:
+        if self._metrics:
+            self._metrics.msgs_processed += 1
+            self._metrics.bytes_processed += len(msg.encoded)
         self.debug('Finished processing message %s', msg.uid)
 
     def on_msg_filtered(self, msg: MessageObjectType) -> None:
+        if self._metrics:
+            self._metrics.msgs_filtered += 1
         self.debug('Filtered msg %s', msg.uid)
 
+    def on_msgs_processed(self, num_msgs: int, size: int) -> None:
+        if self._metrics:
+            self._metrics.msgs_processed += num_msgs
+            self._metrics.bytes_processed += size
+        self.debug('Finished processing %s', p.no('message', num_msgs))
+
+    def on_msgs_filtered(self, num_msgs: int, size: int) -> None:
+        if self._metrics:
+            self._metrics.msgs_filtered += num_msgs
+        self.debug('Filtered %s', p.no('message', num_msgs))
+
+    def on_msg_duplicate(self, msg: MessageObjectType) -> None:
+        if self._metrics:
+            self._metrics.msgs_duplicate += 1
+        self.debug('Dropped duplicate msg %s', msg.uid)
+
     def on_msg_failed(self, msg: MessageObjectType, exc: BaseException) -> None:
+        if self._metrics:
+            self._metrics.msgs_failed += 1
         self.error('Failed to process msg %s', getattr(msg, 'uid', None))
         self.manage_error(exc)
 
+    def record_latency(self, interval: str, seconds: float) -> None:
+        if self._metrics:
+            self._metrics.latencies[interval].record(seconds)
+
     def connection_finished(self, exc: Optional[BaseException] = None) -> None:
+        if self._metrics:
+            self._metrics.connections_closed += 1
         self.manage_error(exc)
         self.info('%s connection from %s to %s has been closed', self.connection_type, self.client, self.server)
 
 
-@dataclass
+perf_counter_offset = time.time() - time.perf_counter()
+
+
 class StatsTracker:
-    datefmt: str = '%Y-%m-%d %H:%M:%S.%f'
-    start: LoggingDatetime = field(default=None, init=False)
-    end: LoggingDatetime = field(default=None, init=False)
-    sent: BytesSize = field(default_factory=BytesSize, init=False)
-    received: BytesSize = field(default_factory=BytesSize, init=False)
-    processed: BytesSize = field(default_factory=BytesSize, init=False)
-    filtered: BytesSize = field(default_factory=BytesSize, init=False)
-    failed: BytesSize = field(default_factory=BytesSize, init=False)
-    largest_buffer: BytesSize = field(default_factory=BytesSize, init=False)
-    msgs: MsgsCount = field(default_factory=MsgsCount, init=False)
+    """
+    Counters are plain ints and timestamps are perf_counter floats so tracking an event does not allocate any objects.
+    The formatting objects exposed as attributes are only built when a stats record is emitted.
+    """
+    __slots__ = ('datefmt', '_start', '_end', '_sent', '_received', '_processed', '_filtered',
+                 '_failed', '_duplicates', '_largest_buffer', '_num_sent', '_num_received', '_num_processed',
+                 '_num_filtered', '_num_failed', '_num_duplicates', '_num_batches', '_num_batched', '_first_received',
+                 '_last_received', '_first_sent', '_last_sent', '_last_processed', 'decode_latency', 'action_latency',
+                 'response_latency', 'request_latency', 'upload_latency')
 
     attrs = ('start', 'end', 'msgs', 'sent', 'received', 'processed', 'filtered', 'failed', 'largest_buffer',
              'send_rate', 'processing_rate', 'receive_rate', 'interval', 'average_buffer_size', 'average_sent',
-             'msgs_per_buffer', 'not_decoded', 'not_decoded_rate', 'total_done')
+             'msgs_per_buffer', 'not_decoded', 'not_decoded_rate', 'total_done', 'batches', 'msgs_per_batch',
+             'duplicates', 'decode_latency', 'action_latency', 'response_latency', 'request_latency', 'upload_latency')
+
+    latency_intervals = ('decode_latency', 'action_latency', 'response_latency', 'request_latency', 'upload_latency')
+    counters = ('_sent', '_received', '_processed', '_filtered', '_failed', '_duplicates', '_num_sent',
+                '_num_received', '_num_processed', '_num_filtered', '_num_failed', '_num_duplicates', '_num_batches',
+                '_num_batched')
+
+    def __init__(self, datefmt: str = '%Y-%m-%d %H:%M:%S.%f', histograms: Dict[str, LatencyHistogram] = None):
+        self.datefmt = datefmt
+        self.clear()
+        histograms = histograms or {}
+        for name in self.latency_intervals:
+            setattr(self, name, histograms.get(name) or LatencyHistogram())
+
+    def clear(self) -> None:
+        self._start = time.perf_counter()
+        self._end = None
+        self._sent = self._received = self._processed = self._filtered = self._failed = self._largest_buffer = 0
+        self._duplicates = self._num_duplicates = 0
+        self._num_sent = self._num_received = self._num_processed = self._num_filtered = self._num_failed = 0
+        self._num_batches = self._num_batched = 0
+        self._first_received = self._last_received = self._first_sent = self._last_sent = None
+        self._last_processed = None
+
+    @staticmethod
+    def _earliest(first: Optional[float], second: Optional[float]) -> Optional[float]:
+        if first is None or (second is not None and second < first):
+            return second
+        return first
+
+    @staticmethod
+    def _latest(first: Optional[float], second: Optional[float]) -> Optional[float]:
+        if first is None or (second is not None and second > first):
+            return second
+        return first
+
+    def merge(self, other: 'StatsTracker') -> None:
+        for name in self.counters:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        if other._largest_buffer > self._largest_buffer:
+            self._largest_buffer = other._largest_buffer
+        self._first_received = self._earliest(self._first_received, other._first_received)
+        self._first_sent = self._earliest(self._first_sent, other._first_sent)
+        self._last_received = self._latest(self._last_received, other._last_received)
+        self._last_sent = self._latest(self._last_sent, other._last_sent)
+        self._last_processed = self._latest(self._last_processed, other._last_processed)
+        for name in self.latency_intervals:
+            histogram = getattr(self, name)
+            other_histogram = getattr(other, name)
+            if other_histogram is not histogram:
+                histogram.merge(other_histogram)
+
+    def _datetime(self, timestamp: Optional[float]) -> Optional[LoggingDatetime]:
+        if timestamp is None:
+            return None
+        dt = datetime.datetime.fromtimestamp(timestamp + perf_counter_offset)
+        return LoggingDatetime(self.datefmt, dt=dt)
+
+    @property
+    def start(self) -> LoggingDatetime:
+        return self._datetime(self._start)
+
+    @property
+    def end(self) -> Optional[LoggingDatetime]:
+        return self._datetime(self._end)
+
+    @property
+    def sent(self) -> BytesSize:
+        return BytesSize(self._sent)
+
+    @property
+    def received(self) -> BytesSize:
+        return BytesSize(self._received)
+
+    @property
+    def processed(self) -> BytesSize:
+        return BytesSize(self._processed)
+
+    @property
+    def filtered(self) -> BytesSize:
+        return BytesSize(self._filtered)
+
+    @property
+    def failed(self) -> BytesSize:
+        return BytesSize(self._failed)
+
+    @property
+    def largest_buffer(self) -> BytesSize:
+        return BytesSize(self._largest_buffer)
 
-    def __post_init__(self):
-        self.start = LoggingDatetime(datefmt=self.datefmt)
+    @property
+    def msgs(self) -> MsgsCount:
+        return MsgsCount(sent=self._num_sent, received=self._num_received, processed=self._num_processed,
+                         filtered=self._num_filtered, failed=self._num_failed,
+                         first_received=self._datetime(self._first_received),
+                         last_received=self._datetime(self._last_received),
+                         first_sent=self._datetime(self._first_sent), last_sent=self._datetime(self._last_sent),
+                         last_processed=self._datetime(self._last_processed))
 
     @property
     def total_done(self) -> int:
-        return self.processed + self.failed + self.filtered
+        return self.processed + self.failed + self.filtered + self._duplicates
 
     @property
     def processing_rate(self) -> BytesSizeRate:
@@ -295,6 +479,18 @@ class StatsTracker:
     def not_decoded(self) -> int:
         return self.received - self.total_done
 
+    @property
+    def batches(self) -> int:
+        return self._num_batches
+
+    @property
+    def duplicates(self) -> int:
+        return self._num_duplicates
+
+    @property
+    def msgs_per_batch(self) -> float:
+        return self._num_batched / (self._num_batches or 1)
+
     @property
     def not_decoded_rate(self) -> float:
         return self.not_decoded / (self.received or 1)
@@ -306,37 +502,64 @@ class StatsTracker:
         return getattr(self, item)
 
     def on_buffer_received(self, data: bytes) -> None:
-        if not self.msgs.first_received:
-            self.msgs.first_received = LoggingDatetime(self.datefmt)
-        self.msgs.last_received = LoggingDatetime(self.datefmt)
-        self.msgs.received += 1
+        self._last_received = time.perf_counter()
+        if self._first_received is None:
+            self._first_received = self._last_received
+        self._num_received += 1
         size = len(data)
-        self.received += size
-        if size > self.largest_buffer:
-            self.largest_buffer = BytesSize(size)
+        self._received += size
+        if size > self._largest_buffer:
+            self._largest_buffer = size
 
     def on_msg_processed(self, data: bytes) -> None:
-        self.msgs.last_processed = LoggingDatetime(self.datefmt)
-        self.msgs.processed += 1
-        self.processed += len(data)
+        self._last_processed = time.perf_counter()
+        self._num_processed += 1
+        self._processed += len(data)
 
     def on_msg_filtered(self, data: bytes) -> None:
-        self.msgs.filtered += 1
-        self.filtered += len(data)
+        self._num_filtered += 1
+        self._filtered += len(data)
+
+    def on_msgs_processed(self, num_msgs: int, size: int) -> None:
+        self._last_processed = time.perf_counter()
+        self._num_processed += num_msgs
+        self._processed += size
+
+    def on_msgs_filtered(self, num_msgs: int, size: int) -> None:
+        self._num_filtered += num_msgs
+        self._filtered += size
 
     def on_msg_failed(self, data: bytes) -> None:
-        self.msgs.failed += 1
-        self.failed += len(data)
+        self._num_failed += 1
+        self._failed += len(data)
+
+    def on_msg_duplicate(self, data: bytes) -> None:
+        self._num_duplicates += 1
+        self._duplicates += len(data)
 
     def on_msg_sent(self, msg: bytes) -> None:
-        self.msgs.last_sent = LoggingDatetime(self.datefmt)
-        if not self.msgs.first_sent:
-            self.msgs.first_sent = self.msgs.last_sent
-        self.msgs.sent += 1
-        self.sent += len(msg)
+        self._last_sent = time.perf_counter()
+        if self._first_sent is None:
+            self._first_sent = self._last_sent
+        self._num_sent += 1
+        self._sent += len(msg)
+
+    def on_msgs_sent(self, msgs: Sequence[bytes]) -> None:
+        self._last_sent = time.perf_counter()
+        if self._first_sent is None:
+            self._first_sent = self._last_sent
+        self._num_sent += len(msgs)
+        self._sent += sum(map(len, msgs))
+
+    def on_batch_sent(self, num_msgs: int) -> None:
+        self._num_batches += 1
+        self._num_batched += num_msgs
+
+    def record_latency(self, interval: str, seconds: float) -> None:
+        getattr(self, interval).record(seconds)
 
     def end_interval(self) -> None:
-        self.end = LoggingDatetime(self.datefmt)
+        self._end = time.perf_counter()
 
 
 @dataclass
@@ -395,20 +618,127 @@ class StatsLogger(Logger):
     def on_msg_failed(self, data: bytes):
         self._stats.on_msg_failed(data)
 
+    def on_msgs_processed(self, num_msgs: int, size: int):
+        self._stats.on_msgs_processed(num_msgs, size)
+
+    def on_msgs_filtered(self, num_msgs: int, size: int):
+        self._stats.on_msgs_filtered(num_msgs, size)
+
+    def on_msg_duplicate(self, data: bytes):
+        self._stats.on_msg_duplicate(data)
+
+    def record_latency(self, interval: str, seconds: float) -> None:
+        self._stats.record_latency(interval, seconds)
+
     def __getattr__(self, item):
         if self._stats:
             return getattr(self._stats, item)
 
 
+class StatsAggregator:
+    """
+    Shared by all connections of a logger when stats_aggregate is set. Each connection only gets a StatsTracker entry
+    in one table and a single timer emits an INTERVAL roll-up of the totals with the busiest peers. Records for a
+    single connection are only logged when it finishes or on demand. Latency histograms are shared by all connections.
+    """
+    def __init__(self, logger: 'Logger', stats_interval: Optional[Union[int, float]] = 0,
+                 stats_fixed_start_time: bool = True, top_peers: int = 10):
+        self.logger = logger
+        self.datefmt = logger.datefmt
+        self.top_peers = top_peers
+        self._histograms = {name: LatencyHistogram() for name in StatsTracker.latency_intervals}
+        self._connections: Dict[StatsTracker, Dict[str, Any]] = {}
+        self._logged_interval: Dict[StatsTracker, bool] = {}
+        self._closed = self._new_tracker()
+        self._scheduler = TaskScheduler()
+        if stats_interval:
+            self._scheduler.call_cb_periodic(stats_interval, self.periodic_log, fixed_start_time=stats_fixed_start_time,
+                                             task_name=f'{logger.logger_name}-Stats')
+
+    def _new_tracker(self) -> StatsTracker:
+        return StatsTracker(datefmt=self.datefmt, histograms=self._histograms)
+
+    @property
+    def num_connections(self) -> int:
+        return len(self._connections)
+
+    def add_connection(self, extra: Dict[str, Any]) -> StatsTracker:
+        stats = self._new_tracker()
+        self._connections[stats] = extra
+        self._logged_interval[stats] = False
+        return stats
+
+    @staticmethod
+    def _activity(stats: StatsTracker) -> int:
+        return stats._received + stats._sent
+
+    def _peer_activity(self, stats: StatsTracker, extra: Dict[str, Any]) -> Tuple[str, int, BytesSize]:
+        return extra.get('peer'), stats._num_received + stats._num_sent, BytesSize(self._activity(stats))
+
+    def _get_top_peers(self) -> List[Tuple[str, int, BytesSize]]:
+        busiest = heapq.nlargest(self.top_peers, self._connections.items(), key=lambda item: self._activity(item[0]))
+        return [self._peer_activity(stats, extra) for stats, extra in busiest if self._activity(stats)]
+
+    def _log_connection(self, tag: str, stats: StatsTracker, extra: Dict[str, Any]) -> None:
+        self._log(tag, stats, extra, connections=1, top_peers=[self._peer_activity(stats, extra)])
+
+    def _log(self, tag: str, stats: StatsTracker, extra: Dict[str, Any] = None, **kwargs) -> None:
+        stats.end_interval()
+        detail = {k: stats[k] for k in stats}
+        detail.update(kwargs)
+        if extra:
+            detail.update(extra)
+        self.logger.info(tag, detail=detail)
+
+    def _log_totals(self, tag: str) -> None:
+        totals = self._new_tracker()
+        totals._start = self._closed._start
+        totals.merge(self._closed)
+        for stats in self._connections:
+            totals.merge(stats)
+        for name, histogram in self._histograms.items():
+            snapshot = LatencyHistogram()
+            snapshot.merge(histogram)
+            setattr(totals, name, snapshot)
+            histogram.reset()
+        self._log(tag, totals, connections=self.num_connections, top_peers=self._get_top_peers())
+        for stats in self._connections:
+            stats.clear()
+            self._logged_interval[stats] = True
+        self._closed.clear()
+
+    def periodic_log(self) -> None:
+        self._log_totals('INTERVAL')
+
+    def log_connection_stats(self, peer: str = None) -> None:
+        for stats, extra in list(self._connections.items()):
+            if peer is None or extra.get('peer') == peer:
+                self._log_connection('DETAIL', stats, extra)
+
+    def connection_finished(self, stats: StatsTracker) -> None:
+        extra = self._connections.pop(stats, None)
+        logged_interval = self._logged_interval.pop(stats, False)
+        if extra is not None:
+            self._log_connection('END' if logged_interval else 'ALL', stats, extra)
+            self._closed.merge(stats)
+
+    async def close(self) -> None:
+        await self._scheduler.close()
+        self._log_totals('END')
+
+
 @dataclass
 class ConnectionLoggerStats(ConnectionLogger):
     stats_cls = StatsLogger
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, stats_aggregator: StatsAggregator = None, **kwargs):
         super().__init__(*args, **kwargs)
+        self._stats_aggregator = stats_aggregator
         self._stats_logger = self._get_stats_logger()
 
-    def _get_stats_logger(self) -> StatsLogger:
+    def _get_stats_logger(self) -> Union[StatsLogger, StatsTracker]:
+        if self._stats_aggregator:
+            return self._stats_aggregator.add_connection(self.extra)
         return self.get_sibling('stats', cls=self.stats_cls, stats_interval=self.stats_interval,
                                 stats_fixed_start_time=self.stats_fixed_start_time)
 
@@ -421,23 +751,51 @@ class ConnectionLoggerStats(ConnectionLogger):
         self._stats_logger.on_msg_processed(msg.encoded)
 
     def on_msg_filtered(self, msg: MessageObjectType) -> None:
-        super().on_msg_processed(msg)
+        super().on_msg_filtered(msg)
         self._stats_logger.on_msg_filtered(msg.encoded)
 
+    def on_msgs_processed(self, num_msgs: int, size: int) -> None:
+        super().on_msgs_processed(num_msgs, size)
+        self._stats_logger.on_msgs_processed(num_msgs, size)
+
+    def on_msgs_filtered(self, num_msgs: int, size: int) -> None:
+        super().on_msgs_filtered(num_msgs, size)
+        self._stats_logger.on_msgs_filtered(num_msgs, size)
+
     def on_msg_failed(self, msg: MessageObjectType, exc: BaseException) -> None:
         super().on_msg_failed(msg, exc)
         self._stats_logger.on_msg_failed(msg.encoded)
 
+    def on_msg_duplicate(self, msg: MessageObjectType) -> None:
+        super().on_msg_duplicate(msg)
+        self._stats_logger.on_msg_duplicate(msg.encoded)
+
     def on_msg_sent(self, msg: bytes) -> None:
         super().on_msg_sent(msg)
         self._stats_logger.on_msg_sent(msg)
 
+    def on_msgs_sent(self, msgs: Sequence[bytes]) -> None:
+        super().on_msgs_sent(msgs)
+        self._stats_logger.on_msgs_sent(msgs)
+
+    def on_batch_sent(self, num_msgs: int, size: int) -> None:
+        super().on_batch_sent(num_msgs, size)
+        self._stats_logger.on_batch_sent(num_msgs)
+
+    def record_latency(self, interval: str, seconds: float) -> None:
+        super().record_latency(interval, seconds)
+        self._stats_logger.record_latency(interval, seconds)
+
     def connection_finished(self, exc: Optional[BaseException] = None) -> None:
         super().connection_finished(exc=exc)
-        self._stats_logger.connection_finished()
+        if self._stats_aggregator:
+            self._stats_aggregator.connection_finished(self._stats_logger)
+        else:
+            self._stats_logger.connection_finished()
 
     async def wait_closed(self):
-        await self._stats_logger.wait_closed()
+        if not self._stats_aggregator:
+            await self._stats_logger.wait_closed()
 
 
 def get_logger_receiver() -> Logger:
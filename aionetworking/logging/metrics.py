@@ -0,0 +1,215 @@
+import asyncio
+from dataclasses import dataclass, field
+from functools import partial
+
+from aionetworking.logging.loggers import StatsTracker, get_logger_receiver
+from aionetworking.logging.utils_logging import LatencyHistogram
+from aionetworking.types.logging import LoggerType
+
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+Labels = Dict[str, Any]
+GaugeCollector = Callable[[], Iterable[Tuple[Labels, float]]]
+
+
+class ConnectionMetrics:
+    """
+    Counters shared by all connections of one logger, updated by the connection loggers. Plain ints so updating them
+    is as cheap as possible, they are only formatted when the metrics are scraped.
+    """
+    __slots__ = ('connections_opened', 'connections_closed', 'buffers_received', 'bytes_received', 'msgs_processed',
+                 'bytes_processed', 'msgs_filtered', 'msgs_failed', 'msgs_duplicate', 'msgs_sent', 'bytes_sent',
+                 'batches_sent', 'decode_errors', 'latencies')
+
+    counters = (
+        ('connections_opened', 'Connections opened'),
+        ('connections_closed', 'Connections closed'),
+        ('buffers_received', 'Buffers received'),
+        ('bytes_received', 'Bytes received'),
+        ('msgs_processed', 'Messages processed successfully'),
+        ('bytes_processed', 'Bytes of messages processed successfully'),
+        ('msgs_filtered', 'Messages filtered'),
+        ('msgs_failed', 'Messages which failed processing'),
+        ('msgs_duplicate', 'Duplicate messages dropped'),
+        ('msgs_sent', 'Messages sent'),
+        ('bytes_sent', 'Bytes sent'),
+        ('batches_sent', 'Batches of messages uploaded together'),
+        ('decode_errors', 'Buffers which could not be decoded'),
+    )
+
+    def __init__(self):
+        for name, description in self.counters:
+            setattr(self, name, 0)
+        self.latencies = {name: LatencyHistogram() for name in StatsTracker.latency_intervals}
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    items = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return f'{{{items}}}'
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = 'aionetworking'):
+        self.prefix = prefix
+        self._connection_metrics: Dict[str, ConnectionMetrics] = {}
+        self._gauges: Dict[str, Tuple[str, Dict[Hashable, GaugeCollector]]] = {}
+
+    def connection_metrics(self, logger_name: str) -> ConnectionMetrics:
+        metrics = self._connection_metrics.get(logger_name)
+        if not metrics:
+            metrics = self._connection_metrics[logger_name] = ConnectionMetrics()
+        return metrics
+
+    def add_gauge(self, name: str, description: str, collector: GaugeCollector, key: Hashable = None) -> None:
+        family = self._gauges.get(name)
+        if not family:
+            family = self._gauges[name] = (description, {})
+        family[1][collector if key is None else key] = collector
+
+    def remove_gauges(self, key: Hashable) -> None:
+        for name, (description, collectors) in list(self._gauges.items()):
+            collectors.pop(key, None)
+            if not collectors:
+                del self._gauges[name]
+
+    def _header(self, name: str, description: str, metric_type: str) -> List[str]:
+        return [f'# HELP {self.prefix}_{name} {description}', f'# TYPE {self.prefix}_{name} {metric_type}']
+
+    def _render_counters(self) -> Iterable[str]:
+        for name, description in ConnectionMetrics.counters:
+            yield from self._header(f'{name}_total', description, 'counter')
+            for logger_name, metrics in self._connection_metrics.items():
+                yield f'{self.prefix}_{name}_total{_format_labels({"logger": logger_name})} {getattr(metrics, name)}'
+
+    def _render_histograms(self) -> Iterable[str]:
+        name = f'{self.prefix}_latency_seconds'
+        yield from self._header('latency_seconds', 'Per message latency for each stage of processing', 'histogram')
+        for logger_name, metrics in self._connection_metrics.items():
+            for interval, histogram in metrics.latencies.items():
+                labels = {'logger': logger_name, 'interval': interval.replace('_latency', '')}
+                for upper, count in histogram.buckets():
+                    yield f'{name}_bucket{_format_labels(dict(labels, le=repr(upper)))} {count}'
+                yield f'{name}_bucket{_format_labels(dict(labels, le="+Inf"))} {histogram.count}'
+                yield f'{name}_sum{_format_labels(labels)} {_format_value(histogram.total)}'
+                yield f'{name}_count{_format_labels(labels)} {histogram.count}'
+
+    def _render_gauges(self) -> Iterable[str]:
+        for name, (description, collectors) in self._gauges.items():
+            yield from self._header(name, description, 'gauge')
+            for collector in collectors.values():
+                for labels, value in collector():
+                    yield f'{self.prefix}_{name}{_format_labels(labels)} {_format_value(value)}'
+
+    def render(self) -> str:
+        lines = [*self._render_counters(), *self._render_histograms(), *self._render_gauges()]
+        return '\n'.join(lines) + '\n'
+
+
+route_stats = (
+    ('processed', 'Messages processed by each route of a router action'),
+    ('failed', 'Messages which failed in each route of a router action'),
+    ('queued', 'Messages waiting for a worker in each route of a router action'),
+    ('mean_latency', 'Mean latency in milliseconds of each route of a router action'),
+    ('p99_latency', '99th percentile latency in milliseconds of each route of a router action'),
+)
+
+
+def _route_stats(labels: Labels, protocol_factory: Any, stat: str) -> Iterable[Tuple[Labels, float]]:
+    for route, stats in protocol_factory.action.route_stats().items():
+        yield dict(labels, route=route), stats[stat]
+
+
+def file_queue_depths() -> Iterable[Tuple[Labels, float]]:
+    from aionetworking.actions.file_storage import ManagedFile
+    for path, f in list(ManagedFile._open_files.items()):
+        yield {'path': path}, f._queue.qsize()
+
+
+@dataclass
+class MetricsServer:
+    """
+    Serves the metrics fed by the connection loggers in the Prometheus text format over HTTP.
+    """
+    host: str = '127.0.0.1'
+    port: int = 9100
+    path: str = '/metrics'
+    logger: LoggerType = field(default_factory=get_logger_receiver)
+    registry: MetricsRegistry = field(default_factory=MetricsRegistry, compare=False, repr=False)
+    server: asyncio.AbstractServer = field(default=None, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.registry.add_gauge('file_queue_depth', 'Items waiting to be written to each managed file',
+                                file_queue_depths)
+
+    def set_logger(self, logger: LoggerType) -> None:
+        self.logger = logger
+        self.add_logger(logger)
+
+    def add_logger(self, logger: LoggerType) -> None:
+        logger.metrics = self.registry
+
+    def add_server(self, server: Any) -> None:
+        key = id(server)
+        protocol_factory = server.protocol_factory
+        labels = {'server': server.full_name}
+        self.registry.add_gauge('connections', 'Connections currently open',
+                                lambda: [(labels, protocol_factory.num_connections)], key=key)
+        self.registry.add_gauge('scheduler_tasks', 'Tasks currently scheduled by the server and its connections',
+                                lambda: [(labels, protocol_factory.scheduler_task_count)], key=key)
+        if hasattr(protocol_factory.action, 'route_stats'):
+            for stat, description in route_stats:
+                self.registry.add_gauge(f'route_{stat}', description,
+                                        partial(_route_stats, labels, protocol_factory, stat), key=key)
+
+    def remove_server(self, server: Any) -> None:
+        self.registry.remove_gauges(id(server))
+
+    @property
+    def listening_on(self) -> Optional[Tuple[str, int]]:
+        if self.server and self.server.sockets:
+            return self.server.sockets[0].getsockname()[0:2]
+        return None
+
+    async def _handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            parts = request_line.decode('latin-1').split()
+            if len(parts) >= 2 and parts[0] == 'GET' and parts[1].split('?')[0] == self.path:
+                status, content_type, body = '200 OK', 'text/plain; version=0.0.4; charset=utf-8', \
+                                             self.registry.render().encode()
+            else:
+                status, content_type, body = '404 Not Found', 'text/plain; charset=utf-8', b'Not Found\n'
+            writer.write(f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n'
+                         f'Connection: close\r\n\r\n'.encode() + body)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            self.logger.debug('Metrics request failed: %s', e)
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        if self.server:
+            return
+        self.server = await asyncio.start_server(self._handle_request, host=self.host, port=self.port)
+        self.logger.info('Serving metrics on http://%s:%s%s', *self.listening_on, self.path)
+
+    async def close(self) -> None:
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
@@ -0,0 +1,109 @@
+import cProfile
+import datetime
+import heapq
+import itertools
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from aionetworking import settings
+from aionetworking.futures.schedulers import TaskScheduler
+from aionetworking.logging.loggers import get_logger_receiver
+from aionetworking.types.formats import MessageObjectType
+from aionetworking.types.logging import LoggerType
+from aionetworking.types.networking import BaseContext
+
+from typing import Any, Callable, List, NamedTuple, Optional, Union
+
+
+TimingHook = Callable[[str, float, Optional[MessageObjectType], BaseContext], None]
+
+
+class SlowMessage(NamedTuple):
+    seconds: float
+    stage: str
+    peer: str
+    uid: Any
+
+
+@dataclass
+class SlowMessageSampler:
+    """
+    Timing hook which keeps the slowest messages seen by any connection of a protocol factory. Only the top messages
+    for each interval are kept so sampling is cheap enough to leave running in production.
+    """
+    threshold: Union[int, float] = 0
+    top: int = 10
+    interval: Union[int, float] = 60
+    logger: LoggerType = field(default_factory=get_logger_receiver, compare=False, repr=False)
+    _samples: List = field(default_factory=list, init=False, compare=False, repr=False)
+    _counter: itertools.count = field(default_factory=itertools.count, init=False, compare=False, repr=False)
+    _scheduler: TaskScheduler = field(default_factory=TaskScheduler, init=False, compare=False, repr=False)
+
+    def __call__(self, stage: str, seconds: float, msg_obj: Optional[MessageObjectType], context: BaseContext) -> None:
+        if seconds < self.threshold:
+            return
+        if len(self._samples) >= self.top:
+            if seconds <= self._samples[0][0]:
+                return
+            heapq.heappop(self._samples)
+        heapq.heappush(self._samples, (seconds, next(self._counter), stage, context.get('peer'),
+                                       getattr(msg_obj, 'uid', None)))
+
+    def slowest(self) -> List[SlowMessage]:
+        return [SlowMessage(seconds, stage, peer, uid) for seconds, i, stage, peer, uid in
+                sorted(self._samples, reverse=True)]
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+    def log_slowest(self) -> None:
+        for msg in self.slowest():
+            self.logger.warning('Slow %s for msg %s from %s took %.3fms', msg.stage, msg.uid, msg.peer,
+                                msg.seconds * 1000)
+        self.reset()
+
+    def start(self, logger: LoggerType = None) -> None:
+        self.logger = logger or self.logger
+        if self.interval:
+            self._scheduler.call_cb_periodic(self.interval, self.log_slowest, fixed_start_time=False,
+                                             task_name='Log slow messages')
+
+    async def close(self) -> None:
+        await self._scheduler.close()
+        self.log_slowest()
+
+
+class SignalProfiler:
+    """
+    Starts profiling the whole process the first time toggle is called, the next call stops it and dumps the stats
+    so they can be loaded with pstats or snakeviz.
+    """
+    def __init__(self, directory: Path = None, logger: LoggerType = None):
+        self.directory = directory
+        self.logger = logger or get_logger_receiver()
+        self._profile: Optional[cProfile.Profile] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._profile is not None
+
+    def start(self) -> None:
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self.logger.info('Profiling started')
+
+    def stop(self) -> Path:
+        self._profile.disable()
+        directory = self.directory or settings.TEMPDIR / 'profiles'
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"profile_{os.getpid()}_{datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')}.prof"
+        self._profile.dump_stats(str(path))
+        self._profile = None
+        self.logger.info('Profiling stopped, stats written to %s', path)
+        return path
+
+    def toggle(self) -> Optional[Path]:
+        if self.is_running:
+            return self.stop()
+        self.start()
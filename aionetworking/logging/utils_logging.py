@@ -1,13 +1,15 @@
+import asyncio
+from array import array
 from datetime import datetime, timedelta, time
-import inflect
+import math
 
-from typing import Any
+from typing import Any, Generator, Tuple
 
 
 class LoggingDatetime:
 
-    def __init__(self, datefmt: str = "%Y-%M-%d %H:%M:%S"):
-        self.dt = datetime.now()
+    def __init__(self, datefmt: str = "%Y-%M-%d %H:%M:%S", dt: datetime = None):
+        self.dt = dt or datetime.now()
         self._datefmt = datefmt
 
     def __gt__(self, other):
@@ -17,7 +19,7 @@ class LoggingDatetime:
         return self.dt >= other.dt
 
     def __le__(self, other):
-        return self.dt >= other.dt
+        return self.dt <= other.dt
 
     def __lt__(self, other):
         return self.dt < other.dt
@@ -200,6 +202,21 @@ class MsgsCount:
     last_sent = None
     last_processed = None
 
+    def __init__(self, sent: int = 0, received: int = 0, processed: int = 0, filtered: int = 0, failed: int = 0,
+                 first_received: LoggingDatetime = None, last_received: LoggingDatetime = None,
+                 first_sent: LoggingDatetime = None, last_sent: LoggingDatetime = None,
+                 last_processed: LoggingDatetime = None):
+        self.sent = sent
+        self.received = received
+        self.processed = processed
+        self.filtered = filtered
+        self.failed = failed
+        self.first_received = first_received
+        self.last_received = last_received
+        self.first_sent = first_sent
+        self.last_sent = last_sent
+        self.last_processed = last_processed
+
     @property
     def total_done(self) -> int:
         return self.processed + self.filtered + self.failed
@@ -245,4 +262,122 @@ class MsgsCount:
         return self.processed / self.processing_time
 
 
-p = inflect.engine()
+class LazyInflectEngine:
+    """
+    Importing inflect is slow so the engine is only created the first time it is used. Servers call load on start so
+    the import happens in the executor rather than stalling the event loop on the first log message.
+    """
+    _engine = None
+
+    @classmethod
+    def _create_engine(cls) -> None:
+        if cls._engine is None:
+            import inflect
+            cls._engine = inflect.engine()
+
+    async def load(self) -> None:
+        if self._engine is None:
+            await asyncio.get_event_loop().run_in_executor(None, self._create_engine)
+
+    def __getattr__(self, item):
+        if self._engine is None:
+            self._create_engine()
+        return getattr(self._engine, item)
+
+
+p = LazyInflectEngine()
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram. Counts are kept in a preallocated array so recording a sample does not allocate.
+    Buckets start at 1 microsecond with sub_buckets buckets per doubling, percentiles are reported in milliseconds as
+    the upper bound of the bucket they fall in. Samples above max_seconds share the last bucket, which reports the max.
+    """
+    __slots__ = ('sub_buckets', 'counts', 'count', 'total', 'max', '_scale', '_last')
+
+    def __init__(self, sub_buckets: int = 8, max_seconds: float = 60):
+        self.sub_buckets = sub_buckets
+        self._scale = sub_buckets / math.log(2)
+        num_buckets = int(math.log2(max_seconds * 1000000) * sub_buckets) + 2
+        self.counts = array('Q', bytes(8 * num_buckets))
+        self._last = num_buckets - 1
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        micros = seconds * 1000000
+        if micros > 1:
+            index = int(math.log(micros) * self._scale) + 1
+            if index > self._last:
+                index = self._last
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        counts = self.counts
+        for i, num in enumerate(other.counts):
+            if num:
+                counts[i] += num
+        self.count += other.count
+        self.total += other.total
+        if other.max > self.max:
+            self.max = other.max
+
+    def reset(self) -> None:
+        counts = self.counts
+        for i in range(len(counts)):
+            counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(pct / 100 * self.count), 1)
+        seen = 0
+        for index, num in enumerate(self.counts):
+            seen += num
+            if seen >= rank:
+                if index == self._last:
+                    break
+                return min(2 ** (index / self.sub_buckets) / 1000, self.max * 1000)
+        return self.max * 1000
+
+    def buckets(self) -> Generator[Tuple[float, int], None, None]:
+        """Cumulative counts at every power of two microseconds, upper bounds are in seconds."""
+        seen = 0
+        for index in range(self._last):
+            seen += self.counts[index]
+            if not index % self.sub_buckets:
+                yield 2 ** (index // self.sub_buckets) / 1000000, seen
+
+    @property
+    def mean(self) -> float:
+        return self.total / (self.count or 1) * 1000
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p90(self) -> float:
+        return self.percentile(90)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    @property
+    def p999(self) -> float:
+        return self.percentile(99.9)
+
+    def __str__(self) -> str:
+        return f"p50={self.p50:.3f}ms p90={self.p90:.3f}ms p99={self.p99:.3f}ms p999={self.p999:.3f}ms"
@@ -1,9 +1,16 @@
 from .adaptors import ReceiverAdaptor, SenderAdaptor, BaseAdaptorProtocol
 from .connections_manager import ConnectionsManager, connections_manager
+from .dns import HostnameResolver, hostname_resolver
+from .allowed_senders import AllowedSenders, PrefixTrie
+from .deduplication import Deduplicator
+from .buffers import ReadBuffer, ReadBufferPool
+from .shared_memory import SharedMemoryRing, SharedMemoryWorkerPool
 from .connections import (BaseConnectionProtocol, NetworkConnectionProtocol, TCPServerConnection, TCPClientConnection,
                           BaseStreamConnection, BaseUDPConnection, UDPServerConnection, UDPClientConnection,
-                          UDPConnectionMixinProtocol)
+                          UDPConnectionMixinProtocol, BaseBufferedStreamConnection, BufferedTCPServerConnection,
+                          BufferedTCPClientConnection)
 from .exceptions import *
-from .protocol_factories import (BaseProtocolFactory, BaseDatagramProtocolFactory, StreamClientProtocolFactory,
-                                 StreamServerProtocolFactory, DatagramServerProtocolFactory, DatagramClientProtocolFactory)
+from .protocol_factories import (BaseProtocolFactory, BaseStreamProtocolFactory, BaseDatagramProtocolFactory,
+                                 StreamClientProtocolFactory, StreamServerProtocolFactory, DatagramServerProtocolFactory,
+                                 DatagramClientProtocolFactory)
 from .ssl import ServerSideSSL, ClientSideSSL
\ No newline at end of file
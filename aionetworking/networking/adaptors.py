@@ -1,24 +1,34 @@
 from abc import abstractmethod
 import asyncio
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 import datetime
 from functools import partial
+import time
 
 from .exceptions import MethodNotFoundError, RemoteConnectionClosedError
+from aionetworking.actions.broadcast import Subscriber
 from aionetworking.actions.protocols import ActionProtocol
 from aionetworking.compatibility import Protocol, create_task, set_task_name
 from aionetworking.logging.loggers import ConnectionLogger, get_connection_logger_receiver
+from aionetworking.logging.profiling import TimingHook
 from aionetworking.logging.utils_logging import p
 from aionetworking.types.formats import MessageObjectType, CodecType
 from aionetworking.types.networking import BaseContext
 from aionetworking.formats.recording import BufferObject, BufferCodec, get_recording_from_file
 from aionetworking.requesters.protocols import RequesterProtocol
 from aionetworking.futures.schedulers import TaskScheduler
+from aionetworking.futures.keyed_executor import KeyedExecutor
+from aionetworking.futures.work_queue import WorkQueue
+from aionetworking.utils import async_iter
 
+from .deduplication import Deduplicator
 from .protocols import AdaptorProtocol
+from .shared_memory import SharedMemoryWorkerPool
 
 from pathlib import Path
-from typing import Any, Callable, Generator, Dict, Sequence, Type, AsyncIterator, Optional
+from typing import (Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Generator, Hashable, Iterable, List,
+                    Optional, Sequence, Set, Tuple, Type, Union)
 
 
 def not_implemented_callable(*args, **kwargs) -> None:
@@ -37,27 +47,64 @@ class BaseAdaptorProtocol(AdaptorProtocol, Protocol):
     codec_config: Dict[str, Any] = field(default_factory=dict, metadata={'pickle': True})
     preaction: ActionProtocol = None
     send: Callable[[bytes], Optional[asyncio.Future]] = field(default=not_implemented_callable, repr=False, compare=False)
+    send_many: Callable[[Sequence[bytes]], Optional[asyncio.Future]] = field(default=None, repr=False, compare=False)
+    timing_hooks: Sequence[TimingHook] = field(default=(), repr=False, compare=False)
 
     def __post_init__(self) -> None:
         self.logger.new_connection()
 
-    def on_msg_sent(self, msg_encoded: bytes, task: Optional[asyncio.Future]):
+    def _on_stage_timed(self, stage: str, started: float, msg_obj: Optional[MessageObjectType]) -> float:
+        finished = time.perf_counter()
+        for hook in self.timing_hooks:
+            hook(stage, finished - started, msg_obj, self.context)
+        return finished
+
+    def on_msg_sent(self, msg_encoded: bytes, task: Optional[asyncio.Future], completed_at: float = None):
         self.logger.on_msg_sent(msg_encoded)
+        if completed_at is not None:
+            self.logger.record_latency('response_latency', time.perf_counter() - completed_at)
 
-    def send_data(self, msg_encoded: bytes) -> Optional[asyncio.Future]:
+    def send_data(self, msg_encoded: bytes, completed_at: float = None) -> Optional[asyncio.Future]:
         self.logger.on_sending_encoded_msg(msg_encoded)
         fut = self.send(msg_encoded)
         if fut:
-            fut.add_done_callback(partial(self.on_msg_sent, msg_encoded))
+            fut.add_done_callback(partial(self.on_msg_sent, msg_encoded, completed_at=completed_at))
+            return fut
+        else:
+            self.on_msg_sent(msg_encoded, None, completed_at=completed_at)
+
+    def on_msgs_sent(self, msgs_encoded: Sequence[bytes], task: Optional[asyncio.Future]):
+        self.logger.on_msgs_sent(msgs_encoded)
+
+    def _send_each(self, msgs_encoded: Sequence[bytes]) -> Optional[asyncio.Future]:
+        futs = [fut for fut in map(self.send, msgs_encoded) if fut]
+        if futs:
+            return asyncio.gather(*futs)
+
+    def send_data_many(self, msgs_encoded: Sequence[bytes]) -> Optional[asyncio.Future]:
+        self.logger.on_sending_encoded_msgs(msgs_encoded)
+        if self.send_many:
+            fut = self.send_many(msgs_encoded)
+        else:
+            fut = self._send_each(msgs_encoded)
+        if fut:
+            fut.add_done_callback(partial(self.on_msgs_sent, msgs_encoded))
             return fut
         else:
-            self.on_msg_sent(msg_encoded, None)
+            self.on_msgs_sent(msgs_encoded, None)
 
     def _set_codecs(self, buffer: Optional[bytes]):
         self.codec = self.dataformat.get_codec(buffer, logger=self.logger, context=self.context, **self.codec_config)
         self.buffer_codec: BufferCodec = self.bufferformat.get_codec(buffer, context=self.context, logger=self.logger)
 
-    def on_encode_task_finished(self, task: asyncio.Future):
+    def reload(self, **changes) -> None:
+        for name in ('dataformat', 'codec_config', 'preaction'):
+            if name in changes:
+                setattr(self, name, changes[name])
+        if 'dataformat' in changes or 'codec_config' in changes:
+            self.codec = None
+
+    def on_encode_task_finished(self, task: asyncio.Future, completed_at: float = None):
         exception = task.exception()
         if exception:
             self.logger.manage_error(exception)
@@ -65,21 +112,42 @@ class BaseAdaptorProtocol(AdaptorProtocol, Protocol):
         else:
             msg_obj = task.result()
             self.logger.on_sending_decoded_msg(msg_obj)
-            fut = self.send_data(msg_obj.encoded)
+            fut = self.send_data(msg_obj.encoded, completed_at=completed_at)
         if fut:
             fut.add_done_callback(self._scheduler.task_done)
         else:
             self._scheduler.task_done(task)
 
-    def encode_and_send_msg(self, decoded: Any) -> None:
+    async def _encode_obj_timed(self, decoded: Any) -> MessageObjectType:
+        started = time.perf_counter()
+        msg_obj = await self.codec.encode_obj(decoded)
+        self._on_stage_timed('encode', started, msg_obj)
+        return msg_obj
+
+    def encode_and_send_msg(self, decoded: Any, completed_at: float = None) -> asyncio.Future:
         if not self.codec:
             self._set_codecs(decoded)
+        coro = self._encode_obj_timed(decoded) if self.timing_hooks else self.codec.encode_obj(decoded)
+        return self._scheduler.task_with_callback(coro, callback=partial(self.on_encode_task_finished,
+                                                                         completed_at=completed_at))
+
+    def on_encode_many_task_finished(self, task: asyncio.Future):
+        if not task.cancelled() and task.exception():
+            self.logger.manage_error(task.exception())
+        self._scheduler.task_done(task)
+
+    async def _encode_and_send_msgs(self, decoded_msgs: Sequence[Any]) -> None:
+        msgs_encoded = await self.codec.encode_many(decoded_msgs)
+        fut = self.send_data_many(msgs_encoded)
+        if fut:
+            await fut
 
-        self._scheduler.task_with_callback(self.codec.encode_obj(decoded), callback=self.on_encode_task_finished)
-
-    def encode_and_send_msgs(self, decoded_msgs: Sequence[Any]) -> None:
-        for decoded_msg in decoded_msgs:
-            self.encode_and_send_msg(decoded_msg)
+    def encode_and_send_msgs(self, decoded_msgs: Sequence[Any]) -> asyncio.Future:
+        decoded_msgs = list(decoded_msgs)
+        if not self.codec:
+            self._set_codecs(decoded_msgs[0] if decoded_msgs else None)
+        return self._scheduler.task_with_callback(self._encode_and_send_msgs(decoded_msgs),
+                                                  callback=self.on_encode_many_task_finished, name='Encode_Send_Msgs')
 
     async def _run_preaction(self, buffer: bytes, timestamp: datetime.datetime = None) -> None:
         self.logger.info('Running preaction')
@@ -88,17 +156,22 @@ class BaseAdaptorProtocol(AdaptorProtocol, Protocol):
             await self.preaction.do_one(buffer_obj)
 
     def on_data_received(self, buffer: bytes, timestamp: datetime.datetime = None) -> asyncio.Future:
+        received_at = time.perf_counter()
         timestamp = timestamp or datetime.datetime.now()
         if not self.codec:
             self._set_codecs(buffer)
         self.logger.on_buffer_received(buffer)
         if self.preaction:
-            self._scheduler.task_with_callback(self._run_preaction(buffer, timestamp),
+            self._scheduler.task_with_callback(self._run_preaction(bytes(buffer), timestamp),
                                                name=f"{self.context['peer']}-Preaction")
-        msgs_generator = self.codec.decode_buffer(buffer, system_timestamp=timestamp)
-        task = self._scheduler.task_with_callback(self.process_msgs(msgs_generator, buffer), name='Process_Msgs')
+        task = self._scheduler.task_with_callback(self._process_buffer(buffer, timestamp, received_at),
+                                                  name='Process_Msgs')
         return task
 
+    def _process_buffer(self, buffer: bytes, timestamp: datetime.datetime, received_at: float) -> Awaitable[None]:
+        msgs_generator = self.codec.decode_buffer(buffer, system_timestamp=timestamp)
+        return self.process_msgs(msgs_generator, buffer, received_at)
+
     async def wait_current_tasks(self) -> None:
         await self._scheduler.wait_current_tasks()
 
@@ -109,17 +182,44 @@ class BaseAdaptorProtocol(AdaptorProtocol, Protocol):
         await self._scheduler.close()
         self.logger.connection_finished(exc)
 
+    def _on_msg_decoded(self, received_at: Optional[float], msg_obj: MessageObjectType = None) -> float:
+        decoded_at = time.perf_counter()
+        if received_at is not None:
+            self.logger.record_latency('decode_latency', decoded_at - received_at)
+            if self.timing_hooks:
+                self._on_stage_timed('decode', received_at, msg_obj)
+        return decoded_at
+
     @abstractmethod
-    async def process_msgs(self, msgs: AsyncIterator[MessageObjectType], buffer: bytes) -> None: ...
+    async def process_msgs(self, msgs: AsyncIterator[MessageObjectType], buffer: bytes,
+                           received_at: float = None) -> None: ...
 
 
 @dataclass
 class SenderAdaptor(BaseAdaptorProtocol):
     is_receiver = False
+    default_pipeline_window = 32
+    late_response_window = 60
+    max_expired_requests = 10000
     requester: RequesterProtocol = None
+    max_in_flight: int = None
+    request_timeout: Union[int, float] = None
 
     _notification_queue: asyncio.Queue = field(default_factory=asyncio.Queue, init=False, repr=False, hash=False,
                                                compare=False)
+    _in_flight: asyncio.Semaphore = field(default=None, init=False, repr=False, hash=False, compare=False)
+    _expired_requests: 'OrderedDict[Any, float]' = field(default_factory=OrderedDict, init=False, repr=False,
+                                                         hash=False, compare=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        if self.max_in_flight:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+
+    def reload(self, **changes) -> None:
+        super().reload(**changes)
+        if 'requester' in changes:
+            self.requester = changes['requester']
 
     def __getattr__(self, item):
         if item in getattr(self.requester, 'methods', ()):
@@ -142,18 +242,100 @@ class SenderAdaptor(BaseAdaptorProtocol):
         self._scheduler.cancel_all_futures(RemoteConnectionClosedError)
         await super().close(exc)
 
-    async def send_data_and_wait(self, request_id: Any, encoded: bytes) -> Any:
-        return await self._scheduler.run_wait_fut(request_id, self.send_data, encoded)
+    def _on_request_expired(self, request_id: Any) -> None:
+        now = time.monotonic()
+        expired = self._expired_requests
+        expired.pop(request_id, None)
+        while expired:
+            oldest_id, deadline = next(iter(expired.items()))
+            if deadline > now and len(expired) < self.max_expired_requests:
+                break
+            del expired[oldest_id]
+        expired[request_id] = now + self.late_response_window
+
+    async def _send_data_and_wait(self, request_id: Any, encoded: bytes, timeout: Union[int, float] = None) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await self._scheduler.run_wait_fut(request_id, self.send_data, encoded, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._on_request_expired(request_id)
+            self.logger.warning('No response received for request %s after %ss', request_id, timeout)
+            raise
+        self.logger.record_latency('request_latency', time.perf_counter() - started)
+        return result
+
+    async def send_data_and_wait(self, request_id: Any, encoded: bytes, timeout: Union[int, float] = None) -> Any:
+        timeout = timeout or self.request_timeout
+        if self._in_flight:
+            async with self._in_flight:
+                return await self._send_data_and_wait(request_id, encoded, timeout=timeout)
+        return await self._send_data_and_wait(request_id, encoded, timeout=timeout)
 
-    async def send_msg_and_wait(self, msg_obj: MessageObjectType) -> asyncio.Future:
-        return await self.send_data_and_wait(msg_obj.request_id, msg_obj.encoded)
+    async def send_msg_and_wait(self, msg_obj: MessageObjectType, timeout: Union[int, float] = None) -> asyncio.Future:
+        return await self.send_data_and_wait(msg_obj.request_id, msg_obj.encoded, timeout=timeout)
 
-    async def encode_send_wait(self, decoded: Any) -> asyncio.Future:
+    async def encode_send_wait(self, decoded: Any, timeout: Union[int, float] = None) -> asyncio.Future:
         if not self.codec:
             self._set_codecs(decoded)
         msg_obj = await self.codec.encode_obj(decoded)
         self.logger.on_sending_decoded_msg(msg_obj)
-        return await self.send_msg_and_wait(msg_obj)
+        return await self.send_msg_and_wait(msg_obj, timeout=timeout)
+
+    async def _submit_requests(self, requests: Union[Iterable[Any], AsyncIterable[Any]], window: asyncio.Semaphore,
+                               results: asyncio.Queue, pending: Set[asyncio.Future], ordered: bool,
+                               timeout: Union[int, float] = None) -> int:
+        num_submitted = 0
+        if not hasattr(requests, '__aiter__'):
+            requests = async_iter(requests)
+        async for decoded in requests:
+            await window.acquire()
+            task = create_task(self.encode_send_wait(decoded, timeout=timeout))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            task.add_done_callback(lambda t: window.release())
+            if ordered:
+                results.put_nowait(task)
+            else:
+                task.add_done_callback(results.put_nowait)
+            num_submitted += 1
+        return num_submitted
+
+    async def pipeline(self, requests: Union[Iterable[Any], AsyncIterable[Any]], window: int = None,
+                       ordered: bool = True, timeout: Union[int, float] = None,
+                       return_exceptions: bool = False) -> AsyncIterator[Any]:
+        window = asyncio.Semaphore(window or self.max_in_flight or self.default_pipeline_window)
+        results = asyncio.Queue()
+        pending = set()
+        submit_task = create_task(self._submit_requests(requests, window, results, pending, ordered,
+                                                        timeout=timeout))
+        set_task_name(submit_task, f"{self.context.get('peer')}-Pipeline")
+        num_received = 0
+        try:
+            while True:
+                if not results.empty():
+                    task = results.get_nowait()
+                elif submit_task.done():
+                    if num_received >= submit_task.result():
+                        break
+                    task = await results.get()
+                else:
+                    get_task = create_task(results.get())
+                    await asyncio.wait([get_task, submit_task], return_when=asyncio.FIRST_COMPLETED)
+                    if not get_task.done():
+                        get_task.cancel()
+                        continue
+                    task = get_task.result()
+                num_received += 1
+                try:
+                    yield await task
+                except (Exception, RemoteConnectionClosedError) as e:
+                    if not return_exceptions:
+                        raise
+                    yield e
+        finally:
+            submit_task.cancel()
+            for task in list(pending):
+                task.cancel()
 
     def _run_method(self, method: Callable, *args, **kwargs) -> None:
         decoded = method(*args, **kwargs)
@@ -182,13 +364,18 @@ class SenderAdaptor(BaseAdaptorProtocol):
             await asyncio.gather(*futs)
         self.logger.debug("Recording finished")
 
-    async def process_msgs(self, msgs: AsyncIterator[MessageObjectType], buffer: bytes) -> None:
+    async def process_msgs(self, msgs: AsyncIterator[MessageObjectType], buffer: bytes,
+                           received_at: float = None) -> None:
         async for msg in msgs:
+            self._on_msg_decoded(received_at, msg)
             if msg.request_id is not None:
                 try:
                     self._scheduler.set_result(msg.request_id, msg)
                 except KeyError:
-                    self._notification_queue.put_nowait(msg)
+                    if self._expired_requests.pop(msg.request_id, None) is not None:
+                        self.logger.debug('Discarding late response for request %s', msg.request_id)
+                    else:
+                        self._notification_queue.put_nowait(msg)
             else:
                 self._notification_queue.put_nowait(msg)
 
@@ -197,14 +384,50 @@ class SenderAdaptor(BaseAdaptorProtocol):
 class ReceiverAdaptor(BaseAdaptorProtocol):
     is_receiver = True
     action: ActionProtocol = None
+    worker_pool: SharedMemoryWorkerPool = field(default=None, repr=False, compare=False)
+    close_connection: Callable[[], None] = field(default=None, repr=False, compare=False)
+    write_buffer_size: Callable[[], int] = field(default=None, repr=False, compare=False)
+    work_queue: Union[WorkQueue, KeyedExecutor] = field(default=None, repr=False, compare=False)
+    deduplicator: Deduplicator = field(default=None, repr=False, compare=False)
+    pause_reading: Callable[[], None] = field(default=None, repr=False, compare=False)
+    resume_reading: Callable[[], None] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         super().__post_init__()
+        self._notifications_task = None
+        self._queue_lock: Optional[asyncio.Lock] = None
+        self._subscribe_to_action()
+        if self.work_queue and not self.work_queue.shared:
+            self.work_queue = replace(self.work_queue)
+            self.work_queue.start()
+
+    def _subscribe_to_action(self) -> None:
+        if self.action.supports_broadcast:
+            self.action.add_subscriber(Subscriber(self.context['peer'], self.dataformat, self.send,
+                                                  close=self.close_connection,
+                                                  write_buffer_size=self.write_buffer_size))
         if self.action.supports_notifications:
             self._notifications_task = self._scheduler.task_with_callback(self._send_action_notifications(),
                                                                           continuous=True, name='Notifications')
-        else:
+
+    def _unsubscribe_from_action(self) -> None:
+        if self.action.supports_notifications and self._notifications_task:
+            self._notifications_task.cancel()
+            self._notifications_task = None
+        if self.action.supports_broadcast:
+            self.action.remove_subscriber(self.context['peer'])
+
+    def reload(self, **changes) -> None:
+        codec_changed = 'dataformat' in changes or 'codec_config' in changes
+        if codec_changed and self._notifications_task and not self.action.supports_notifications:
+            self._notifications_task.cancel()
             self._notifications_task = None
+        super().reload(**changes)
+        action = changes.get('action')
+        if action and action is not self.action:
+            self._unsubscribe_from_action()
+            self.action = action
+            self._subscribe_to_action()
 
     def _set_codecs(self, buffer: Optional[bytes]):
         super()._set_codecs(buffer)
@@ -215,7 +438,34 @@ class ReceiverAdaptor(BaseAdaptorProtocol):
     async def close(self, exc: Optional[BaseException] = None) -> None:
         if self._notifications_task:
             self._notifications_task.cancel()
+        if self.action.supports_broadcast:
+            self.action.remove_subscriber(self.context['peer'])
         await super().close(exc)
+        if self.work_queue and not self.work_queue.shared:
+            await self.work_queue.close()
+
+    def _process_buffer(self, buffer: bytes, timestamp: datetime.datetime, received_at: float) -> Awaitable[None]:
+        if self.worker_pool:
+            return self._process_buffer_in_worker(buffer, timestamp)
+        return super()._process_buffer(buffer, timestamp, received_at)
+
+    async def _process_buffer_in_worker(self, buffer: bytes, timestamp: datetime.datetime) -> None:
+        try:
+            result = await self.worker_pool.submit(buffer, self.context, timestamp)
+        except Exception as exc:
+            self.logger.manage_error(exc)
+            raise
+        for interval, seconds in result.latencies:
+            self.logger.record_latency(interval, seconds)
+        if result.num_filtered:
+            self.logger.on_msgs_filtered(result.num_filtered, result.filtered_bytes)
+        if result.num_processed:
+            self.logger.on_msgs_processed(result.num_processed, result.processed_bytes)
+        for encoded, decoded, error in result.failed:
+            msg_obj = await self.codec.create_object(encoded, decoded, context=self.context, parent_logger=self.logger)
+            self.logger.on_msg_failed(msg_obj, RuntimeError(error))
+        for response in result.responses:
+            self.encode_and_send_msg(response)
 
     async def _send_action_notifications(self):
         async for item in self.action.get_notifications(self.context['peer']):
@@ -227,42 +477,138 @@ class ReceiverAdaptor(BaseAdaptorProtocol):
 
     def _on_exception(self, exc: BaseException, msg_obj: MessageObjectType) -> None:
         self.logger.on_msg_failed(msg_obj, exc)
+        if self.deduplicator:
+            self.deduplicator.discard(msg_obj)
         response = self.action.on_exception(msg_obj, exc)
         if response:
             self.encode_and_send_msg(response)
 
-    def _on_success(self, result: Any, msg_obj: MessageObjectType) -> None:
+    def _on_response_encoded(self, msg_obj: MessageObjectType, task: asyncio.Future) -> None:
+        if not task.cancelled() and not task.exception():
+            self.deduplicator.set_response(msg_obj, task.result().encoded)
+
+    def _send_response(self, encoded: bytes, msg_obj: MessageObjectType, completed_at: float = None) -> None:
+        if self.deduplicator:
+            self.deduplicator.set_response(msg_obj, encoded)
+        self.send_data(encoded, completed_at=completed_at)
+
+    def _on_success(self, result: Any, msg_obj: MessageObjectType, decoded_at: float = None) -> None:
+        completed_at = time.perf_counter()
+        if decoded_at is not None:
+            self.logger.record_latency('action_latency', completed_at - decoded_at)
         try:
             if result:
-                self.encode_and_send_msg(result)
+                task = self.encode_and_send_msg(result, completed_at=completed_at)
+                if self.deduplicator:
+                    task.add_done_callback(partial(self._on_response_encoded, msg_obj))
+        finally:
+            self.logger.on_msg_processed(msg_obj)
+
+    async def _on_success_cache(self, result: Any, msg_obj: MessageObjectType, key: Hashable,
+                                decoded_at: float = None) -> None:
+        completed_at = time.perf_counter()
+        if decoded_at is not None:
+            self.logger.record_latency('action_latency', completed_at - decoded_at)
+        try:
+            try:
+                template = await self.codec.encode_template(result, msg_obj.request_id)
+            except Exception as exc:
+                self.logger.debug('Unable to cache response for %s: %s', msg_obj, exc)
+                template = None
+            if template:
+                self.action.response_cache.put(key, template)
+                self._send_response(self.codec.fill_template(template, msg_obj.request_id), msg_obj, completed_at)
+            else:
+                self.encode_and_send_msg(result, completed_at=completed_at)
+        finally:
+            self.logger.on_msg_processed(msg_obj)
+
+    def _on_cache_hit(self, template: Tuple[bytes, Optional[bytes]], msg_obj: MessageObjectType,
+                      decoded_at: float = None) -> None:
+        completed_at = time.perf_counter()
+        if decoded_at is not None:
+            self.logger.record_latency('action_latency', completed_at - decoded_at)
+        try:
+            self._send_response(self.codec.fill_template(template, msg_obj.request_id), msg_obj, completed_at)
         finally:
             self.logger.on_msg_processed(msg_obj)
 
     def _on_decoding_error(self, buffer: bytes, exc: BaseException):
+        buffer = bytes(buffer)
         self.logger.manage_decode_error(buffer, exc)
         response = self.action.on_decode_error(buffer, exc)
         if response:
             self.encode_and_send_msg(response)
 
-    async def _process_msg(self, msg_obj):
+    async def _process_msg(self, msg_obj, decoded_at: float = None):
         self.logger.debug('Processing message %s', msg_obj)
+        cache = self.action.response_cache
+        key = cache.get_key(msg_obj) if cache is not None else None
+        if key is not None:
+            template = cache.get(key)
+            if template:
+                self._on_cache_hit(template, msg_obj, decoded_at)
+                return
         try:
-            result = await self.action.do_one(msg_obj)
-            self._on_success(result, msg_obj)
+            if self.timing_hooks:
+                started = time.perf_counter()
+                result = await self.action.do_one(msg_obj)
+                self._on_stage_timed('do_one', started, msg_obj)
+            else:
+                result = await self.action.do_one(msg_obj)
+            if key is not None and result:
+                await self._on_success_cache(result, msg_obj, key, decoded_at)
+            else:
+                self._on_success(result, msg_obj, decoded_at)
         except BaseException as e:
             self._on_exception(e, msg_obj)
             raise
 
-    async def process_msgs(self, msgs: AsyncIterator[MessageObjectType], buffer: bytes) -> None:
-        tasks = []
+    async def _queue_msg(self, msg_obj: MessageObjectType, decoded_at: float) -> asyncio.Future:
+        key = self.work_queue.get_key(msg_obj, self.context.get('peer'))
+        if not self.work_queue.full(key) or not self.pause_reading:
+            return await self.work_queue.put(key, self._process_msg, msg_obj, decoded_at)
+        self.pause_reading()
         try:
-            async for msg_obj in msgs:
-                if not self.action.filter(msg_obj):
-                    task = create_task(self._process_msg(msg_obj))
+            return await self.work_queue.put(key, self._process_msg, msg_obj, decoded_at)
+        finally:
+            self.resume_reading()
+
+    async def _dispatch_msgs(self, msgs: AsyncIterator[MessageObjectType], received_at: float = None,
+                             tasks: List[asyncio.Future] = None) -> None:
+        async for msg_obj in msgs:
+            decoded_at = self._on_msg_decoded(received_at, msg_obj)
+            if self.deduplicator and self.deduplicator.is_duplicate(msg_obj):
+                self.logger.on_msg_duplicate(msg_obj)
+                response = self.deduplicator.get_response(msg_obj)
+                if response:
+                    self.send_data(response)
+                continue
+            filtered = self.action.filter(msg_obj)
+            if self.timing_hooks:
+                self._on_stage_timed('filter', decoded_at, msg_obj)
+            if not filtered:
+                if self.work_queue:
+                    tasks.append(await self._queue_msg(msg_obj, decoded_at))
+                else:
+                    task = create_task(self._process_msg(msg_obj, decoded_at))
                     set_task_name(task, f'Process {msg_obj}')
                     tasks.append(task)
-                else:
-                    self.logger.on_msg_filtered(msg_obj)
+            else:
+                self.logger.on_msg_filtered(msg_obj)
+
+    async def process_msgs(self, msgs: AsyncIterator[MessageObjectType], buffer: bytes,
+                           received_at: float = None) -> None:
+        tasks = []
+        try:
+            if self.work_queue:
+                # A full queue makes puts wait, buffers are queued one after another so their messages stay in order
+                if not self._queue_lock:
+                    self._queue_lock = asyncio.Lock()
+                async with self._queue_lock:
+                    await self._dispatch_msgs(msgs, received_at, tasks)
+            else:
+                await self._dispatch_msgs(msgs, received_at, tasks)
             await asyncio.wait_for(asyncio.gather(*tasks), timeout=self.action.task_timeout)
         except Exception as exc:
             self._on_decoding_error(buffer, exc)
@@ -0,0 +1,188 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from ipaddress import ip_address
+import os
+from pathlib import Path
+
+from aionetworking.futures.schedulers import TaskScheduler
+from aionetworking.logging.loggers import get_logger_receiver
+from aionetworking.types.logging import LoggerType
+from aionetworking.utils import dataclass_getstate, dataclass_setstate, IPNetwork
+
+from typing import Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+
+class PrefixTrie:
+    """
+    Binary trie of network prefixes. A lookup walks at most one node per bit of the address and stops at the first
+    network which contains it. Nodes are [zero, one, terminal] lists, networks covered by a shorter prefix are not
+    stored and are removed when the shorter prefix is added after them.
+    """
+    __slots__ = ('bits', '_root', '_size')
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self._root = [None, None, False]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _count(node: Optional[list]) -> int:
+        if node is None:
+            return 0
+        if node[2]:
+            return 1
+        return PrefixTrie._count(node[0]) + PrefixTrie._count(node[1])
+
+    def add(self, network: int, prefixlen: int) -> None:
+        node = self._root
+        for shift in range(self.bits - 1, self.bits - 1 - prefixlen, -1):
+            if node[2]:
+                return
+            bit = (network >> shift) & 1
+            child = node[bit]
+            if child is None:
+                child = node[bit] = [None, None, False]
+            node = child
+        if node[2]:
+            return
+        self._size += 1 - self._count(node[0]) - self._count(node[1])
+        node[0] = node[1] = None
+        node[2] = True
+
+    def __contains__(self, address: int) -> bool:
+        node = self._root
+        for shift in range(self.bits - 1, -1, -1):
+            if node[2]:
+                return True
+            node = node[(address >> shift) & 1]
+            if node is None:
+                return False
+        return node[2]
+
+
+def read_networks(path: Path) -> List[IPNetwork]:
+    networks = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                networks.append(IPNetwork(line))
+    return networks
+
+
+@dataclass
+class AllowedSenders:
+    """
+    Allowed senders compiled into prefix tries for IPv4 and IPv6 networks and a set of hostnames so checking a peer
+    does not depend on the number of entries. Recent verdicts are cached. Entries can also be read from a file with one
+    network or hostname per line, which is checked for changes every reload_interval seconds.
+    """
+    networks: Sequence[Union[IPNetwork, str]] = field(default_factory=tuple, metadata={'pickle': True})
+    path: Path = None
+    reload_interval: Union[int, float] = 0
+    cache_size: int = 4096
+    logger: LoggerType = field(default_factory=get_logger_receiver, compare=False, repr=False)
+    _ipv4: PrefixTrie = field(default=None, init=False, compare=False, repr=False)
+    _ipv6: PrefixTrie = field(default=None, init=False, compare=False, repr=False)
+    _hostnames: Set[str] = field(default_factory=set, init=False, compare=False, repr=False)
+    _verdicts: 'OrderedDict[Tuple[str, str], bool]' = field(default_factory=OrderedDict, init=False, compare=False,
+                                                            repr=False)
+    _mtime: Optional[float] = field(default=None, init=False, compare=False, repr=False)
+    _scheduler: TaskScheduler = field(default_factory=TaskScheduler, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.networks = tuple(n if isinstance(n, IPNetwork) else IPNetwork(n) for n in self.networks)
+        file_networks = ()
+        if self.path:
+            self.path = Path(self.path)
+            self._mtime = self._get_mtime()
+            file_networks = read_networks(self.path)
+        self._compile(file_networks)
+
+    def __getstate__(self):
+        return dataclass_getstate(self)
+
+    def __setstate__(self, state):
+        dataclass_setstate(self, state)
+
+    def __bool__(self) -> bool:
+        return bool(self.networks or self.path)
+
+    def __iter__(self):
+        return iter(self.networks)
+
+    def __len__(self) -> int:
+        return len(self._ipv4) + len(self._ipv6) + len(self._hostnames)
+
+    @property
+    def has_hostnames(self) -> bool:
+        return bool(self._hostnames)
+
+    def _compile(self, file_networks: Iterable[IPNetwork]) -> None:
+        ipv4, ipv6, hostnames = PrefixTrie(32), PrefixTrie(128), set()
+        for network in (*self.networks, *file_networks):
+            if network.ip_network:
+                trie = ipv6 if network.is_ipv6 else ipv4
+                trie.add(int(network.ip_network.network_address), network.ip_network.prefixlen)
+            elif network.hostname:
+                hostnames.add(network.hostname)
+        self._ipv4, self._ipv6, self._hostnames = ipv4, ipv6, hostnames
+        self._verdicts.clear()
+
+    def _match(self, address: str, hostname: Optional[str]) -> bool:
+        if hostname in self._hostnames:
+            return True
+        try:
+            ip = ip_address(address)
+        except ValueError:
+            return False
+        trie = self._ipv6 if ip.version == 6 else self._ipv4
+        return int(ip) in trie
+
+    def is_allowed(self, address: str, hostname: str = None) -> bool:
+        key = (address, hostname)
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            verdict = self._verdicts[key] = self._match(address, hostname)
+            if len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+        return verdict
+
+    def _get_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    async def reload(self) -> bool:
+        if not self.path:
+            return False
+        loop = asyncio.get_event_loop()
+        try:
+            mtime = await loop.run_in_executor(None, self._get_mtime)
+            file_networks = await loop.run_in_executor(None, read_networks, self.path)
+        except (OSError, ValueError) as e:
+            self.logger.error('Unable to reload allowed senders from %s: %s', self.path, e)
+            return False
+        self._mtime = mtime
+        self._compile(file_networks)
+        self.logger.info('Loaded %s allowed senders from %s', len(self), self.path)
+        return True
+
+    async def check_file(self) -> None:
+        mtime = await asyncio.get_event_loop().run_in_executor(None, self._get_mtime)
+        if mtime != self._mtime:
+            await self.reload()
+
+    def start(self, logger: LoggerType = None) -> None:
+        self.logger = logger or self.logger
+        if self.path and self.reload_interval:
+            self._scheduler.call_coro_periodic(self.reload_interval, self.check_file, fixed_start_time=False,
+                                               task_name=f'Check {self.path} for changes')
+
+    async def close(self) -> None:
+        await self._scheduler.close()
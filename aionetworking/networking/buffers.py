@@ -0,0 +1,58 @@
+from typing import List, Tuple
+
+
+class ReadBuffer:
+    """
+    Preallocated bytearray which a BufferedProtocol reads into. Views handed out are leased until the data has been
+    processed, the buffer is only rewound when no leases are outstanding.
+    """
+    __slots__ = ('data', 'view', 'pos', 'leases')
+
+    def __init__(self, size: int):
+        self.data = bytearray(size)
+        self.view = memoryview(self.data)
+        self.pos = 0
+        self.leases = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self.data) - self.pos
+
+
+class ReadBufferPool:
+    max_free_buffers = 4
+
+    def __init__(self, size: int = 262144, min_read_size: int = None):
+        self.size = size
+        self.min_read_size = min_read_size or max(size // 4, 1)
+        self._free: List[ReadBuffer] = []
+        self._current = ReadBuffer(size)
+        self.num_allocated = 1
+
+    def _next_buffer(self) -> ReadBuffer:
+        if self._free:
+            return self._free.pop()
+        self.num_allocated += 1
+        return ReadBuffer(self.size)
+
+    def get_buffer(self, sizehint: int = -1) -> memoryview:
+        buf = self._current
+        if not buf.leases:
+            buf.pos = 0
+        elif buf.remaining < min(max(self.min_read_size, sizehint), self.size):
+            buf = self._current = self._next_buffer()
+        return buf.view[buf.pos:]
+
+    def buffer_updated(self, nbytes: int) -> Tuple[memoryview, ReadBuffer]:
+        buf = self._current
+        data = buf.view[buf.pos:buf.pos + nbytes]
+        buf.pos += nbytes
+        buf.leases += 1
+        return data, buf
+
+    def release(self, buf: ReadBuffer) -> None:
+        buf.leases -= 1
+        if not buf.leases and buf is not self._current:
+            buf.pos = 0
+            if len(self._free) < self.max_free_buffers:
+                self._free.append(buf)
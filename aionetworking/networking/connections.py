@@ -7,21 +7,24 @@ import socket
 
 from .exceptions import MessageFromNotAuthorizedHost
 
-from aionetworking.compatibility import create_task, set_task_name
+from aionetworking.compatibility import create_task, set_task_name, BufferedProtocol
 from aionetworking.logging.loggers import get_logger_receiver
 from aionetworking.types.logging import LoggerType, ConnectionLoggerType
 from aionetworking.types.networking import AFINETContext, AFUNIXContext, NamedPipeContext, BaseContext
-from aionetworking.utils import addr_tuple_to_str, dataclass_getstate, dataclass_setstate, IPNetwork, supernet_of, hostname_or_ip
+from aionetworking.utils import addr_tuple_to_str, dataclass_getstate, dataclass_setstate, IPNetwork
 from aionetworking.futures.value_waiters import StatusWaiter
 
 from .connections_manager import connections_manager
+from .allowed_senders import AllowedSenders
+from .dns import HostnameResolver, hostname_resolver
 from .adaptors import ReceiverAdaptor, SenderAdaptor
 from .protocols import (
     ConnectionDataclassProtocol, AdaptorProtocolGetattr, UDPConnectionMixinProtocol, SenderAdaptorGetattr)
 from .transports import TransportType, DatagramTransportWrapper
+from .buffers import ReadBuffer, ReadBufferPool
 from aionetworking.types.networking import AdaptorType, SenderAdaptorType
 
-from typing import NoReturn, Optional, Tuple, Type, Dict, Any, Sequence, Callable, Awaitable, List
+from typing import NoReturn, Optional, Tuple, Type, Dict, Any, Sequence, Callable, Awaitable, List, Union
 from aionetworking.compatibility import Protocol
 from .ssl import check_peercert_expired
 
@@ -75,19 +78,34 @@ class BaseConnectionProtocol(AdaptorProtocolGetattr, ConnectionDataclassProtocol
             'dataformat': self.dataformat,
             'preaction': self.preaction,
             'send': self.send,
+            'send_many': self.send_many,
             'codec_config': self.codec_config,
             'logger': self._get_connection_logger(),
+            'timing_hooks': self.timing_hooks,
         }
         if self.adaptor_cls.is_receiver:
             self._adaptor = self._get_receiver_adaptor(**kwargs)
         else:
             self._adaptor = self._get_sender_adaptor(**kwargs)
 
+    def reload(self, **changes) -> None:
+        for name, value in changes.items():
+            setattr(self, name, value)
+        if self._adaptor:
+            self._adaptor.reload(**changes)
+
     def _get_receiver_adaptor(self, **kwargs) -> AdaptorType:
-        return self.adaptor_cls(action=self.action, **kwargs)
+        kwargs.setdefault('close_connection', self.close)
+        return self.adaptor_cls(action=self.action, worker_pool=self.worker_pool, work_queue=self.work_queue,
+                                deduplicator=self.deduplicator, write_buffer_size=self._write_buffer_size, **kwargs)
+
+    def _write_buffer_size(self) -> int:
+        transport = getattr(self, 'transport', None)
+        return transport.get_write_buffer_size() if transport else 0
 
     def _get_sender_adaptor(self, **kwargs) -> SenderAdaptorType:
-        return self.adaptor_cls(requester=self.requester, **kwargs)
+        return self.adaptor_cls(requester=self.requester, max_in_flight=self.max_in_flight,
+                                request_timeout=self.request_timeout, **kwargs)
 
     def is_child(self, parent_name: str) -> bool:
         return parent_name == self.parent_name
@@ -140,11 +158,20 @@ class BaseConnectionProtocol(AdaptorProtocolGetattr, ConnectionDataclassProtocol
 class NetworkConnectionProtocol(BaseConnectionProtocol, Protocol):
     transport: asyncio.BaseTransport = field(default=None, init=False)
     pause_reading_on_buffer_size: int = None
-    allowed_senders: Sequence[IPNetwork] = field(default_factory=tuple)
+    allowed_senders: Union[AllowedSenders, Sequence[IPNetwork]] = field(default_factory=tuple)
     hostname_lookup: bool = False
+    hostname_resolver: HostnameResolver = field(default=None, compare=False, repr=False)
     connection_lost_tasks: List[AsyncCallable] = field(default_factory=list)
     check_peer_cert_expiry: int = 7
     _unprocessed_data: int = field(default=0, init=False, repr=False)
+    _reading_paused: bool = field(default=False, init=False, repr=False)
+    _hostname_task: Optional[asyncio.Task] = field(default=None, init=False, repr=False, compare=False)
+    _pending_data: Optional[List[bytes]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.allowed_senders and not isinstance(self.allowed_senders, AllowedSenders):
+            self.allowed_senders = AllowedSenders(self.allowed_senders)
 
     def _raise_message_from_not_authorized_host(self, host: str) -> NoReturn:
         msg = f"Received message from unauthorized host {host}"
@@ -153,13 +180,23 @@ class NetworkConnectionProtocol(BaseConnectionProtocol, Protocol):
 
     def _sender_valid(self, peer_ip, peer_hostname):
         if self.allowed_senders:
-            return supernet_of(peer_ip, peer_hostname, self.allowed_senders)
+            return self.allowed_senders.is_allowed(peer_ip, peer_hostname)
         return True
 
     def _check_peer(self) -> None:
         if not self._sender_valid(self.context['address'], self.context['host']):
             self._raise_message_from_not_authorized_host(self.context['host'])
 
+    def _needs_hostname(self) -> bool:
+        return bool(self._hostname_task and not self._hostname_task.done() and self.allowed_senders and
+                    self.allowed_senders.has_hostnames and
+                    not self._sender_valid(self.context['address'], self.context['host']))
+
+    def _defer_start(self) -> bool:
+        self.logger.warning('Hostname of %s is not known yet, rejecting until the lookup completes',
+                            self.context['address'])
+        return False
+
     def close(self, immediate: bool = False):
         if not self.transport.is_closing():
             self.transport.close()
@@ -173,15 +210,48 @@ class NetworkConnectionProtocol(BaseConnectionProtocol, Protocol):
         self.context.update(extra_context)
         try:
             if self.context.get('host'):
+                if self._needs_hostname():
+                    return self._defer_start()
                 self._check_peer()
-            self.last_msg = datetime.datetime.now()
-            self._start_adaptor()
-            self._status.set_started()
+            self._start()
             return True
         except MessageFromNotAuthorizedHost:
             self.close(immediate=True)
             return False
 
+    def _start(self) -> None:
+        self.last_msg = datetime.datetime.now()
+        self._start_adaptor()
+        self._status.set_started()
+
+    def _start_after_hostname(self) -> None:
+        try:
+            self._check_peer()
+        except MessageFromNotAuthorizedHost:
+            self.close(immediate=True)
+        else:
+            self._start()
+
+    def _get_hostname_resolver(self) -> HostnameResolver:
+        return self.hostname_resolver or hostname_resolver
+
+    def _set_alias(self) -> None:
+        if self.context['host'] not in self.context['address']:
+            self.context['alias'] = f"{self.context['host']}({self.context['peer']})"
+        else:
+            self.context['alias'] = self.context['host']
+
+    async def _resolve_hostname(self, address: str) -> None:
+        host = await self._get_hostname_resolver().resolve(address)
+        if self.is_closing():
+            return
+        if host != self.context['host']:
+            self.context['host'] = host
+            self._set_alias()
+            self.logger.debug('Resolved %s to %s', address, host)
+        if self._pending_data is not None:
+            self._start_after_hostname()
+
     def add_connection_lost_task(self, async_function: AsyncCallable):
         self.connection_lost_tasks.append(async_function)
 
@@ -230,10 +300,13 @@ class NetworkConnectionProtocol(BaseConnectionProtocol, Protocol):
             sockname: Tuple[str, int] = transport.get_extra_info('sockname')[0:2]
             peer_str = addr_tuple_to_str(peer)
             sock_str = addr_tuple_to_str(sockname)
+            host = peer[0]
             if self.hostname_lookup:
-                host = hostname_or_ip(peer[0])
-            else:
-                host = peer[0]
+                cached = self._get_hostname_resolver().get_cached(peer[0])
+                if cached:
+                    host = cached
+                else:
+                    self._hostname_task = create_task(self._resolve_hostname(peer[0]))
             self.context: AFINETContext = {
                 'protocol_name': self.context['protocol_name'],
                 'peer': peer_str,
@@ -245,10 +318,7 @@ class NetworkConnectionProtocol(BaseConnectionProtocol, Protocol):
                 'server': sock_str if self.adaptor_cls.is_receiver else peer_str,
                 'client': peer_str if self.adaptor_cls.is_receiver else sock_str
             }
-            if self.context['host'] not in self.context['address']:
-                self.context['alias'] = f"{self.context['host']}({self.context['peer']})"
-            else:
-                self.context['alias'] = self.context['host']
+            self._set_alias()
         self.log_context()
         cipher = transport.get_extra_info('cipher', default=None)
         if cipher:
@@ -265,10 +335,15 @@ class NetworkConnectionProtocol(BaseConnectionProtocol, Protocol):
         self.transport.write(msg)
         self.last_msg = datetime.datetime.now()
 
+    def send_many(self, msgs: Sequence[bytes]) -> None:
+        self.transport.writelines(msgs)
+        self.last_msg = datetime.datetime.now()
+
 
 @dataclass
 class BaseStreamConnection(NetworkConnectionProtocol, Protocol):
     transport: asyncio.Transport = field(default=None, init=False, repr=False, compare=False)
+    _queue_full: int = field(default=0, init=False, repr=False, compare=False)
 
     def connection_made(self, transport: asyncio.Transport) -> None:
         self.transport = transport
@@ -277,6 +352,25 @@ class BaseStreamConnection(NetworkConnectionProtocol, Protocol):
     def _close_transport(self, task: asyncio.Future):
         self.transport.close()
 
+    def _pause_until_started(self) -> None:
+        if self._pending_data is not None and not self.transport.is_closing():
+            self.transport.pause_reading()
+
+    def _defer_start(self) -> bool:
+        self._pending_data = []
+        asyncio.get_event_loop().call_soon(self._pause_until_started)
+        self.logger.debug('Waiting for hostname of %s before checking sender', self.context['address'])
+        return True
+
+    def _start_after_hostname(self) -> None:
+        pending, self._pending_data = self._pending_data, None
+        super()._start_after_hostname()
+        if self.is_connected():
+            for data in pending:
+                self._process_data(data)
+            if not self._reading_paused and not self.transport.is_closing():
+                self.transport.resume_reading()
+
     def close(self, immediate: bool = False):
         if not self.transport.is_closing():
             if immediate:
@@ -292,24 +386,78 @@ class BaseStreamConnection(NetworkConnectionProtocol, Protocol):
         self.run_connection_lost_tasks()
         self.finish_connection(exc)
 
+    def _get_receiver_adaptor(self, **kwargs) -> AdaptorType:
+        return super()._get_receiver_adaptor(pause_reading=self._pause_reading_queue_full,
+                                             resume_reading=self._resume_reading_queue_ready, **kwargs)
+
+    def _pause_reading_queue_full(self) -> None:
+        self._queue_full += 1
+        if not self._reading_paused and not self.transport.is_closing():
+            self.transport.pause_reading()
+            self._reading_paused = True
+            self.logger.info('Reading paused until the action work queue has room')
+
+    def _resume_reading_queue_ready(self) -> None:
+        self._queue_full -= 1
+        if not self._queue_full and self._reading_paused and not self.transport.is_closing():
+            if self.pause_reading_on_buffer_size is None or \
+                    self.pause_reading_on_buffer_size >= self._unprocessed_data:
+                self.transport.resume_reading()
+                self._reading_paused = False
+                self.logger.info('Reading resumed')
+
     def _resume_reading(self, datalen: int, fut: asyncio.Future):
         self._unprocessed_data -= datalen
-        if (self.pause_reading_on_buffer_size is not None and not self.transport.is_reading() and
-                not self.transport.is_closing()):
-            if self.pause_reading_on_buffer_size >= self._unprocessed_data:
+        if self._reading_paused and not self._queue_full and not self.transport.is_closing():
+            if self.pause_reading_on_buffer_size is None or \
+                    self.pause_reading_on_buffer_size >= self._unprocessed_data:
                 self.transport.resume_reading()
+                self._reading_paused = False
                 self._adaptor.logger.info('Reading resumed')
         fut.result()
 
-    def data_received(self, data: bytes) -> None:
+    def _process_data(self, data: bytes) -> asyncio.Future:
         self.last_msg = datetime.datetime.now()
         self._unprocessed_data += len(data)
-        if self.pause_reading_on_buffer_size is not None:
+        if self.pause_reading_on_buffer_size is not None and not self._reading_paused:
             if self.pause_reading_on_buffer_size <= len(data):
                 self.transport.pause_reading()
+                self._reading_paused = True
                 self.logger.info('Reading Paused')
         task = self._adaptor.on_data_received(data, timestamp=self.last_msg)
         task.add_done_callback(partial(self._resume_reading, len(data)))
+        return task
+
+    def data_received(self, data: bytes) -> None:
+        if self._pending_data is not None:
+            self._pending_data.append(data)
+        else:
+            self._process_data(data)
+
+
+@dataclass
+class BaseBufferedStreamConnection(BaseStreamConnection, Protocol):
+    read_buffer_size: int = 262144
+    _read_buffers: ReadBufferPool = field(default=None, init=False, repr=False, compare=False)
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self._read_buffers = ReadBufferPool(self.read_buffer_size)
+        super().connection_made(transport)
+
+    def _release_buffer(self, buffer: ReadBuffer, fut: asyncio.Future) -> None:
+        self._read_buffers.release(buffer)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self._read_buffers.get_buffer(sizehint)
+
+    def buffer_updated(self, nbytes: int) -> None:
+        data, buffer = self._read_buffers.buffer_updated(nbytes)
+        if self._pending_data is not None:
+            self._pending_data.append(bytes(data))
+            self._read_buffers.release(buffer)
+            return
+        task = self._process_data(data)
+        task.add_done_callback(partial(self._release_buffer, buffer))
 
 
 @dataclass
@@ -321,6 +469,10 @@ class BaseUDPConnection(NetworkConnectionProtocol, UDPConnectionMixinProtocol):
         self.transport = transport
         return self.initialize_connection(transport)
 
+    def _get_receiver_adaptor(self, **kwargs) -> AdaptorType:
+        # The transport is shared by all peers so slow broadcast subscribers are only removed, never closed
+        return super()._get_receiver_adaptor(close_connection=None, **kwargs)
+
     def connection_lost(self, exc: Optional[BaseException]) -> None:
         self.run_connection_lost_tasks()
         self.finish_connection(exc)
@@ -338,6 +490,18 @@ class TCPClientConnection(BaseStreamConnection, SenderAdaptorGetattr, asyncio.Pr
     adaptor_cls: Type[AdaptorType] = SenderAdaptor
 
 
+@dataclass
+class BufferedTCPServerConnection(BaseBufferedStreamConnection, BufferedProtocol):
+    name = 'TCP Server'
+    adaptor_cls: Type[AdaptorType] = ReceiverAdaptor
+
+
+@dataclass
+class BufferedTCPClientConnection(BaseBufferedStreamConnection, SenderAdaptorGetattr, BufferedProtocol):
+    name = 'TCP Client'
+    adaptor_cls: Type[AdaptorType] = SenderAdaptor
+
+
 @dataclass
 class UDPServerConnection(BaseUDPConnection):
     name = 'UDP Server'
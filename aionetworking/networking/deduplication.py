@@ -0,0 +1,130 @@
+from collections import deque
+from dataclasses import dataclass, field
+import hashlib
+import time
+
+from aionetworking.types.formats import MessageObjectType
+from aionetworking.utils import dataclass_getstate, dataclass_setstate
+
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Union
+
+
+@dataclass
+class Deduplicator:
+    """
+    Drops messages already seen within the last window seconds, before they are filtered or passed to the action.
+    Messages are keyed by uid, or by a digest of the encoded bytes if key is 'encoded', and by default also by the
+    sender's address so a client retransmitting after a reconnect is still caught. Seen keys are kept in a ring of
+    buckets dicts, the oldest bucket is dropped as time moves on or when the newest is full so at most max_size keys
+    are held. Messages without an id are never dropped when keyed by uid. A message which fails processing is
+    forgotten so a retransmit is tried again. The encoded response to a message is kept with its key so it can be
+    sent again for a duplicate, a duplicate arriving before the first response was sent gets no reply of its own.
+    """
+    key: str = 'uid'
+    hash_name: str = 'blake2b'
+    window: Union[int, float] = 60
+    buckets: int = 6
+    max_size: int = 100000
+    per_sender: bool = True
+    duplicates: int = field(default=0, init=False, compare=False, repr=False)
+    _ring: Deque[Dict[Hashable, Optional[bytes]]] = field(default=None, init=False, compare=False, repr=False)
+    _rotate_at: float = field(default=0.0, init=False, compare=False, repr=False)
+    _get_value: Callable[[MessageObjectType], Hashable] = field(default=None, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.key not in ('uid', 'encoded'):
+            raise ValueError(f"Deduplicator key must be 'uid' or 'encoded', not {self.key}")
+        if self.buckets < 1:
+            raise ValueError('Deduplicator needs at least one bucket')
+        self._get_value = self._compile()
+        self.clear()
+
+    def __getstate__(self):
+        return dataclass_getstate(self)
+
+    def __setstate__(self, state):
+        dataclass_setstate(self, state)
+
+    def _compile(self) -> Callable[[MessageObjectType], Hashable]:
+        if self.key == 'uid':
+            def get_value(msg: MessageObjectType) -> Hashable:
+                uid = msg.uid
+                return None if uid == id(msg) else uid
+        else:
+            hash_name = self.hash_name
+            hashlib.new(hash_name)      # Raises ValueError for an unknown algorithm
+
+            def get_value(msg: MessageObjectType) -> Hashable:
+                return hashlib.new(hash_name, msg.encoded).digest()
+        return get_value
+
+    @property
+    def bucket_interval(self) -> float:
+        return self.window / self.buckets
+
+    @property
+    def size(self) -> int:
+        return sum(len(bucket) for bucket in self._ring)
+
+    def clear(self) -> None:
+        self._ring = deque(({} for _ in range(self.buckets)), maxlen=self.buckets)
+        self._rotate_at = time.monotonic() + self.bucket_interval
+
+    def get_key(self, msg: MessageObjectType) -> Optional[Hashable]:
+        value = self._get_value(msg)
+        if value is None:
+            return None
+        if self.per_sender:
+            return msg.context.get('address'), value
+        return value
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        if now >= self._rotate_at:
+            steps = min(int((now - self._rotate_at) / self.bucket_interval) + 1, self.buckets)
+            for _ in range(steps):
+                self._ring.appendleft({})
+            self._rotate_at = now + self.bucket_interval
+
+    def is_duplicate(self, msg: MessageObjectType) -> bool:
+        key = self.get_key(msg)
+        if key is None:
+            return False
+        self._expire()
+        for bucket in self._ring:
+            if key in bucket:
+                self.duplicates += 1
+                return True
+        newest = self._ring[0]
+        if len(newest) >= max(self.max_size // self.buckets, 1):
+            self._ring.appendleft({})
+            newest = self._ring[0]
+        newest[key] = None
+        return False
+
+    def set_response(self, msg: MessageObjectType, response: bytes) -> None:
+        key = self.get_key(msg)
+        if key is not None:
+            for bucket in self._ring:
+                if key in bucket:
+                    bucket[key] = response
+                    return
+
+    def get_response(self, msg: MessageObjectType) -> Optional[bytes]:
+        key = self.get_key(msg)
+        if key is not None:
+            for bucket in self._ring:
+                if key in bucket:
+                    return bucket[key]
+        return None
+
+    def discard(self, msg: MessageObjectType) -> None:
+        key = self.get_key(msg)
+        if key is not None:
+            for bucket in self._ring:
+                bucket.pop(key, None)
+
+    def __contains__(self, msg: Any) -> bool:
+        key = self.get_key(msg)
+        self._expire()
+        return key is not None and any(key in bucket for bucket in self._ring)
@@ -0,0 +1,145 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import os
+from pathlib import Path
+import re
+import socket
+import time
+
+from aionetworking.compatibility import create_task
+from aionetworking.logging.loggers import get_logger_receiver
+from aionetworking.types.logging import LoggerType
+from aionetworking.utils import dataclass_getstate, dataclass_setstate, ipv4_or_ipv6
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+
+ipv4_pattern = re.compile(r'(?<![\d.])(?:\d{1,3}\.){3}\d{1,3}(?![\d.])')
+ipv6_pattern = re.compile(r'(?<![\w:])(?:[0-9a-fA-F]{0,4}:){2,7}[0-9a-fA-F]{0,4}(?![\w:])')
+
+
+def addresses_in_text(text: str) -> Set[str]:
+    addresses = set()
+    for candidate in (*ipv4_pattern.findall(text), *ipv6_pattern.findall(text)):
+        try:
+            addresses.add(str(ipv4_or_ipv6(candidate)))
+        except ValueError:
+            pass
+    return addresses
+
+
+@dataclass
+class HostnameResolver:
+    """
+    Reverse DNS lookups which never block the event loop. Lookups run in the loop's executor via getnameinfo, names
+    are cached for ttl seconds and failed lookups for negative_ttl seconds so a slow or broken resolver is asked at
+    most once per address in that time. Concurrent lookups for the same address share one request.
+    """
+    ttl: Union[int, float] = 300
+    negative_ttl: Union[int, float] = 60
+    max_size: int = 10000
+    timeout: Union[int, float] = 5
+    prefetch_logs: Sequence[Path] = field(default_factory=tuple)
+    logger: LoggerType = field(default_factory=get_logger_receiver, compare=False, repr=False)
+    _cache: 'OrderedDict[str, Tuple[str, float]]' = field(default_factory=OrderedDict, init=False, compare=False,
+                                                          repr=False)
+    _pending: Dict[str, asyncio.Future] = field(default_factory=dict, init=False, compare=False, repr=False)
+    _prefetch_task: Optional[asyncio.Task] = field(default=None, init=False, compare=False, repr=False)
+
+    def __getstate__(self):
+        return dataclass_getstate(self)
+
+    def __setstate__(self, state):
+        dataclass_setstate(self, state)
+
+    @property
+    def cache_size(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def get_cached(self, address: str) -> Optional[str]:
+        entry = self._cache.get(address)
+        if entry:
+            host, expires = entry
+            if expires > time.monotonic():
+                self._cache.move_to_end(address)
+                return host
+            del self._cache[address]
+        return None
+
+    def _store(self, address: str, host: str, ttl: Union[int, float]) -> None:
+        self._cache[address] = (host, time.monotonic() + ttl)
+        self._cache.move_to_end(address)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    async def _getnameinfo(self, address: str) -> str:
+        if os.name == 'nt':
+            if address == '127.0.0.1':
+                return 'localhost'
+            elif address == '::1':
+                return 'ip6-localhost'
+        loop = asyncio.get_event_loop()
+        host, port = await loop.getnameinfo((address, 0), socket.NI_NAMEREQD)
+        return host
+
+    async def _lookup(self, address: str) -> str:
+        start = time.perf_counter()
+        try:
+            host = await asyncio.wait_for(self._getnameinfo(address), self.timeout)
+        except (OSError, UnicodeError, asyncio.TimeoutError) as e:
+            self.logger.debug('Reverse lookup for %s failed after %.3fs: %s', address, time.perf_counter() - start,
+                              e.__class__.__name__)
+            self._store(address, address, self.negative_ttl)
+            return address
+        self._store(address, host, self.ttl)
+        return host
+
+    def _lookup_done(self, address: str, fut: asyncio.Future) -> None:
+        if self._pending.get(address) is fut:
+            del self._pending[address]
+
+    async def resolve(self, address: str) -> str:
+        host = self.get_cached(address)
+        if host:
+            return host
+        fut = self._pending.get(address)
+        if not fut or fut.get_loop() is not asyncio.get_event_loop():
+            fut = self._pending[address] = create_task(self._lookup(address))
+            fut.add_done_callback(lambda f: self._lookup_done(address, f))
+        return await asyncio.shield(fut)
+
+    async def prefetch(self, addresses: Iterable[str]) -> List[str]:
+        return await asyncio.gather(*[self.resolve(address) for address in set(addresses)])
+
+    async def prefetch_from_log(self, path: Path) -> int:
+        loop = asyncio.get_event_loop()
+        text = await loop.run_in_executor(None, Path(path).read_text, 'utf-8', 'replace')
+        addresses = addresses_in_text(text)
+        await self.prefetch(addresses)
+        self.logger.info('Prefetched hostnames for %s addresses from %s', len(addresses), path)
+        return len(addresses)
+
+    async def _prefetch_logs(self) -> None:
+        for path in self.prefetch_logs:
+            try:
+                await self.prefetch_from_log(path)
+            except OSError as e:
+                self.logger.warning('Unable to prefetch hostnames from %s: %s', path, e)
+
+    def start(self, logger: LoggerType = None) -> None:
+        self.logger = logger or self.logger
+        if self.prefetch_logs and not self._prefetch_task:
+            self._prefetch_task = create_task(self._prefetch_logs())
+
+    async def close(self) -> None:
+        if self._prefetch_task:
+            task, self._prefetch_task = self._prefetch_task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+hostname_resolver = HostnameResolver()
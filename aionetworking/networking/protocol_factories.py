@@ -3,29 +3,42 @@ from dataclasses import dataclass, field, replace
 import datetime
 
 from aionetworking.actions.protocols import ActionProtocol
+from aionetworking.compatibility import supports_buffered_protocol
 from aionetworking.formats.base import BaseMessageObject
-from aionetworking.futures import TaskScheduler
+from aionetworking.futures import TaskScheduler, WorkQueue, KeyedExecutor
 from aionetworking.types.requesters import RequesterType
 from aionetworking.logging.loggers import get_logger_receiver
+from aionetworking.logging.profiling import SlowMessageSampler, TimingHook
 from aionetworking.logging.utils_logging import p
 from aionetworking.types.logging import LoggerType
 from aionetworking.types.networking import BaseContext
-from aionetworking.utils import dataclass_getstate, dataclass_setstate, addr_tuple_to_str, IPNetwork
+from aionetworking.utils import (dataclass_getstate, dataclass_setstate, dataclass_changed_fields, addr_tuple_to_str,
+                                 IPNetwork)
 from .transports import DatagramTransportWrapper
+from .shared_memory import SharedMemoryWorkerPool
+from .dns import HostnameResolver
+from .allowed_senders import AllowedSenders
+from .deduplication import Deduplicator
 
 
 from .connections_manager import connections_manager
-from .connections import TCPClientConnection, TCPServerConnection, UDPServerConnection, UDPClientConnection
+from .connections import (TCPClientConnection, TCPServerConnection, UDPServerConnection, UDPClientConnection,
+                          BufferedTCPServerConnection, BufferedTCPClientConnection)
 from .protocols import ProtocolFactoryProtocol
 from aionetworking.types.networking import ProtocolFactoryType,  NetworkConnectionType
 
-from typing import Optional, Tuple, Type, Union, Sequence, Dict, Any
+from typing import Optional, Tuple, Type, Union, Sequence, Dict, Any, Set
 
 
 @dataclass
 class BaseProtocolFactory(ProtocolFactoryProtocol):
     full_name = ''
     peer_prefix = ''
+    action_fields = ('action', 'preaction', 'requester')
+    connection_reload_fields = (*action_fields, 'dataformat', 'codec_config')
+    reloadable_fields = frozenset({*connection_reload_fields, 'pause_reading_on_buffer_size', 'hostname_lookup',
+                                   'aliases', 'allowed_senders', 'check_peer_cert_expiry', 'timeout', 'max_in_flight',
+                                   'request_timeout'})
     connection_cls: Type[NetworkConnectionType] = field(default=None, init=False)
     action: ActionProtocol = None
     preaction: ActionProtocol = None
@@ -34,13 +47,21 @@ class BaseProtocolFactory(ProtocolFactoryProtocol):
     logger: LoggerType = field(default_factory=get_logger_receiver)
     pause_reading_on_buffer_size: int = None
     hostname_lookup: bool = False
+    hostname_resolver: HostnameResolver = None
     expire_connections_after_inactive_minutes: Union[int, float] = 0
     expire_connections_check_interval_minutes: Union[int, float] = 1
     aliases: Dict[str, str] = field(default_factory=dict)
-    allowed_senders: Sequence[IPNetwork] = field(default_factory=tuple)
+    allowed_senders: Union[AllowedSenders, Sequence[IPNetwork]] = field(default_factory=tuple)
     check_peer_cert_expiry: int = 7
     codec_config: Dict[str, Any] = field(default_factory=dict, metadata={'pickle': True})
     timeout: int = None
+    max_in_flight: int = None
+    request_timeout: Union[int, float] = None
+    timing_hooks: Sequence[TimingHook] = field(default_factory=tuple, compare=False)
+    slow_msg_sampler: SlowMessageSampler = None
+    worker_pool: SharedMemoryWorkerPool = None
+    work_queue: Union[WorkQueue, KeyedExecutor] = None
+    deduplicator: Deduplicator = None
     _scheduler: TaskScheduler = field(default_factory=TaskScheduler, init=False)
     context: BaseContext = field(default_factory=dict, init=False, compare=False, repr=False)
 
@@ -51,11 +72,13 @@ class BaseProtocolFactory(ProtocolFactoryProtocol):
             self.action = replace(self.action)
         if self.requester:
             self.requester = replace(self.requester)
+        if self.allowed_senders and not isinstance(self.allowed_senders, AllowedSenders):
+            self.allowed_senders = AllowedSenders(self.allowed_senders)
 
     async def start(self, context: BaseContext = None, logger: LoggerType = None) -> None:
         self.context = context or self.context
         self.logger = logger or self.logger
-        coros = []
+        coros = [p.load()]
         if self.action:
             coros.append(self.action.start(logger=logger))
         if self.preaction:
@@ -63,6 +86,17 @@ class BaseProtocolFactory(ProtocolFactoryProtocol):
         if self.requester:
             coros.append(self.requester.start(logger=logger))
         await asyncio.gather(*coros)
+        if self.slow_msg_sampler:
+            self.slow_msg_sampler.start(logger=self.logger)
+        if self.hostname_lookup and self.hostname_resolver:
+            self.hostname_resolver.start(logger=self.logger)
+        if self.allowed_senders:
+            self.allowed_senders.start(logger=self.logger)
+        if self.work_queue and self.work_queue.shared and not self.work_queue.is_started:
+            self.work_queue.start()
+        if self.worker_pool and not self.worker_pool.is_started:
+            await self.worker_pool.start(self.dataformat, self.action, codec_config=self.codec_config,
+                                         logger=self.logger)
         if self.expire_connections_after_inactive_minutes:
             self.logger.info('Connections will expire after %s',
                              p.no('minute', self.expire_connections_check_interval_minutes))
@@ -76,22 +110,68 @@ class BaseProtocolFactory(ProtocolFactoryProtocol):
     def _additional_connection_kwargs(self) -> Dict[str, Any]:
         return {}
 
+    def _get_connection_cls(self) -> Type[NetworkConnectionType]:
+        return self.connection_cls
+
     def _new_connection(self) -> NetworkConnectionType:
         self.logger.debug('Creating new connection')
-        return self.connection_cls(parent_name=self.full_name, peer_prefix=self.peer_prefix, action=self.action,
+        return self._get_connection_cls()(parent_name=self.full_name, peer_prefix=self.peer_prefix, action=self.action,
                                    preaction=self.preaction, requester=self.requester, dataformat=self.dataformat,
                                    pause_reading_on_buffer_size=self.pause_reading_on_buffer_size, logger=self.logger,
-                                   hostname_lookup=self.hostname_lookup, allowed_senders=self.allowed_senders,
+                                   hostname_lookup=self.hostname_lookup, hostname_resolver=self.hostname_resolver,
+                                   allowed_senders=self.allowed_senders,
                                    context=self.context.copy(), check_peer_cert_expiry=self.check_peer_cert_expiry,
                                    timeout=self.timeout, codec_config=self.codec_config,
+                                   max_in_flight=self.max_in_flight, request_timeout=self.request_timeout,
+                                   timing_hooks=self._get_timing_hooks(), worker_pool=self.worker_pool,
+                                   work_queue=self.work_queue, deduplicator=self.deduplicator,
                                    **self._additional_connection_kwargs())
 
+    def _get_timing_hooks(self) -> Tuple[TimingHook, ...]:
+        if self.slow_msg_sampler:
+            return (*self.timing_hooks, self.slow_msg_sampler)
+        return tuple(self.timing_hooks)
+
     def __getstate__(self):
         return dataclass_getstate(self)
 
     def __setstate__(self, state):
         dataclass_setstate(self, state)
 
+    def changed_fields(self, new: ProtocolFactoryType) -> Set[str]:
+        return dataclass_changed_fields(self, new, ignore=('logger',))
+
+    def can_reload(self, new: ProtocolFactoryType) -> bool:
+        if type(new) is not type(self):
+            return False
+        changed = self.changed_fields(new)
+        if self.worker_pool and changed & {'action', 'dataformat', 'codec_config'}:
+            return False
+        return changed <= self.reloadable_fields
+
+    async def reload(self, new: ProtocolFactoryType, logger: LoggerType = None) -> Set[str]:
+        self.logger = logger or self.logger
+        changed = self.changed_fields(new)
+        action_fields = [name for name in self.action_fields if name in changed]
+        replaced_actions = [getattr(self, name) for name in action_fields if getattr(self, name)]
+        await asyncio.gather(*[getattr(new, name).start(logger=self.logger) for name in action_fields
+                               if getattr(new, name)])
+        replaced_allowed_senders = self.allowed_senders if 'allowed_senders' in changed else None
+        for name in changed:
+            setattr(self, name, getattr(new, name))
+        if replaced_allowed_senders:
+            await replaced_allowed_senders.close()
+        if 'allowed_senders' in changed and self.allowed_senders:
+            self.allowed_senders.start(logger=self.logger)
+        elif self.allowed_senders:
+            await self.allowed_senders.reload()
+        changes = {name: getattr(self, name) for name in self.connection_reload_fields if name in changed}
+        if changes:
+            for conn in filter(self.is_owner, list(connections_manager)):
+                conn.reload(**changes)
+        await asyncio.gather(*[action.close() for action in replaced_actions])
+        return changed
+
     def set_name(self, full_name: str, peer_prefix: str) -> None:
         self.full_name = full_name
         self.peer_prefix = peer_prefix
@@ -103,6 +183,15 @@ class BaseProtocolFactory(ProtocolFactoryProtocol):
     def num_connections(self) -> int:
         return connections_manager.num_connections(self.full_name)
 
+    @property
+    def scheduler_task_count(self) -> int:
+        count = self._scheduler.task_count
+        for conn in filter(self.is_owner, list(connections_manager)):
+            adaptor = getattr(conn, '_adaptor', None)
+            if adaptor:
+                count += adaptor._scheduler.task_count
+        return count
+
     async def wait_num_has_connected(self, num: int) -> None:
         await connections_manager.wait_num_has_connected(self.full_name, num)
 
@@ -144,17 +233,52 @@ class BaseProtocolFactory(ProtocolFactoryProtocol):
         self.logger.info('Protocol factory tasks finished, and all connections have been closed')
         await asyncio.wait_for(self.close_actions(), self.timeout)
         self.logger.info('Actions complete')
+        if self.slow_msg_sampler:
+            await self.slow_msg_sampler.close()
+        if self.hostname_resolver:
+            await self.hostname_resolver.close()
+        if self.allowed_senders:
+            await self.allowed_senders.close()
+        if self.worker_pool:
+            await self.worker_pool.close()
+        if self.work_queue and self.work_queue.shared:
+            await self.work_queue.close()
         connections_manager.clear_server(self.full_name)
+        await self.logger.wait_closed()
+
+
+@dataclass
+class BaseStreamProtocolFactory(BaseProtocolFactory):
+    buffered_connection_cls: Type[NetworkConnectionType] = field(default=None, init=False)
+    buffered_read: Optional[bool] = False
+    read_buffer_size: int = 262144
+
+    def _use_buffered_read(self) -> bool:
+        if self.buffered_read is None:
+            return supports_buffered_protocol()
+        return self.buffered_read
+
+    def _get_connection_cls(self) -> Type[NetworkConnectionType]:
+        if self._use_buffered_read():
+            return self.buffered_connection_cls
+        return self.connection_cls
+
+    def _additional_connection_kwargs(self) -> Dict[str, Any]:
+        if self._use_buffered_read():
+            return {'read_buffer_size': self.read_buffer_size}
+        return {}
 
 
 @dataclass
-class StreamServerProtocolFactory(BaseProtocolFactory):
+class StreamServerProtocolFactory(BaseStreamProtocolFactory):
     connection_cls = TCPServerConnection
+    buffered_connection_cls = BufferedTCPServerConnection
 
 
 @dataclass
-class StreamClientProtocolFactory(BaseProtocolFactory):
+class StreamClientProtocolFactory(BaseStreamProtocolFactory):
     connection_cls = TCPClientConnection
+    buffered_connection_cls = BufferedTCPClientConnection
 
 
 @dataclass
@@ -14,7 +14,8 @@ from aionetworking.types.networking import AdaptorType
 from .transports import TransportType
 
 from aionetworking.compatibility import Protocol
-from typing import Any, AsyncGenerator, Generator, Optional, Sequence, Union, Dict, Tuple, Type
+from typing import (Any, AsyncGenerator, AsyncIterable, AsyncIterator, Generator, Iterable, Optional, Sequence, Union,
+                    Dict, Tuple, Type, Callable)
 
 
 class ProtocolFactoryProtocol(Protocol):
@@ -69,6 +70,9 @@ class ConnectionProtocol(Protocol):
     @abstractmethod
     def send(self, data: bytes) -> Optional[asyncio.Future]: ...
 
+    @abstractmethod
+    def send_many(self, msgs: Sequence[bytes]) -> Optional[asyncio.Future]: ...
+
 
 @dataclass
 class ConnectionDataclassProtocol(ConnectionProtocol, Protocol):
@@ -83,6 +87,12 @@ class ConnectionDataclassProtocol(ConnectionProtocol, Protocol):
     peer_prefix: str = ''
     last_msg: datetime.datetime = field(default=None, init=False, compare=False, hash=False)
     timeout: Union[int, float] = None
+    max_in_flight: int = None
+    request_timeout: Union[int, float] = None
+    timing_hooks: Sequence[Callable] = ()
+    worker_pool: Any = None
+    work_queue: Any = None
+    deduplicator: Any = None
 
     adaptor_cls: Type[AdaptorType] = field(default=None, init=False)
     _adaptor: AdaptorType = field(default=None, init=False)
@@ -115,11 +125,14 @@ class BaseAdaptorProtocol(Protocol):
     @abstractmethod
     def send_data(self, msg_encoded: bytes) -> asyncio.Future: ...
 
+    @abstractmethod
+    def send_data_many(self, msgs_encoded: Sequence[bytes]) -> asyncio.Future: ...
+
     @abstractmethod
     def encode_and_send_msg(self, msg_decoded: Any) -> None: ...
 
     @abstractmethod
-    def encode_and_send_msgs(self, decoded_msgs: Sequence[Any]) -> None: ...
+    def encode_and_send_msgs(self, decoded_msgs: Sequence[Any]) -> asyncio.Future: ...
 
     @abstractmethod
     def on_data_received(self, buffer: bytes, timestamp: datetime.datetime = None) -> asyncio.Future: ...
@@ -136,9 +149,11 @@ class AdaptorProtocolGetattr(BaseAdaptorProtocol, Protocol):
 
     def send_data(self, msg_encoded: bytes) -> None: ...
 
+    def send_data_many(self, msgs_encoded: Sequence[bytes]) -> None: ...
+
     def encode_and_send_msg(self, msg_decoded: Any) -> None: ...
 
-    def encode_and_send_msgs(self, decoded_msgs: Sequence[Any]) -> None: ...
+    def encode_and_send_msgs(self, decoded_msgs: Sequence[Any]) -> asyncio.Future: ...
 
     def on_data_received(self, buffer: bytes, timestamp: datetime.datetime = None) -> asyncio.Future: ...
 
@@ -158,13 +173,20 @@ class SenderAdaptorMixinProtocol(Protocol):
     def all_notifications(self) -> Generator[MessageObjectType, None, None]: ...
 
     @abstractmethod
-    async def send_data_and_wait(self, request_id: Any, encoded: bytes) -> asyncio.Future: ...
+    async def send_data_and_wait(self, request_id: Any, encoded: bytes,
+                                 timeout: Union[int, float] = None) -> asyncio.Future: ...
+
+    @abstractmethod
+    async def send_msg_and_wait(self, msg_obj: MessageObjectType,
+                                timeout: Union[int, float] = None) -> asyncio.Future: ...
 
     @abstractmethod
-    async def send_msg_and_wait(self, msg_obj: MessageObjectType) -> asyncio.Future: ...
+    async def encode_send_wait(self, decoded: Any, timeout: Union[int, float] = None) -> asyncio.Future: ...
 
     @abstractmethod
-    async def encode_send_wait(self, decoded: Any) -> asyncio.Future: ...
+    def pipeline(self, requests: Union[Iterable[Any], AsyncIterable[Any]], window: int = None,
+                 ordered: bool = True, timeout: Union[int, float] = None,
+                 return_exceptions: bool = False) -> AsyncIterator[Any]: ...
 
     @abstractmethod
     async def play_recording(self, file_path: Path, hosts: Sequence = (), timing: bool = True) -> None: ...
@@ -184,10 +206,16 @@ class SenderAdaptorGetattr(SenderAdaptorMixinProtocol, Protocol):
 
     def all_notifications(self) -> Generator[MessageObjectType, None, None]: ...
 
-    async def send_data_and_wait(self, request_id: Any, encoded: bytes) -> asyncio.Future: ...
+    async def send_data_and_wait(self, request_id: Any, encoded: bytes,
+                                 timeout: Union[int, float] = None) -> asyncio.Future: ...
+
+    async def send_msg_and_wait(self, msg_obj: MessageObjectType,
+                                timeout: Union[int, float] = None) -> asyncio.Future: ...
 
-    async def send_msg_and_wait(self, msg_obj: MessageObjectType) -> asyncio.Future: ...
+    async def encode_send_wait(self, decoded: Any, timeout: Union[int, float] = None) -> asyncio.Future: ...
 
-    async def encode_send_wait(self, decoded: Any) -> asyncio.Future: ...
+    def pipeline(self, requests: Union[Iterable[Any], AsyncIterable[Any]], window: int = None,
+                 ordered: bool = True, timeout: Union[int, float] = None,
+                 return_exceptions: bool = False) -> AsyncIterator[Any]: ...
 
     async def play_recording(self, file_path: Path, hosts: Sequence = (), timing: bool = True) -> None: ...
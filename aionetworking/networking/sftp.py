@@ -2,6 +2,8 @@ import datetime
 import asyncssh
 import aiofiles.os
 import asyncio
+import posixpath
+import time
 from dataclasses import dataclass, field
 from .exceptions import ProtocolException
 
@@ -13,7 +15,7 @@ from .connections import NetworkConnectionProtocol
 from aionetworking.compatibility import create_task
 
 
-from typing import Optional, AnyStr, Union, Dict, Any
+from typing import Optional, AnyStr, Union, Dict, Any, List, Sequence
 from pathlib import Path
 
 
@@ -60,6 +62,47 @@ class SFTPFactory(asyncssh.SFTPServer):
         await self._scheduler.close()
 
 
+class SFTPMemoryFile:
+    """
+    Uploaded file kept in memory. Blocks are written at their offset as they arrive so pipelined writes which complete
+    out of order are reassembled correctly.
+    """
+    __slots__ = ('name', 'data')
+
+    def __init__(self, name: bytes):
+        self.name = name
+        self.data = bytearray()
+
+    def write(self, offset: int, data: bytes) -> int:
+        end = offset + len(data)
+        if offset > len(self.data):
+            self.data.extend(bytes(offset - len(self.data)))
+        self.data[offset:end] = data
+        return len(data)
+
+
+class StreamingSFTPFactory(SFTPFactory):
+    """
+    Uploads are written to memory as they are received and handed to the connection when the client closes the
+    file, nothing is written to disk.
+    """
+    def open(self, path: bytes, pflags: int, attrs: asyncssh.SFTPAttrs):
+        if pflags & asyncssh.FXF_WRITE and not pflags & asyncssh.FXF_READ:
+            return SFTPMemoryFile(path)
+        return super().open(path, pflags, attrs)
+
+    def write(self, file_obj, offset: int, data: bytes) -> int:
+        if isinstance(file_obj, SFTPMemoryFile):
+            return file_obj.write(offset, data)
+        return super().write(file_obj, offset, data)
+
+    def close(self, file_obj):
+        if isinstance(file_obj, SFTPMemoryFile):
+            self.sftp_connection.data_received(bytes(file_obj.data))
+        else:
+            super().close(file_obj)
+
+
 class SFTPItem:
     def __init__(self, conn, name):
         self._conn = conn
@@ -145,6 +188,9 @@ class BaseSFTPProtocol(NetworkConnectionProtocol):
     def send(self, msg):
         raise ProtocolException('Unable to send messages with this receiver')
 
+    def send_many(self, msgs):
+        raise ProtocolException('Unable to send messages with this receiver')
+
 
 @dataclass
 class SFTPServerProtocol(BaseSFTPProtocol, asyncssh.SSHServer):
@@ -170,6 +216,13 @@ class SFTPClientProtocol(BaseSFTPProtocol, asyncssh.SSHClient):
     prefix: str = 'FILE'
     base_path: Path = settings.TEMPDIR / "sftp_sent"
     remote_path: str = '/'
+    streaming: bool = False
+    block_size: int = 16384
+    max_requests: int = 128
+    batching: bool = False
+    batch_max_msgs: int = 1000
+    batch_max_bytes: int = 1048576
+    batch_interval: Union[int, float] = 1
     _last_filename_timestamp: str = field(default=None, init=False)
     _last_filename_suffix: int = field(default=0, init=False)
 
@@ -178,6 +231,10 @@ class SFTPClientProtocol(BaseSFTPProtocol, asyncssh.SSHClient):
         self._name_lock = asyncio.Lock()
         self._last_file_name = None
         self._scheduler = TaskScheduler()
+        self._batch: Optional[List[bytes]] = None
+        self._batch_size = 0
+        self._batch_full: Optional[asyncio.Event] = None
+        self._batch_task: Optional[asyncio.Future] = None
         self.base_path.mkdir(parents=True, exist_ok=True)
 
     async def set_sftp(self, sftp):
@@ -199,7 +256,18 @@ class SFTPClientProtocol(BaseSFTPProtocol, asyncssh.SSHClient):
     async def get_tmp_path(self):
         return self.base_path / self.get_filename()
 
+    async def _write_remote(self, data: bytes) -> None:
+        remote_file = posixpath.join(self.remote_path, self.get_filename())
+        self.logger.debug("Writing %s bytes to remote file %s", len(data), remote_file)
+        async with self.sftp.open(remote_file, self.mode, block_size=self.block_size,
+                                  max_requests=self.max_requests) as f:
+            await f.write(data, 0)
+
     async def _put_data(self, data: bytes):
+        if self.streaming:
+            await self._write_remote(data)
+            self.last_msg = datetime.datetime.now()
+            return
         file_path = await self.get_tmp_path()
         self.logger.debug("Using temp path for sending file: %s", file_path)
         async with settings.FILE_OPENER(file_path, self.mode) as f:
@@ -213,13 +281,49 @@ class SFTPClientProtocol(BaseSFTPProtocol, asyncssh.SSHClient):
         await self._adaptor.wait_current_tasks()
         await self._scheduler.wait_current_tasks()
 
+    async def _send_batch(self, batch: List[bytes], full: asyncio.Event) -> None:
+        try:
+            await asyncio.wait_for(full.wait(), self.batch_interval)
+        except asyncio.TimeoutError:
+            pass
+        if batch is self._batch:
+            self._batch = None
+        data = b''.join(batch)
+        start = time.perf_counter()
+        await self._put_data(data)
+        self._adaptor.logger.record_latency('upload_latency', time.perf_counter() - start)
+        self._adaptor.logger.on_batch_sent(len(batch), len(data))
+
+    def _add_to_batch(self, data: bytes) -> asyncio.Future:
+        if self._batch is None:
+            self._batch = []
+            self._batch_size = 0
+            self._batch_full = asyncio.Event()
+            self._batch_task = self._scheduler.task_with_callback(self._send_batch(self._batch, self._batch_full))
+        self._batch.append(data)
+        self._batch_size += len(data)
+        if len(self._batch) >= self.batch_max_msgs or self._batch_size >= self.batch_max_bytes:
+            self.flush_batch()
+        return self._batch_task
+
+    def flush_batch(self) -> None:
+        if self._batch is not None:
+            self._batch = None
+            self._batch_full.set()
+
     def send(self, data: bytes) -> asyncio.Future:
+        if self.batching:
+            return self._add_to_batch(data)
         task = self._scheduler.task_with_callback(self._put_data(data))
         return task
 
+    def send_many(self, msgs: Sequence[bytes]) -> asyncio.Future:
+        return self.send(b''.join(msgs))
+
     async def wait_tasks_done(self) -> None:
         if self._adaptor:
             await self._adaptor.wait_current_tasks()
+        self.flush_batch()
         await self._scheduler.close()
 
     async def wait_closed(self) -> None:
@@ -234,12 +338,26 @@ class SFTPClientProtocolFactory(BaseProtocolFactory):
     prefix: str = 'FILE'
     base_path: Path = settings.TEMPDIR / "sftp_sent"
     remote_path: str = '/'
+    streaming: bool = False
+    block_size: int = 16384
+    max_requests: int = 128
+    batching: bool = False
+    batch_max_msgs: int = 1000
+    batch_max_bytes: int = 1048576
+    batch_interval: Union[int, float] = 1
 
     def _additional_connection_kwargs(self) -> Dict[str, Any]:
         return {
             'remove_tmp_files': self.remove_tmp_files,
             'base_path': self.base_path,
-            'remote_path': self.remote_path
+            'remote_path': self.remote_path,
+            'streaming': self.streaming,
+            'block_size': self.block_size,
+            'max_requests': self.max_requests,
+            'batching': self.batching,
+            'batch_max_msgs': self.batch_max_msgs,
+            'batch_max_bytes': self.batch_max_bytes,
+            'batch_interval': self.batch_interval
         }
 
 
@@ -0,0 +1,248 @@
+import asyncio
+from dataclasses import dataclass, field
+import datetime
+import multiprocessing
+import os
+import struct
+import time
+
+from aionetworking.actions.protocols import ActionProtocol
+from aionetworking.compatibility import py38, create_task
+from aionetworking.logging.loggers import get_logger_receiver
+from aionetworking.types.formats import MessageObjectType
+from aionetworking.types.logging import LoggerType
+from aionetworking.types.networking import BaseContext
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type, Union
+
+if py38:
+    from multiprocessing import shared_memory
+else:
+    shared_memory = None
+
+
+def supports_shared_memory() -> bool:
+    return shared_memory is not None
+
+
+class SharedMemoryRing:
+    """
+    Fixed size slots in one shared memory block. Each slot holds one buffer prefixed by its length. The process which
+    creates the ring owns it and unlinks it on close, other processes attach to it by name.
+    """
+    header = struct.Struct('!I')
+
+    def __init__(self, slots: int, slot_size: int, name: str = None):
+        self.slots = slots
+        self.slot_size = slot_size
+        self._owner = name is None
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def max_buffer_size(self) -> int:
+        return self.slot_size - self.header.size
+
+    def write(self, slot: int, data: bytes) -> None:
+        size = len(data)
+        if size > self.max_buffer_size:
+            raise ValueError(f'Buffer of {size} bytes does not fit in a {self.slot_size} byte slot')
+        offset = slot * self.slot_size
+        self.header.pack_into(self.shm.buf, offset, size)
+        start = offset + self.header.size
+        self.shm.buf[start:start + size] = data
+
+    def read(self, slot: int) -> memoryview:
+        offset = slot * self.slot_size
+        size = self.header.unpack_from(self.shm.buf, offset)[0]
+        start = offset + self.header.size
+        return self.shm.buf[start:start + size]
+
+    def close(self) -> None:
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+FailedMsg = Tuple[bytes, Any, str]
+
+
+class SlotResult(NamedTuple):
+    responses: List[Any]
+    failed: List[FailedMsg]
+    num_processed: int = 0
+    processed_bytes: int = 0
+    num_filtered: int = 0
+    filtered_bytes: int = 0
+    latencies: List[Tuple[str, float]] = []
+
+
+async def _process_slot(codec, action: ActionProtocol, data: memoryview, context: BaseContext,
+                        timestamp: datetime.datetime) -> Tuple[int, SlotResult]:
+    num = num_processed = processed_bytes = num_filtered = filtered_bytes = 0
+    responses = []
+    failed = []
+    latencies = []
+    started = time.perf_counter()
+    msgs = codec.decode_buffer(data, context=context, system_timestamp=timestamp)
+    try:
+        async for msg_obj in msgs:
+            num += 1
+            decoded_at = time.perf_counter()
+            latencies.append(('decode_latency', decoded_at - started))
+            if action.filter(msg_obj):
+                num_filtered += 1
+                filtered_bytes += len(msg_obj.encoded)
+                started = time.perf_counter()
+                continue
+            try:
+                result = await action.do_one(msg_obj)
+            except Exception as e:
+                failed.append((msg_obj.encoded, msg_obj.decoded, f'{e.__class__.__name__}: {e}'))
+                result = action.on_exception(msg_obj, e)
+            else:
+                num_processed += 1
+                processed_bytes += len(msg_obj.encoded)
+                latencies.append(('action_latency', time.perf_counter() - decoded_at))
+            if result:
+                responses.append(result)
+            started = time.perf_counter()
+    finally:
+        await msgs.aclose()
+    return num, SlotResult(responses, failed, num_processed, processed_bytes, num_filtered, filtered_bytes, latencies)
+
+
+def _worker_main(ring_name: str, slots: int, slot_size: int, dataformat: Type[MessageObjectType],
+                 action: ActionProtocol, codec_config: Dict[str, Any], work_queue, done_queue) -> None:
+    ring = SharedMemoryRing(slots, slot_size, name=ring_name)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    # One codec for every connection, each buffer is decoded with the context of the connection it came from
+    codec = dataformat.get_codec(None, **codec_config)
+    try:
+        loop.run_until_complete(action.start())
+        for slot, context, timestamp in iter(work_queue.get, None):
+            data = ring.read(slot)
+            try:
+                num, result = loop.run_until_complete(_process_slot(codec, action, data, context, timestamp))
+                done_queue.put((slot, num, result, None))
+            except Exception as e:
+                done_queue.put((slot, 0, SlotResult([], []), RuntimeError(f'{e.__class__.__name__}: {e}')))
+            finally:
+                data.release()
+        loop.run_until_complete(action.close())
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+        ring.close()
+
+
+@dataclass
+class SharedMemoryWorkerPool:
+    """
+    Decodes and processes received buffers in worker processes. Buffers are copied once into a slot of a shared
+    memory ring, workers decode directly from the slot and only the slot index, context and any responses are
+    pickled. Waiting for a free slot applies backpressure to the connections handing buffers to the pool.
+    slot_size is the largest buffer which can be submitted, each slot is allocated with room for its length header.
+    Each message is processed on its own so one failing message gives the action's error response and the other
+    messages in the buffer are still processed. Messages which fail are returned with the responses, along with the
+    number and size of messages processed and filtered and their latencies for the connection's logger.
+    """
+    num_workers: int = field(default_factory=os.cpu_count)
+    slots: int = 64
+    slot_size: int = 262144
+    start_method: str = 'spawn'
+    timeout: Union[int, float] = 10
+    submit_timeout: Union[int, float] = 10
+    logger: LoggerType = field(default_factory=get_logger_receiver, compare=False, repr=False)
+    _ring: SharedMemoryRing = field(default=None, init=False, compare=False, repr=False)
+    _processes: List[multiprocessing.Process] = field(default_factory=list, init=False, compare=False, repr=False)
+    _work_queue: Any = field(default=None, init=False, compare=False, repr=False)
+    _done_queue: Any = field(default=None, init=False, compare=False, repr=False)
+    _free_slots: asyncio.Queue = field(default=None, init=False, compare=False, repr=False)
+    _pending: Dict[int, asyncio.Future] = field(default_factory=dict, init=False, compare=False, repr=False)
+    _done_task: Optional[asyncio.Task] = field(default=None, init=False, compare=False, repr=False)
+
+    @property
+    def is_started(self) -> bool:
+        return self._ring is not None
+
+    async def start(self, dataformat: Type[MessageObjectType], action: ActionProtocol,
+                    codec_config: Dict[str, Any] = None, logger: LoggerType = None) -> None:
+        if not supports_shared_memory():
+            raise RuntimeError('Shared memory worker pools require python 3.8 or later')
+        self.logger = logger or self.logger
+        self._ring = SharedMemoryRing(self.slots, self.slot_size + SharedMemoryRing.header.size)
+        ctx = multiprocessing.get_context(self.start_method)
+        self._work_queue = ctx.SimpleQueue()
+        self._done_queue = ctx.SimpleQueue()
+        self._free_slots = asyncio.Queue()
+        for slot in range(self.slots):
+            self._free_slots.put_nowait(slot)
+        for i in range(self.num_workers):
+            process = ctx.Process(target=_worker_main, name=f'SharedMemoryWorker-{i}', daemon=True,
+                                  args=(self._ring.name, self.slots, self._ring.slot_size, dataformat, action,
+                                        codec_config or {}, self._work_queue, self._done_queue))
+            process.start()
+            self._processes.append(process)
+        self._done_task = create_task(self._wait_done())
+        self.logger.info('Started %s shared memory workers', self.num_workers)
+
+    async def _wait_done(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            item = await loop.run_in_executor(None, self._done_queue.get)
+            if item is None:
+                break
+            self._on_done(*item)
+
+    def _on_done(self, slot: int, num: int, result: SlotResult, exc: Optional[BaseException]) -> None:
+        fut = self._pending.pop(slot)
+        self._free_slots.put_nowait(slot)
+        if fut.done():
+            return
+        if exc:
+            fut.set_exception(exc)
+        else:
+            self.logger.debug('Workers processed %s messages from slot %s', num, slot)
+            fut.set_result(result)
+
+    async def _submit(self, buffer: bytes, context: BaseContext,
+                      timestamp: Optional[datetime.datetime]) -> SlotResult:
+        slot = await self._free_slots.get()
+        self._ring.write(slot, buffer)
+        fut = self._pending[slot] = asyncio.get_event_loop().create_future()
+        self._work_queue.put((slot, dict(context), timestamp or datetime.datetime.now()))
+        return await fut
+
+    async def submit(self, buffer: bytes, context: BaseContext,
+                     timestamp: datetime.datetime = None) -> SlotResult:
+        if len(buffer) > self._ring.max_buffer_size:
+            raise ValueError(f'Buffer of {len(buffer)} bytes is larger than the slot size of {self.slot_size}')
+        return await asyncio.wait_for(self._submit(buffer, context, timestamp), timeout=self.submit_timeout)
+
+    async def close(self) -> None:
+        if not self.is_started:
+            return
+        loop = asyncio.get_event_loop()
+        for _ in self._processes:
+            self._work_queue.put(None)
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, self.timeout)
+            if process.is_alive():
+                self.logger.warning('Terminating %s which did not exit after %ss', process.name, self.timeout)
+                process.terminate()
+        self._done_queue.put(None)
+        await self._done_task
+        for fut in self._pending.values():
+            fut.cancel()
+        self._pending.clear()
+        self._processes.clear()
+        self._ring.close()
+        self._ring = None
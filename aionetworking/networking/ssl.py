@@ -2,6 +2,7 @@ from ssl import SSLContext, Purpose, CERT_REQUIRED, CERT_NONE, PROTOCOL_TLS, get
     cert_time_to_seconds
 import asyncio
 import datetime
+from importlib.util import find_spec
 import os
 import sys
 from aionetworking.compatibility import Protocol, create_task, set_task_name, cached_property
@@ -14,11 +15,7 @@ from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass, field
 
 
-try:
-    import cryptography
-    warn_if_expires_before_days_default = 7
-except ImportError:
-    warn_if_expires_before_days_default = None
+warn_if_expires_before_days_default = 7 if find_spec('cryptography') else None
 
 
 def ssl_cert_time_to_datetime(timestamp: str) -> datetime.datetime:
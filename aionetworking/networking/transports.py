@@ -1,5 +1,5 @@
 from asyncio import transports
-from typing import Tuple, Any, Union, Optional
+from typing import Tuple, Any, Union, Optional, Iterable
 
 
 class DatagramTransportWrapper:
@@ -21,5 +21,9 @@ class DatagramTransportWrapper:
         else:
             self._transport.sendto(data)
 
+    def writelines(self, list_of_data: Iterable[Any]) -> None:
+        for data in list_of_data:
+            self.write(data)
+
 
 TransportType = Union[transports.Transport, DatagramTransportWrapper]
@@ -1,8 +1,13 @@
 
 import yaml
+from aionetworking.futures import WorkQueue, KeyedExecutor
 from .ssl import ServerSideSSL, ClientSideSSL
 from .protocol_factories import (StreamServerProtocolFactory, DatagramServerProtocolFactory,
                                  StreamClientProtocolFactory, DatagramClientProtocolFactory)
+from .shared_memory import SharedMemoryWorkerPool
+from .dns import HostnameResolver
+from .allowed_senders import AllowedSenders
+from .deduplication import Deduplicator
 
 
 def ssl_server_side_constructor(loader, node) -> ServerSideSSL:
@@ -35,6 +40,38 @@ def datagram_client_protocol_factory_constructor(loader, node) -> DatagramClient
     return DatagramClientProtocolFactory(**value)
 
 
+def shared_memory_worker_pool_constructor(loader, node) -> SharedMemoryWorkerPool:
+    value = loader.construct_mapping(node) if node.value else {}
+    return SharedMemoryWorkerPool(**value)
+
+
+def hostname_resolver_constructor(loader, node) -> HostnameResolver:
+    value = loader.construct_mapping(node, deep=True) if node.value else {}
+    return HostnameResolver(**value)
+
+
+def allowed_senders_constructor(loader, node) -> AllowedSenders:
+    if isinstance(node, yaml.SequenceNode):
+        return AllowedSenders(loader.construct_sequence(node))
+    value = loader.construct_mapping(node, deep=True) if node.value else {}
+    return AllowedSenders(**value)
+
+
+def work_queue_constructor(loader, node) -> WorkQueue:
+    value = loader.construct_mapping(node) if node.value else {}
+    return WorkQueue(**value)
+
+
+def keyed_executor_constructor(loader, node) -> KeyedExecutor:
+    value = loader.construct_mapping(node) if node.value else {}
+    return KeyedExecutor(**value)
+
+
+def deduplicator_constructor(loader, node) -> Deduplicator:
+    value = loader.construct_mapping(node) if node.value else {}
+    return Deduplicator(**value)
+
+
 def load_server_side_ssl(Loader=yaml.SafeLoader):
     yaml.add_constructor('!ServerSideSSL', ssl_server_side_constructor, Loader=Loader)
 
@@ -57,3 +94,27 @@ def load_stream_client_protocol_factory(Loader=yaml.SafeLoader):
 
 def load_datagram_client_protocol_factory(Loader=yaml.SafeLoader):
     yaml.add_constructor('!DatagramClientProtocolFactory', datagram_client_protocol_factory_constructor, Loader=Loader)
+
+
+def load_shared_memory_worker_pool(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!SharedMemoryWorkerPool', shared_memory_worker_pool_constructor, Loader=Loader)
+
+
+def load_hostname_resolver(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!HostnameResolver', hostname_resolver_constructor, Loader=Loader)
+
+
+def load_allowed_senders(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!AllowedSenders', allowed_senders_constructor, Loader=Loader)
+
+
+def load_work_queue(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!WorkQueue', work_queue_constructor, Loader=Loader)
+
+
+def load_keyed_executor(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!KeyedExecutor', keyed_executor_constructor, Loader=Loader)
+
+
+def load_deduplicator(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!Deduplicator', deduplicator_constructor, Loader=Loader)
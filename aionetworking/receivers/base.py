@@ -4,18 +4,22 @@ from dataclasses import dataclass, field, replace
 import os
 
 from .exceptions import ServerException
-from aionetworking.compatibility_os import loop_on_close_signal, send_ready, send_stopping, send_status, send_notify_start_signal
+from aionetworking.compatibility import create_task
+from aionetworking.compatibility_os import loop_on_close_signal, loop_on_user2_signal, send_ready, send_stopping, send_status, send_notify_start_signal
 from aionetworking.logging.loggers import get_logger_receiver
+from aionetworking.logging.metrics import MetricsServer
+from aionetworking.logging.profiling import SignalProfiler
 from aionetworking.networking.connections_manager import get_unique_name
 from aionetworking.types.logging import LoggerType
 from aionetworking.futures.value_waiters import StatusWaiter
 from aionetworking.types.networking import ProtocolFactoryType
-from aionetworking.utils import dataclass_getstate, dataclass_setstate, run_in_loop, addr_tuple_to_str
+from aionetworking.utils import (dataclass_getstate, dataclass_setstate, dataclass_changed_fields, run_in_loop,
+                                 addr_tuple_to_str)
 import sys
 from .protocols import ReceiverProtocol
 
 from aionetworking.compatibility import Protocol
-from typing import Optional, Generator, List, Tuple, Callable
+from typing import Optional, Generator, List, Tuple, Callable, Set
 
 
 @dataclass
@@ -58,7 +62,10 @@ class BaseReceiver(ReceiverProtocol, Protocol):
         stop_event = stop_event or asyncio.Event()
         restart_event = restart_event or asyncio.Event()
         loop_on_close_signal(stop_event.set, self.logger)
-        await self.start()
+        profiler = SignalProfiler(logger=self.logger)
+        loop_on_user2_signal(profiler.toggle, self.logger)
+        if not self._status.is_starting_or_started():
+            await self.start()
         sys.stdout.flush()
         self.send_status()
         send_ready()
@@ -74,22 +81,31 @@ class BaseReceiver(ReceiverProtocol, Protocol):
             self.logger.info('Restart event has been set')
         for task in pending:
             task.cancel()
+        if profiler.is_running:
+            profiler.stop()
         await self.close()
 
 
 @dataclass
 class BaseServer(BaseReceiver, Protocol):
     _serving_forever_fut = None
+    _handing_off = False
     name = 'Server'
     peer_prefix = 'server'
+    reloadable_fields = frozenset({'protocol_factory', 'logger', 'quiet'})
 
     protocol_factory:  ProtocolFactoryType = None
     server: asyncio.AbstractServer = field(default=None, init=False)
+    metrics: Optional[MetricsServer] = None
 
     def __post_init__(self) -> None:
         self._full_name = get_unique_name(self.full_name)
         self.protocol_factory = replace(self.protocol_factory)
         self.protocol_factory.set_name(self._full_name, self.peer_prefix)
+        if self.metrics:
+            self.metrics.set_logger(self.logger)
+            self.metrics.add_server(self)
+            self.close_tasks.append(self.metrics.close)
 
     @property
     @abstractmethod
@@ -124,6 +140,8 @@ class BaseServer(BaseReceiver, Protocol):
             await self.protocol_factory.start(logger=self.logger)
             self.logger.info('Starting %s on %s', self.name, self.listening_on)
             await self._start_server()
+            if self.metrics:
+                await self.metrics.start()
             if not self.quiet:
                 self._print_listening_message()
             self._status.set_started()
@@ -131,6 +149,47 @@ class BaseServer(BaseReceiver, Protocol):
             await self.close()
             raise
 
+    def changed_fields(self, new: 'BaseServer') -> Set[str]:
+        return dataclass_changed_fields(self, new)
+
+    def can_reload(self, new: 'BaseServer') -> bool:
+        if type(new) is not type(self):
+            return False
+        changed = self.changed_fields(new)
+        if 'protocol_factory' in changed and not self.protocol_factory.can_reload(new.protocol_factory):
+            return False
+        return changed <= self.reloadable_fields
+
+    async def reload(self, new: 'BaseServer') -> Set[str]:
+        changed = self.changed_fields(new)
+        self.quiet = new.quiet
+        if 'logger' in changed:
+            self.logger = new.logger
+            if self.metrics:
+                self.metrics.set_logger(self.logger)
+        factory_changed = await self.protocol_factory.reload(new.protocol_factory, logger=self.logger)
+        changed.discard('protocol_factory')
+        return changed | {f'protocol_factory.{name}' for name in factory_changed}
+
+    def hand_off(self, new: 'BaseServer') -> None:
+        """
+        Prepares to be replaced by new, which is started while this server is still running. A metrics server on the
+        same address is passed to new instead of binding it again. When closed, connections start draining before the
+        listener is closed so new is already accepting.
+        """
+        self._handing_off = True
+        if self.metrics and new.metrics and self.metrics.listening_on and \
+                (self.metrics.host, self.metrics.port) == (new.metrics.host, new.metrics.port):
+            metrics, new_metrics = self.metrics, new.metrics
+            self.close_tasks.remove(metrics.close)
+            new.close_tasks.remove(new_metrics.close)
+            new_metrics.remove_server(new)
+            metrics.path = new_metrics.path
+            metrics.set_logger(new.logger)
+            metrics.add_server(new)
+            new.metrics = metrics
+            new.close_tasks.append(metrics.close)
+
     async def _serve_forever(self) -> None:
         if self._serving_forever_fut is not None:
             raise RuntimeError(
@@ -167,10 +226,16 @@ class BaseServer(BaseReceiver, Protocol):
                 not self._serving_forever_fut.done()):
             self._serving_forever_fut.cancel()
             self._serving_forever_fut = None
+        factory_closed = None
+        if self._handing_off:
+            factory_closed = create_task(self.protocol_factory.close())
+            await asyncio.sleep(0)
         await self._stop_server()
+        if self.metrics:
+            self.metrics.remove_server(self)
         await super().close()
         self.logger.info('Stopping protocol factory')
-        await self.protocol_factory.close()
+        await (factory_closed or self.protocol_factory.close())
         self.logger.info('%s stopped', self.name)
         self._status.set_stopped()
 
@@ -4,7 +4,7 @@ from dataclasses import dataclass, field, InitVar
 from functools import partial
 
 from aionetworking import settings
-from aionetworking.networking.sftp import SFTPServerProtocolFactory, SFTPFactory
+from aionetworking.networking.sftp import SFTPServerProtocolFactory, SFTPFactory, StreamingSFTPFactory
 from .base import BaseNetworkServer
 
 from typing import Dict, Any, Union
@@ -24,6 +24,7 @@ class SFTPServer(BaseNetworkServer):
     passphrase: str = None
     extra_sftp_kwargs: Dict[str, Any] = field(default_factory=dict)
     base_upload_dir: Path = settings.TEMPDIR / "sftp_received"
+    streaming: bool = False
 
     def __post_init__(self, sftp_log_level) -> None:
         super().__post_init__()
@@ -40,9 +41,10 @@ class SFTPServer(BaseNetworkServer):
         return kwargs
 
     async def _get_server(self) -> asyncio.AbstractServer:
+        sftp_factory = StreamingSFTPFactory if self.streaming else self.sftp_factory
         return await asyncssh.create_server(self.protocol_factory, self.host, self.port, backlog=self.backlog,
                                             reuse_address=self.reuse_address, reuse_port=self.reuse_port, line_editor=False,
-                                            sftp_factory=partial(self.sftp_factory, base_upload_dir=self.base_upload_dir),
+                                            sftp_factory=partial(sftp_factory, base_upload_dir=self.base_upload_dir),
                                             **self.sftp_kwargs)
 
 
@@ -1,3 +1,4 @@
 from .base import BaseSender, BaseNetworkClient, BaseClient
 from .clients import TCPClient, UDPClient, UnixSocketClient, WindowsPipeClient, PipeClient
+from .pool import ClientPool
 from .exceptions import *
\ No newline at end of file
@@ -127,10 +127,14 @@ class BaseClient(BaseSender, Protocol):
                 setattr(self, k, v)
         async with self as conn:
             await asyncio.sleep(start_interval)
-            for msg in msgs:
-                if interval is not None:
+            if interval is None:
+                fut = conn.send_data_many(msgs)
+                if fut:
+                    await fut
+            else:
+                for msg in msgs:
                     await asyncio.sleep(interval)
-                conn.send_data(msg)
+                    conn.send_data(msg)
             if wait_responses:
                 for _ in msgs:
                     await conn.wait_notification()
@@ -1,2 +1,6 @@
 class ClientException(Exception):
     pass
+
+
+class NoConnectionsAvailableError(ClientException):
+    pass
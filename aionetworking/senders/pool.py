@@ -0,0 +1,184 @@
+import asyncio
+from dataclasses import dataclass, field, replace
+from functools import partial
+
+from aionetworking.futures.schedulers import TaskScheduler
+from aionetworking.types.networking import ConnectionType
+from .base import BaseSender, BaseClient
+from .exceptions import NoConnectionsAvailableError
+
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+@dataclass
+class ClientPool(BaseSender):
+    """
+    Keeps several warm connections to the same destination open and spreads requests across them.
+    Each request is sent on the connection with the fewest requests currently awaiting a response.
+    """
+    name = 'Client Pool'
+    client: BaseClient = None
+    size: int = 4
+    health_check_interval: float = 5
+    reconnect_initial_delay: float = 0.1
+    reconnect_max_delay: float = 30
+    timeout: int = 5
+    _clients: List[Optional[BaseClient]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _in_flight: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    _reconnect_tasks: Dict[int, asyncio.Future] = field(default_factory=dict, init=False, repr=False,
+                                                        compare=False)
+    _next_index: int = field(default=0, init=False, repr=False, compare=False)
+    _available: asyncio.Event = field(default=None, init=False, repr=False, compare=False)
+    _scheduler: TaskScheduler = field(default_factory=TaskScheduler, init=False, hash=False, compare=False,
+                                      repr=False)
+
+    @property
+    def dst(self) -> str:
+        return self.client.dst
+
+    @property
+    def connections(self) -> List[ConnectionType]:
+        return [client.conn for client in self._clients if self._is_healthy(client)]
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self._in_flight)
+
+    @staticmethod
+    def _is_healthy(client: Optional[BaseClient]) -> bool:
+        return bool(client and client.is_started() and client.conn and client.conn.is_connected() and
+                    not client.transport.is_closing())
+
+    def _update_available(self) -> None:
+        if any(self._is_healthy(client) for client in self._clients):
+            self._available.set()
+        else:
+            self._available.clear()
+
+    async def _connect_one(self, index: int) -> None:
+        client = replace(self.client)
+        await client.connect()
+        client.conn.add_connection_lost_task(partial(self._on_connection_lost, index))
+        self._clients[index] = client
+        self._in_flight[index] = 0
+        self._update_available()
+
+    async def _reconnect(self, index: int) -> None:
+        delay = self.reconnect_initial_delay
+        client = self._clients[index]
+        try:
+            if client and client.is_started():
+                await client.close()
+            while not self._status.is_stopping_or_stopped():
+                try:
+                    await self._connect_one(index)
+                    self.logger.info('%s connection %s to %s re-established', self.name, index, self.dst)
+                    return
+                except self.client.expected_connection_exceptions + (OSError, asyncio.TimeoutError) as e:
+                    self.logger.warning('%s connection %s to %s failed: %s. Retrying in %.1fs', self.name, index,
+                                        self.dst, e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.reconnect_max_delay)
+        finally:
+            self._reconnect_tasks.pop(index, None)
+
+    def _schedule_reconnect(self, index: int) -> None:
+        if index not in self._reconnect_tasks and not self._status.is_stopping_or_stopped():
+            self._reconnect_tasks[index] = self._scheduler.task_with_callback(
+                self._reconnect(index), name=f'{self.name}-Reconnect-{index}')
+
+    async def _on_connection_lost(self, index: int) -> None:
+        self._update_available()
+        self._schedule_reconnect(index)
+
+    async def _check_health(self) -> None:
+        for index, client in enumerate(self._clients):
+            if not self._is_healthy(client):
+                self._schedule_reconnect(index)
+        self._update_available()
+
+    async def connect(self) -> 'ClientPool':
+        self._status.set_starting()
+        self._available = asyncio.Event()
+        self._clients = [None] * self.size
+        self._in_flight = [0] * self.size
+        self.logger.info('Opening %s with %s connections to %s', self.name, self.size, self.dst)
+        results = await asyncio.gather(*[self._connect_one(i) for i in range(self.size)], return_exceptions=True)
+        if all(isinstance(result, BaseException) for result in results):
+            await self.close()
+            raise results[0]
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                self._schedule_reconnect(index)
+        self._scheduler.call_coro_periodic(self.health_check_interval, self._check_health,
+                                           task_name=f'{self.name}-HealthCheck')
+        self._status.set_started()
+        return self
+
+    async def close(self) -> None:
+        self._status.set_stopping()
+        self.logger.info('Closing %s to %s', self.name, self.dst)
+        for task in list(self._reconnect_tasks.values()):
+            task.cancel()
+        await self._scheduler.close()
+        clients = [client for client in self._clients if client and client.is_started()]
+        if clients:
+            await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+        await super().close()
+        self._status.set_stopped()
+
+    def _least_loaded(self) -> Optional[int]:
+        best = None
+        num_clients = len(self._clients)
+        for offset in range(num_clients):
+            index = (self._next_index + offset) % num_clients
+            if self._is_healthy(self._clients[index]) and (best is None or
+                                                           self._in_flight[index] < self._in_flight[best]):
+                best = index
+        if best is not None:
+            self._next_index = (best + 1) % num_clients
+        return best
+
+    async def _get_index(self) -> int:
+        index = self._least_loaded()
+        while index is None:
+            try:
+                await asyncio.wait_for(self._available.wait(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                raise NoConnectionsAvailableError(f'No connections available in {self.name} to {self.dst}')
+            index = self._least_loaded()
+            if index is None:
+                self._available.clear()
+        return index
+
+    async def _dispatch(self, method_name: str, *args, **kwargs) -> Any:
+        index = await self._get_index()
+        self._in_flight[index] += 1
+        try:
+            return await getattr(self._clients[index].conn, method_name)(*args, **kwargs)
+        finally:
+            self._in_flight[index] -= 1
+
+    async def encode_send_wait(self, decoded: Any, timeout: Union[int, float] = None) -> Any:
+        return await self._dispatch('encode_send_wait', decoded, timeout=timeout)
+
+    async def send_data_and_wait(self, request_id: Any, encoded: bytes, timeout: Union[int, float] = None) -> Any:
+        return await self._dispatch('send_data_and_wait', request_id, encoded, timeout=timeout)
+
+    async def send_msg_and_wait(self, msg_obj, timeout: Union[int, float] = None) -> Any:
+        return await self._dispatch('send_msg_and_wait', msg_obj, timeout=timeout)
+
+    def _send_notification(self, method_name: str, *args, **kwargs) -> None:
+        index = self._least_loaded()
+        if index is None:
+            raise NoConnectionsAvailableError(f'No connections available in {self.name} to {self.dst}')
+        getattr(self._clients[index].conn, method_name)(*args, **kwargs)
+
+    def __getattr__(self, item) -> Callable:
+        client = self.__dict__.get('client')
+        requester = getattr(getattr(client, 'protocol_factory', None), 'requester', None)
+        if item in getattr(requester, 'methods', ()):
+            return partial(self._dispatch, item)
+        if item in getattr(requester, 'notification_methods', ()):
+            return partial(self._send_notification, item)
+        raise AttributeError(f'{self.name} does not have attribute {item}')
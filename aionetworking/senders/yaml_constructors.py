@@ -1,6 +1,7 @@
 
 import yaml
 from .clients import TCPClient, UDPClient, PipeClient
+from .pool import ClientPool
 
 
 def tcp_client_constructor(loader, node) -> TCPClient:
@@ -29,3 +30,12 @@ def pipe_client_constructor(loader, node):
 def load_pipe_client(Loader=yaml.SafeLoader):
     yaml.add_constructor('!PipeClient', pipe_client_constructor, Loader=Loader)
 
+
+
+def client_pool_constructor(loader, node) -> ClientPool:
+    value = loader.construct_mapping(node) if node.value else {}
+    return ClientPool(**value)
+
+
+def load_client_pool(Loader=yaml.SafeLoader):
+    yaml.add_constructor('!ClientPool', client_pool_constructor, Loader=Loader)
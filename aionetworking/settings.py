@@ -1,17 +1,18 @@
 import os
 from pathlib import Path
-import aiofiles
 import tempfile
 import sys
 from aionetworking.compatibility import py37
 
 
 APP_NAME = 'AIONetworking'
-FILE_OPENER = aiofiles.open
 APP_CONFIG = {}
 
 
 def __getattr__(name):
+    if name == 'FILE_OPENER':
+        import aiofiles
+        return aiofiles.open
     path = None
     if name == 'TEMPDIR':
         path = Path(tempfile.gettempdir()) / sys.modules[__name__].APP_NAME.replace(" ", "")
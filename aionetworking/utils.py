@@ -11,23 +11,19 @@ import itertools
 import sys
 import socket
 import tempfile
-from aiofiles.os import wrap
+from importlib.util import find_spec
 from aionetworking.compatibility import py38, net_supernet_of, WindowsProactorEventLoopPolicy, WindowsSelectorEventLoopPolicy
 from aionetworking.compatibility_os import is_wsl, is_aix
-from dataclasses import dataclass, fields, MISSING
-from functools import wraps
+from dataclasses import dataclass, field, fields, is_dataclass, MISSING
+from functools import partial, wraps
 
 from .compatibility import Protocol
 from pathlib import Path
-from typing import Sequence, Callable, List, AnyStr, Tuple, Union, AsyncGenerator, Any, TYPE_CHECKING, Optional, Iterable
+from typing import Sequence, Callable, List, AnyStr, Tuple, Union, AsyncGenerator, Any, TYPE_CHECKING, Optional, Iterable, \
+    Set
 from ipaddress import IPv4Network, IPv6Network, IPv4Address, IPv6Address
 
-try:
-    import psutil
-    supports_system_info = True
-except ImportError:
-    psutil = None
-    supports_system_info = False
+supports_system_info = find_spec('psutil') is not None
 
 
 str_to_list = re.compile(r"^\s+|\s*,\s*|\s+$")
@@ -46,7 +42,8 @@ def better_file_not_found_error(*files: Union[str, Path], purpose: str = None):
 
 
 ###Coroutines###
-makedirs = wrap(os.makedirs)
+async def makedirs(*args, **kwargs) -> None:
+    await asyncio.get_event_loop().run_in_executor(None, partial(os.makedirs, *args, **kwargs))
     
     
 async def time_coro(coro):
@@ -116,6 +113,21 @@ def dataclass_setstate(self, state):
     self.__dict__.update(self.__class__(**state).__dict__)
 
 
+def config_equal(a: Any, b: Any) -> bool:
+    if is_dataclass(a) and not isinstance(a, type):
+        return type(a) is type(b) and not dataclass_changed_fields(a, b, ignore=('logger',))
+    return a == b
+
+
+def dataclass_changed_fields(old: Any, new: Any, ignore: Sequence[str] = ()) -> Set[str]:
+    """
+    Names of the configurable fields which differ between two instances. Fields set at runtime (init=False) are
+    skipped and nested dataclasses are compared the same way, ignoring their loggers which are replaced on start.
+    """
+    return {f.name for f in fields(old) if f.init and f.compare and f.name not in ignore and
+            not config_equal(getattr(old, f.name, None), getattr(new, f.name, None))}
+
+
 ###Typing###
 
 class EmptyProtocol(Protocol):
@@ -144,6 +156,11 @@ async def anext(generator: AsyncGenerator) -> Any:
     return await generator.__anext__()
 
 
+async def async_iter(iterable: Iterable) -> AsyncGenerator:
+    for item in iterable:
+        yield item
+
+
 async def alist(generator: AsyncGenerator) -> List[Any]:
     return [i async for i in generator]
 
@@ -371,11 +388,13 @@ def get_ip_port(host: str, transport) -> Tuple[str, int]:
 
 
 def _process_by_id(pid: int):
+    import psutil
     return [p for p in psutil.process_iter() if p.pid == pid][0]
 
 
 def is_listening_on(addr: Tuple[str, int], kind: str = 'inet', pid: int = None) -> bool:
-    if psutil and not is_wsl() and not is_aix():
+    if supports_system_info and not is_wsl() and not is_aix():
+        import psutil
         pid = pid or os.getpid()
         process = _process_by_id(pid)
         connections = process.connections(kind=kind)
@@ -391,17 +410,17 @@ def is_listening_on(addr: Tuple[str, int], kind: str = 'inet', pid: int = None)
 class SystemInfo:
     @property
     def memory(self):
-        try:
-            return psutil.Process(os.getpid()).memory_info()[0]/2.**30
-        except NameError:
+        if not supports_system_info:
             return "Unknown"
+        import psutil
+        return psutil.Process(os.getpid()).memory_info()[0]/2.**30
 
     @property
     def cpu(self):
-        try:
-            return psutil.Process(os.getpid()).cpu_percent()
-        except NameError:
+        if not supports_system_info:
             return "Unknown"
+        import psutil
+        return psutil.Process(os.getpid()).cpu_percent()
 
 
 ###Misc###
@@ -457,6 +476,15 @@ class Operator(CallableFromString):
     }
 
 
+_filter_token = re.compile(r'"[^"]*"|\'[^\']*\'|\S+')
+
+
+def _unquote(token: str) -> str:
+    if len(token) > 1 and token[0] == token[-1] and token[0] in '"\'':
+        return token[1:-1]
+    return token
+
+
 @dataclass
 class Expression:
     attr: Optional[str]
@@ -464,6 +492,13 @@ class Expression:
     value: Any
     adapt_expected_value: bool = True
     case_sensitive: bool = False
+    _compiled: Optional[Callable[[Any], bool]] = field(default=None, init=False, compare=False, repr=False)
+
+    def __getstate__(self):
+        return dataclass_getstate(self)
+
+    def __setstate__(self, state):
+        dataclass_setstate(self, state)
 
     @classmethod
     def from_string(cls, string: str) -> Optional['Expression']:
@@ -505,6 +540,9 @@ class Expression:
         True
         expr(t2)
         True
+
+        Values with spaces are quoted
+        expr = Expression.from_string('name = "rock and roll"')
         """
         case_sensitive = False
         adapt_expected_value = True
@@ -520,7 +558,7 @@ class Expression:
                 adapt_expected_value = False
                 value = False
             else:
-                attr, op, value = string.split()
+                attr, op, value = (_unquote(token) for token in _filter_token.findall(string))
                 if op.startswith('i') and not op == 'in':
                     case_sensitive = True
                     value = value.lower()
@@ -529,22 +567,136 @@ class Expression:
             return cls(attr, op, value, adapt_expected_value=adapt_expected_value, case_sensitive=case_sensitive)
         return None
 
-    def __call__(self, obj: Any) -> bool:
-        if not self.attr or self.attr == 'self':
-            value = obj
-        else:
-            value = getattr(obj, self.attr)
+    def compile(self) -> Callable[[Any], bool]:
+        """
+        Build a closure equivalent to calling the expression. The attribute getter, operator and expected value are
+        resolved once instead of on every call.
+        """
+        get_value = operator.attrgetter(self.attr) if self.attr and self.attr != 'self' else None
+        op = self.op.callable if isinstance(self.op, CallableFromString) else self.op
+        expected = self.value
         if self.case_sensitive:
-            if isinstance(value, (tuple, list)):
-                value = [v.lower() for v in value]
-            else:
-                value = value.lower()
-            return self.op(value, self.value)
-        if self.adapt_expected_value:
-            value_type = type(value)
-            compare_value = value_type(self.value)
+            def expr(obj: Any) -> bool:
+                value = get_value(obj) if get_value else obj
+                if isinstance(value, (tuple, list)):
+                    value = [v.lower() for v in value]
+                else:
+                    value = value.lower()
+                return op(value, expected)
+        elif self.adapt_expected_value:
+            coerced = {}
+
+            def expr(obj: Any) -> bool:
+                value = get_value(obj) if get_value else obj
+                value_type = type(value)
+                try:
+                    compare_value = coerced[value_type]
+                except KeyError:
+                    compare_value = coerced[value_type] = value_type(expected)
+                return op(value, compare_value)
+        else:
+            value_type = type(expected)
+
+            def expr(obj: Any) -> bool:
+                return op(value_type(get_value(obj) if get_value else obj), expected)
+        return expr
+
+    def __call__(self, obj: Any) -> bool:
+        if not self._compiled:
+            self._compiled = self.compile()
+        return self._compiled(obj)
+
+    def filter_many(self, objs: Iterable[Any]) -> List[bool]:
+        if not self._compiled:
+            self._compiled = self.compile()
+        expr = self._compiled
+        return [expr(obj) for obj in objs]
+
+
+@dataclass
+class AllOf:
+    expressions: Sequence[Union[Expression, 'AllOf', 'AnyOf']]
+    _compiled: Optional[Callable[[Any], bool]] = field(default=None, init=False, compare=False, repr=False)
+
+    def __getstate__(self):
+        return dataclass_getstate(self)
+
+    def __setstate__(self, state):
+        dataclass_setstate(self, state)
+
+    def compile(self) -> Callable[[Any], bool]:
+        exprs = tuple(e.compile() for e in self.expressions)
+        if len(exprs) == 1:
+            return exprs[0]
+
+        def all_of(obj: Any) -> bool:
+            for expr in exprs:
+                if not expr(obj):
+                    return False
+            return True
+        return all_of
+
+    def __call__(self, obj: Any) -> bool:
+        if not self._compiled:
+            self._compiled = self.compile()
+        return self._compiled(obj)
+
+    def filter_many(self, objs: Iterable[Any]) -> List[bool]:
+        if not self._compiled:
+            self._compiled = self.compile()
+        expr = self._compiled
+        return [expr(obj) for obj in objs]
+
+
+@dataclass
+class AnyOf(AllOf):
+    def compile(self) -> Callable[[Any], bool]:
+        exprs = tuple(e.compile() for e in self.expressions)
+        if len(exprs) == 1:
+            return exprs[0]
+
+        def any_of(obj: Any) -> bool:
+            for expr in exprs:
+                if expr(obj):
+                    return True
+            return False
+        return any_of
+
+
+FilterType = Union[Expression, AllOf, AnyOf]
+
+
+def filter_from_string(string: str) -> Optional[FilterType]:
+    """
+    Expression.from_string extended with and/or, where and binds tighter than or:
+    filter_from_string('method = login and id > 1 or method = logout')
+    and/or inside quoted values are part of the value. Raises ValueError for an expression which can't be parsed.
+    """
+    if not string:
+        return None
+    alternatives = []
+    for part in _split_tokens(_filter_token.findall(string), 'or'):
+        exprs = [_expression_from_tokens(tokens, string) for tokens in _split_tokens(part, 'and')]
+        alternatives.append(exprs[0] if len(exprs) == 1 else AllOf(exprs))
+    return alternatives[0] if len(alternatives) == 1 else AnyOf(alternatives)
+
+
+def _split_tokens(tokens: Sequence[str], keyword: str) -> List[List[str]]:
+    parts = [[]]
+    for token in tokens:
+        if token == keyword:
+            parts.append([])
         else:
-            value_type = type(self.value)
-            value = value_type(value)
-            compare_value = self.value
-        return self.op(value, compare_value)
+            parts[-1].append(token)
+    return parts
+
+
+def _expression_from_tokens(tokens: Sequence[str], string: str) -> Expression:
+    sub_expression = ' '.join(tokens)
+    try:
+        expr = Expression.from_string(sub_expression)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Unable to parse {sub_expression!r} in filter {string!r}: {e}") from e
+    if expr is None:
+        raise ValueError(f"Empty expression in filter {string!r}")
+    return expr
@@ -0,0 +1,4 @@
+from .base import (BenchmarkResult, benchmark, benchmarks, run_benchmark, run_benchmarks, select_benchmarks,
+                   percentile)
+from .compare import Comparison, compare, regressions
+from . import codecs, scheduler, files, network, stats, startup
@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import sys
+from pathlib import Path
+
+from aionetworking.compatibility import loop_capabilities
+from aionetworking.utils import set_loop_policy
+
+from . import BenchmarkResult, compare, regressions, run_benchmarks, select_benchmarks
+
+
+suites = ('codecs', 'scheduler', 'files', 'network', 'replay', 'stats', 'startup')
+
+
+def print_result(result: BenchmarkResult) -> None:
+    latency = f'p50 {result.p50_ms}ms  p99 {result.p99_ms}ms' if result.p50_ms is not None else ''
+    print(f'{result.name:<32}{result.msgs_per_second:>14} msgs/s  {latency:<32}rss {result.rss_mb}MB  '
+          f'{result.error or ""}', file=sys.stderr)
+
+
+async def run(args) -> dict:
+    names = select_benchmarks(args.suite, args.filter)
+    results = await run_benchmarks(names, args.num, timeout=args.timeout, on_result=print_result)
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'num': args.num,
+            **loop_capabilities(),
+        },
+        'results': [result.to_dict() for result in results]
+    }
+
+
+def main_run(args) -> int:
+    set_loop_policy(posix_loop_type=args.loop, windows_loop_type=args.loop)
+    output = asyncio.run(run(args))
+    text = json.dumps(output, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return 1 if any(result['error'] for result in output['results']) else 0
+
+
+def main_compare(args) -> int:
+    base = json.loads(Path(args.base).read_text())
+    new = json.loads(Path(args.new).read_text())
+    comparisons = compare(base, new, threshold=args.threshold, rss_threshold=args.rss_threshold)
+    for comparison in comparisons:
+        print(comparison)
+    found = regressions(comparisons)
+    print(f'{len(found)} regression(s) found' if found else 'No regressions found')
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    subparsers = parser.add_subparsers(dest='command')
+    run_parser = subparsers.add_parser('run', help='run benchmarks and output results as json')
+    run_parser.add_argument('-s', '--suite', action='append', choices=suites, default=[],
+                            help='suite to run, can be given more than once. All suites are run by default')
+    run_parser.add_argument('-k', '--filter', action='append', default=[],
+                            help='only run benchmarks whose name contains this text')
+    run_parser.add_argument('-n', '--num', type=int, default=10000, help='number of messages per benchmark')
+    run_parser.add_argument('-l', '--loop', default='selector', help='loop to use')
+    run_parser.add_argument('-t', '--timeout', type=float, default=120, help='timeout for each benchmark')
+    run_parser.add_argument('-o', '--output', help='file to write json results to, stdout by default')
+    compare_parser = subparsers.add_parser('compare', help='compare two json results and flag regressions')
+    compare_parser.add_argument('base', help='json results of the baseline run')
+    compare_parser.add_argument('new', help='json results of the new run')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='relative change in throughput or latency counted as a regression')
+    compare_parser.add_argument('--rss-threshold', type=float, default=0.25,
+                                help='relative increase in rss counted as a regression')
+    args = parser.parse_args()
+    if args.command == 'run':
+        sys.exit(main_run(args))
+    elif args.command == 'compare':
+        sys.exit(main_compare(args))
+    parser.print_help()
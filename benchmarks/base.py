@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field, asdict
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+    import resource
+
+
+BenchmarkFunc = Callable[[int], Awaitable[Tuple[int, float, Sequence[float]]]]
+benchmarks: Dict[str, Tuple[str, BenchmarkFunc]] = {}
+
+
+def benchmark(suite: str, name: str) -> Callable[[BenchmarkFunc], BenchmarkFunc]:
+    """
+    Register an async benchmark. It is called with the number of messages to process and must return the number of
+    messages processed, the elapsed time in seconds and the latency of each measured operation in seconds.
+    """
+    def decorator(f: BenchmarkFunc) -> BenchmarkFunc:
+        benchmarks[name] = (suite, f)
+        return f
+    return decorator
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    suite: str
+    msgs: int
+    seconds: float
+    msgs_per_second: float
+    p50_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    rss_mb: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def rss_mb() -> float:
+    if psutil:
+        return psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class LatencyTimer:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self._start = None
+        self.elapsed = 0.0
+
+    def __enter__(self) -> 'LatencyTimer':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.elapsed = time.perf_counter() - self._start
+
+    def add(self, started: float) -> None:
+        self.latencies.append(time.perf_counter() - started)
+
+
+async def run_benchmark(name: str, num: int, timeout: float = 60) -> BenchmarkResult:
+    suite, f = benchmarks[name]
+    try:
+        msgs, seconds, latencies = await asyncio.wait_for(f(num), timeout=timeout)
+    except Exception as e:
+        return BenchmarkResult(name=name, suite=suite, msgs=0, seconds=0, msgs_per_second=0, rss_mb=round(rss_mb(), 2),
+                               error=f'{e.__class__.__name__}: {e}')
+    latencies = sorted(latencies)
+    p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+    return BenchmarkResult(
+        name=name, suite=suite, msgs=msgs, seconds=round(seconds, 6),
+        msgs_per_second=round(msgs / seconds, 1) if seconds else 0,
+        p50_ms=round(p50 * 1000, 4) if p50 is not None else None,
+        p99_ms=round(p99 * 1000, 4) if p99 is not None else None,
+        rss_mb=round(rss_mb(), 2))
+
+
+def select_benchmarks(suites: Sequence[str] = (), names: Sequence[str] = ()) -> List[str]:
+    return [name for name, (suite, f) in benchmarks.items() if (not suites or suite in suites) and
+            (not names or any(n in name for n in names))]
+
+
+async def run_benchmarks(names: Sequence[str], num: int, timeout: float = 60,
+                         on_result: Callable[[BenchmarkResult], None] = None) -> List[BenchmarkResult]:
+    results = []
+    for name in names:
+        result = await run_benchmark(name, num, timeout=timeout)
+        if on_result:
+            on_result(result)
+        results.append(result)
+    return results
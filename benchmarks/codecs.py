@@ -0,0 +1,58 @@
+import datetime
+import time
+
+from aionetworking.formats.contrib.json import JSONObject
+from aionetworking.formats.contrib.pickle import PickleObject
+from aionetworking.formats.recording import BufferObject
+
+from .base import benchmark, LatencyTimer
+
+
+json_msg = {"jsonrpc": "2.0", "id": 1, "method": "login", "params": ["user1", "password"]}
+buffer_msg = b'{"jsonrpc": "2.0", "id": 1, "method": "login", "params": ["user1", "password"]}'
+context = {'protocol_name': 'TCP Server', 'host': '127.0.0.1', 'port': 60000, 'peer': '127.0.0.1:60000',
+           'sock': '127.0.0.1:8888', 'own': '127.0.0.1:8888', 'address': '127.0.0.1', 'alias': '127.0.0.1',
+           'server': '127.0.0.1:8888', 'client': '127.0.0.1:60000'}
+codecs = {
+    'json': (JSONObject, json_msg),
+    'pickle': (PickleObject, json_msg),
+    'recording': (BufferObject, buffer_msg),
+}
+batch_size = 100
+
+
+def get_codec(name: str):
+    msg_obj, msg = codecs[name]
+    return msg_obj.get_codec(context=context), msg
+
+
+async def encode(name: str, num: int):
+    codec, msg = get_codec(name)
+    timestamp = datetime.datetime.now()
+    with LatencyTimer() as timer:
+        for _ in range(num):
+            started = time.perf_counter()
+            await codec.encode(msg, system_timestamp=timestamp)
+            timer.add(started)
+    return num, timer.elapsed, timer.latencies
+
+
+async def decode(name: str, num: int):
+    codec, msg = get_codec(name)
+    encoded = await codec.encode(msg, system_timestamp=datetime.datetime.now())
+    buffer = encoded * batch_size
+    batches, remainder = divmod(num, batch_size)
+    count = 0
+    with LatencyTimer() as timer:
+        for i in range(batches + (1 if remainder else 0)):
+            started = time.perf_counter()
+            async for _ in codec.decode_buffer(buffer if i < batches else encoded * remainder):
+                count += 1
+            timer.add(started)
+    latencies = [latency / batch_size for latency in timer.latencies]
+    return count, timer.elapsed, latencies
+
+
+for _name in codecs:
+    benchmark('codecs', f'codec.{_name}.encode')(lambda num, name=_name: encode(name, num))
+    benchmark('codecs', f'codec.{_name}.decode')(lambda num, name=_name: decode(name, num))
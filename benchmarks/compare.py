@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+
+from typing import Any, Dict, List, Optional
+
+
+# metric: True if a higher value is better
+metrics = {
+    'msgs_per_second': True,
+    'p50_ms': False,
+    'p99_ms': False,
+    'rss_mb': False,
+}
+
+
+@dataclass
+class Comparison:
+    name: str
+    metric: str
+    base: Optional[float]
+    new: Optional[float]
+    change: Optional[float]
+    regression: bool
+
+    def __str__(self):
+        change = f'{self.change:+.1%}' if self.change is not None else 'n/a'
+        flag = 'REGRESSION' if self.regression else ''
+        return f'{self.name:<32}{self.metric:<18}{self.base!s:>14}{self.new!s:>14}{change:>10}  {flag}'
+
+
+def _by_name(run: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {result['name']: result for result in run['results']}
+
+
+def compare(base_run: Dict[str, Any], new_run: Dict[str, Any], threshold: float = 0.1,
+            rss_threshold: float = 0.25) -> List[Comparison]:
+    base_results = _by_name(base_run)
+    comparisons = []
+    for name, new in _by_name(new_run).items():
+        base = base_results.get(name)
+        if not base:
+            continue
+        if new.get('error') and not base.get('error'):
+            comparisons.append(Comparison(name, 'error', None, None, None, True))
+            continue
+        for metric, higher_is_better in metrics.items():
+            base_value, new_value = base.get(metric), new.get(metric)
+            if not base_value or new_value is None:
+                continue
+            change = (new_value - base_value) / base_value
+            limit = rss_threshold if metric == 'rss_mb' else threshold
+            regression = change < -limit if higher_is_better else change > limit
+            comparisons.append(Comparison(name, metric, base_value, new_value, change, regression))
+    return comparisons
+
+
+def regressions(comparisons: List[Comparison]) -> List[Comparison]:
+    return [comparison for comparison in comparisons if comparison.regression]
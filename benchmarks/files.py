@@ -0,0 +1,27 @@
+import asyncio
+import time
+from pathlib import Path
+from tempfile import mkdtemp
+
+from aionetworking.actions.file_storage import ManagedFile
+
+from .base import benchmark, LatencyTimer
+
+
+data = b'{"jsonrpc": "2.0", "id": 1, "method": "login", "params": ["user1", "password"]}'
+
+
+@benchmark('files', 'managed_file.write')
+async def managed_file_write(num: int):
+    path = Path(mkdtemp()) / 'managed_file.write'
+    timer = LatencyTimer()
+
+    async def write_one():
+        started = time.perf_counter()
+        await ManagedFile.open(path).write(data)
+        timer.add(started)
+
+    with timer:
+        await asyncio.gather(*[write_one() for _ in range(num)])
+        await ManagedFile.close_all(path.parent)
+    return num, timer.elapsed, timer.latencies
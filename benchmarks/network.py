@@ -0,0 +1,168 @@
+import asyncio
+import datetime
+import logging
+import socket
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import mkdtemp
+
+from aionetworking.actions.base import BaseAction
+from aionetworking.actions.echo import EchoAction
+from aionetworking.formats.contrib.json import JSONObject
+from aionetworking.formats.recording import get_recording_codec
+from aionetworking.networking import (StreamServerProtocolFactory, StreamClientProtocolFactory,
+                                      DatagramServerProtocolFactory, DatagramClientProtocolFactory,
+                                      ServerSideSSL, ClientSideSSL)
+from aionetworking.receivers.servers import TCPServer, UDPServer, UnixSocketServer
+from aionetworking.requesters.echo import EchoRequester
+from aionetworking.senders.clients import TCPClient, UDPClient, UnixSocketClient
+from aionetworking.types.formats import MessageObjectType
+
+from .base import benchmark, LatencyTimer
+
+from typing import Any, Optional, Tuple
+
+
+host = '127.0.0.1'
+oneway_msg = b'{"jsonrpc": "2.0", "id": 1, "method": "login", "params": ["user1", "password"]}'
+tempdir = Path(mkdtemp())
+batch_size = 100
+
+
+@dataclass
+class CountingAction(BaseAction):
+    expected: int = 0
+    done: asyncio.Event = None
+    _count: int = field(default=0, init=False, compare=False)
+
+    async def do_one(self, msg: MessageObjectType) -> Any:
+        self._count += 1
+        if self._count >= self.expected:
+            self.done.set()
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def ssl_contexts() -> Tuple[ServerSideSSL, ClientSideSSL]:
+    from aionetworking.networking.ssl_utils import generate_signed_key_cert
+    cert, cert_path, key, key_path = generate_signed_key_cert(tempdir, subjectAltName={'IP': host})
+    return (ServerSideSSL(cert=cert_path, key=key_path, warn_if_expires_before_days=0),
+            ClientSideSSL(cafile=cert_path, check_hostname=False, warn_if_expires_before_days=0))
+
+
+@contextmanager
+def stats_logging(enabled: bool):
+    loggers = [logging.getLogger('receiver.stats'), logging.getLogger('sender.stats')]
+    previous = [(logger.level, logger.propagate, logger.handlers) for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.INFO if enabled else logging.ERROR)
+        logger.propagate = False
+        logger.handlers = [logging.NullHandler()]
+    try:
+        yield
+    finally:
+        for logger, (level, propagate, handlers) in zip(loggers, previous):
+            logger.setLevel(level)
+            logger.propagate = propagate
+            logger.handlers = handlers
+
+
+def get_server_client(transport: str, action: BaseAction, twoway: bool, ssl: bool = False):
+    requester = EchoRequester() if twoway else None
+    server_ssl, client_ssl = ssl_contexts() if ssl else (None, None)
+    if transport == 'udp':
+        port = free_port()
+        server = UDPServer(protocol_factory=DatagramServerProtocolFactory(action=action, dataformat=JSONObject),
+                           host=host, port=port)
+        client = UDPClient(protocol_factory=DatagramClientProtocolFactory(requester=requester, dataformat=JSONObject),
+                           host=host, port=port)
+        return server, client
+    server_factory = StreamServerProtocolFactory(action=action, dataformat=JSONObject)
+    client_factory = StreamClientProtocolFactory(requester=requester, dataformat=JSONObject)
+    if transport == 'unix':
+        path = tempdir / f'benchmark_{free_port()}.sock'
+        return (UnixSocketServer(protocol_factory=server_factory, path=path),
+                UnixSocketClient(protocol_factory=client_factory, path=path))
+    port = free_port()
+    return (TCPServer(protocol_factory=server_factory, host=host, port=port, ssl=server_ssl),
+            TCPClient(protocol_factory=client_factory, host=host, port=port, ssl=client_ssl))
+
+
+async def oneway(transport: str, num: int, ssl: bool = False, stats: bool = False):
+    done = asyncio.Event()
+    server, client = get_server_client(transport, CountingAction(expected=num, done=done), False, ssl=ssl)
+    with stats_logging(stats):
+        await server.start()
+        try:
+            async with client as conn:
+                with LatencyTimer() as timer:
+                    if transport == 'udp':
+                        # Yield between datagrams so the server can read each one before the socket buffer fills
+                        for _ in range(num):
+                            conn.send_data(oneway_msg)
+                            await asyncio.sleep(0)
+                    else:
+                        # Stream codecs decode each read separately, so keep each batch well within one read
+                        for i in range(0, num, batch_size):
+                            fut = conn.send_data_many([oneway_msg] * min(batch_size, num - i))
+                            if fut:
+                                await fut
+                            await asyncio.sleep(0)
+                    await done.wait()
+        finally:
+            await server.close()
+    return num, timer.elapsed, []
+
+
+async def twoway(transport: str, num: int, ssl: bool = False, stats: bool = False):
+    server, client = get_server_client(transport, EchoAction(), True, ssl=ssl)
+    with stats_logging(stats):
+        await server.start()
+        try:
+            async with client as conn:
+                with LatencyTimer() as timer:
+                    for _ in range(num):
+                        started = time.perf_counter()
+                        await conn.echo()
+                        timer.add(started)
+        finally:
+            await server.close()
+    return num, timer.elapsed, timer.latencies
+
+
+async def replay(num: int):
+    codec = get_recording_codec()
+    codec.context = {'address': host}
+    timestamp = datetime.datetime.now()
+    packets = await codec.encode_many([oneway_msg] * num, system_timestamp=timestamp)
+    path = tempdir / f'recording_{num}.recording'
+    path.write_bytes(b''.join(packets))
+    done = asyncio.Event()
+    # Datagrams keep message boundaries when the server falls behind, stream codecs decode each read on its own
+    server, client = get_server_client('udp', CountingAction(expected=num, done=done), False)
+    await server.start()
+    try:
+        async with client as conn:
+            with LatencyTimer() as timer:
+                # All packets share a timestamp so timing only yields to the loop between packets
+                await conn.play_recording(path, timing=True)
+                await done.wait()
+    finally:
+        await server.close()
+    return num, timer.elapsed, []
+
+
+for _transport in ('tcp', 'udp', 'unix'):
+    benchmark('network', f'network.{_transport}.oneway')(lambda num, t=_transport: oneway(t, num))
+    benchmark('network', f'network.{_transport}.twoway')(lambda num, t=_transport: twoway(t, num))
+benchmark('network', 'network.tcp.oneway.ssl')(lambda num: oneway('tcp', num, ssl=True))
+benchmark('network', 'network.tcp.twoway.ssl')(lambda num: twoway('tcp', num, ssl=True))
+benchmark('network', 'network.tcp.oneway.stats')(lambda num: oneway('tcp', num, stats=True))
+benchmark('network', 'network.tcp.twoway.stats')(lambda num: twoway('tcp', num, stats=True))
+benchmark('replay', 'replay.udp')(replay)
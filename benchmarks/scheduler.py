@@ -0,0 +1,34 @@
+import time
+
+from aionetworking.futures.schedulers import TaskScheduler
+
+from .base import benchmark, LatencyTimer
+
+
+async def noop() -> None:
+    pass
+
+
+@benchmark('scheduler', 'scheduler.task_with_callback')
+async def task_with_callback(num: int):
+    scheduler = TaskScheduler()
+    with LatencyTimer() as timer:
+        for _ in range(num):
+            started = time.perf_counter()
+            task = scheduler.task_with_callback(noop(), name='Benchmark')
+            task.add_done_callback(lambda t, started=started: timer.add(started))
+        await scheduler.join()
+    await scheduler.close()
+    return num, timer.elapsed, timer.latencies
+
+
+@benchmark('scheduler', 'scheduler.run_wait_fut')
+async def run_wait_fut(num: int):
+    scheduler = TaskScheduler()
+    with LatencyTimer() as timer:
+        for i in range(num):
+            started = time.perf_counter()
+            await scheduler.run_wait_fut(i, scheduler.set_result, i, i)
+            timer.add(started)
+    await scheduler.close()
+    return num, timer.elapsed, timer.latencies
@@ -0,0 +1,36 @@
+import asyncio
+import subprocess
+import sys
+import time
+
+from .base import benchmark, LatencyTimer
+
+from typing import List, Sequence
+
+
+startup_code = 'from aionetworking.conf import load_all_tags; load_all_tags()'
+deferred_modules = ('asyncssh', 'cryptography', 'psutil', 'systemd', 'pamela', 'inflect', 'aiofiles')
+max_imports = 20
+
+
+def loaded_modules(code: str = startup_code, modules: Sequence[str] = deferred_modules) -> List[str]:
+    """
+    Runs code in a new interpreter and returns which of modules it imported.
+    """
+    check = f'import sys\n{code}\nprint(" ".join(m for m in {tuple(modules)!r} if m in sys.modules))'
+    process = subprocess.run([sys.executable, '-c', check], stdout=subprocess.PIPE, check=True,
+                             universal_newlines=True)
+    return process.stdout.split()
+
+
+@benchmark('startup', 'startup.import')
+async def import_time(num: int):
+    num = min(num, max_imports)
+    timer = LatencyTimer()
+    with timer:
+        for _ in range(num):
+            started = time.perf_counter()
+            process = await asyncio.create_subprocess_exec(sys.executable, '-c', startup_code)
+            await process.wait()
+            timer.add(started)
+    return num, timer.elapsed, timer.latencies
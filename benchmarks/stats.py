@@ -0,0 +1,20 @@
+from aionetworking.logging.loggers import StatsTracker
+
+from .base import benchmark, LatencyTimer
+
+
+msg = b'{"jsonrpc": "2.0", "id": 1, "method": "login", "params": ["user1", "password"]}'
+
+
+@benchmark('stats', 'stats.tracker')
+async def tracker(num: int):
+    stats = StatsTracker()
+    with LatencyTimer() as timer:
+        for _ in range(num):
+            stats.on_buffer_received(msg)
+            stats.record_latency('decode_latency', 0.0001)
+            stats.on_msg_processed(msg)
+            stats.record_latency('action_latency', 0.0002)
+            stats.on_msg_sent(msg)
+            stats.record_latency('response_latency', 0.0001)
+    return num, timer.elapsed, []
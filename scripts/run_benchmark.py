@@ -6,127 +6,141 @@ except ImportError:
     aiofile = None
 import aiofiles
 import asyncio
-import concurrent.futures
 import argparse
+import itertools
+import json
 import logging
+import os
+import subprocess
+import sys
+import time
 from pathlib import Path
 from aionetworking import settings
 from aionetworking.actions.echo import EchoAction
 from aionetworking.actions.file_storage import BufferedFileStorage
+from aionetworking.compatibility import loop_capabilities
 from aionetworking.formats.contrib.json import JSONObject
-from aionetworking.networking.protocol_factories import StreamServerProtocolFactory, StreamClientProtocolFactory
-from aionetworking.receivers.servers import TCPServer
+from aionetworking.networking.protocol_factories import (StreamServerProtocolFactory, StreamClientProtocolFactory,
+                                                         DatagramServerProtocolFactory, DatagramClientProtocolFactory)
+from aionetworking.receivers.servers import TCPServer, UDPServer, UnixSocketServer
 from aionetworking.requesters.echo import EchoRequester
-from aionetworking.senders.clients import TCPClient
+from aionetworking.senders.clients import TCPClient, UDPClient, UnixSocketClient
 from aionetworking.utils import set_loop_policy
 from tempfile import mkdtemp
 
 
 tempdir = mkdtemp()
 host = '127.0.0.1'
+transports = ('tcp', 'udp', 'unix')
+loops = ('selector', 'proactor') if os.name == 'nt' else ('selector', 'uvloop')
 
 
-def protocol_factory_one_way_client() -> StreamClientProtocolFactory:
-    factory = StreamClientProtocolFactory(
-        dataformat=JSONObject)
-    return factory
-
-
-def protocol_factory_two_way_client() -> StreamClientProtocolFactory:
-    factory = StreamClientProtocolFactory(
-        requester=EchoRequester(),
-        dataformat=JSONObject)
-    return factory
-
-
-def tcp_client_one_way(port):
-    return TCPClient(protocol_factory=protocol_factory_one_way_client(), host=host, port=port)
-
-
-def tcp_client_two_way(port):
-    return TCPClient(protocol_factory=protocol_factory_two_way_client(), host=host, port=port)
+def protocol_factory_client(transport, twoway, buffered_read):
+    kwargs = {'requester': EchoRequester()} if twoway else {}
+    if transport == 'udp':
+        return DatagramClientProtocolFactory(dataformat=JSONObject, **kwargs)
+    return StreamClientProtocolFactory(dataformat=JSONObject, buffered_read=buffered_read, **kwargs)
 
 
 def buffered_file_storage_action() -> BufferedFileStorage:
-    action = BufferedFileStorage(base_path=Path(Path(tempdir) / 'Data'), binary=True, close_file_after_inactivity=5,
+    action = BufferedFileStorage(base_path=Path(Path(tempdir) / 'Data'), close_file_after_inactivity=5,
                                  path='Encoded/{msg.sender}_{msg.name}.{msg.name}')
     return action
 
 
-def protocol_factory_one_way_server(pause_on_size) -> StreamServerProtocolFactory:
-    factory = StreamServerProtocolFactory(
-        action=buffered_file_storage_action(),
-        dataformat=JSONObject,
-        pause_reading_on_buffer_size=pause_on_size
-    )
-    return factory
+def protocol_factory_server(transport, twoway, pause_on_size, buffered_read):
+    action = EchoAction() if twoway else buffered_file_storage_action()
+    if transport == 'udp':
+        return DatagramServerProtocolFactory(action=action, dataformat=JSONObject)
+    return StreamServerProtocolFactory(action=action, dataformat=JSONObject, pause_reading_on_buffer_size=pause_on_size,
+                                       buffered_read=buffered_read)
 
 
-def protocol_factory_two_way_server(pause_on_size) -> StreamServerProtocolFactory:
-    factory = StreamServerProtocolFactory(
-        action=EchoAction(),
-        dataformat=JSONObject,
-        pause_reading_on_buffer_size=pause_on_size
-    )
-    return factory
+def get_server(transport, twoway, port, pause_on_size, buffered_read):
+    protocol_factory = protocol_factory_server(transport, twoway, pause_on_size, buffered_read)
+    if transport == 'udp':
+        return UDPServer(protocol_factory=protocol_factory, host=host, port=port)
+    if transport == 'unix':
+        return UnixSocketServer(protocol_factory=protocol_factory, path=Path(tempdir) / f'benchmark_{port}.sock')
+    return TCPServer(protocol_factory=protocol_factory, host=host, port=port)
 
 
-def tcp_server_one_way(port, pause_on_size) -> TCPServer:
-    return TCPServer(protocol_factory=protocol_factory_one_way_server(pause_on_size), host=host, port=port)
+def get_client(transport, twoway, port, buffered_read):
+    protocol_factory = protocol_factory_client(transport, twoway, buffered_read)
+    if transport == 'udp':
+        return UDPClient(protocol_factory=protocol_factory, host=host, port=port)
+    if transport == 'unix':
+        return UnixSocketClient(protocol_factory=protocol_factory, path=Path(tempdir) / f'benchmark_{port}.sock')
+    return TCPClient(protocol_factory=protocol_factory, host=host, port=port)
 
 
-def tcp_server_two_way(port, pause_on_size) -> TCPServer:
-    return TCPServer(protocol_factory=protocol_factory_two_way_server(pause_on_size), host=host, port=port)
+async def send_msgs(client, msgs, twoway) -> None:
+    async with client as conn:
+        fut = conn.send_data_many(msgs)
+        if fut:
+            await fut
+        if twoway:
+            for _ in msgs:
+                await conn.wait_notification()
 
 
-async def run_one_way(num_clients, num_msgs, slow_callback_duration, asyncio_debug, pause_on_size, times, timeout):
+async def run(transport, twoway, num_clients, num_msgs, slow_callback_duration, asyncio_debug, pause_on_size, times,
+              timeout, buffered_read):
     loop = asyncio.get_event_loop()
     loop.set_debug(asyncio_debug)
     loop.slow_callback_duration = slow_callback_duration
-    json_msg = b'{"jsonrpc": "2.0", "id": 1, "method": "login", "params": ["user1", "password"]}'
-    msgs = [json_msg for _ in range(0, num_msgs)]
-    with concurrent.futures.ProcessPoolExecutor(max_workers=num_clients) as executor:
-        for i in range(0, times):
-            port = 8080 + i
-            server = tcp_server_one_way(port, pause_on_size)
-            server_task = asyncio.create_task(server.start())
-            await server.wait_started()
-            client = tcp_client_one_way(port)
-            coros = []
-            for j in range(0, num_clients):
-                override = {'srcip': f'127.0.0.{j + 1}'}
-                coro = loop.run_in_executor(executor, client.open_send_msgs, msgs, 0, 1, override)
-                coros.append(coro)
-            await asyncio.wait(coros)
-            await asyncio.wait_for(server.wait_num_has_connected(num_clients), timeout=timeout)
-            await asyncio.wait_for(server.wait_num_connections(0), timeout=timeout)
-            await asyncio.wait_for(server.close(), timeout=timeout)
-            await asyncio.wait_for(server_task, timeout=timeout)
-
-
-async def run_two_way(num_clients, num_msgs, slow_callback_duration, asyncio_debug, pause_on_size, times, timeout):
-    loop = asyncio.get_event_loop()
-    loop.set_debug(asyncio_debug)
-    loop.slow_callback_duration = slow_callback_duration
-    json_msg = b'{"id": 1, "method": "echo"}'
+    if twoway:
+        json_msg = b'{"id": 1, "method": "echo"}'
+    else:
+        json_msg = b'{"jsonrpc": "2.0", "id": 1, "method": "login", "params": ["user1", "password"]}'
     msgs = [json_msg for _ in range(0, num_msgs)]
-    with concurrent.futures.ProcessPoolExecutor(max_workers=num_clients) as executor:
-        for i in range(0, times):
-            port = 8080 + i
-            server = tcp_server_two_way(port, pause_on_size)
-            server_task = asyncio.create_task(server.start())
-            await server.wait_started()
-            client = tcp_client_two_way(port)
-            coros = []
-            for j in range(0, num_clients):
-                override = {'srcip': f'127.0.0.{j + 1}'}
-                coro = loop.run_in_executor(executor, client.open_send_msgs, msgs, 0, 1, override, True)
-                coros.append(coro)
-            await asyncio.wait(coros)
-            await asyncio.wait_for(server.wait_num_has_connected(num_clients), timeout=timeout)
-            await asyncio.wait_for(server.wait_num_connections(0), timeout=timeout)
-            await asyncio.wait_for(server.close(), timeout=timeout)
-            await asyncio.wait_for(server_task, timeout=timeout)
+    durations = []
+    for i in range(0, times):
+        port = 8080 + i
+        server = get_server(transport, twoway, port, pause_on_size, buffered_read)
+        server_task = asyncio.create_task(server.start())
+        await server.wait_started()
+        start = time.perf_counter()
+        clients = [get_client(transport, twoway, port, buffered_read) for _ in range(0, num_clients)]
+        await asyncio.wait_for(asyncio.gather(*[send_msgs(client, msgs, twoway) for client in clients]), timeout=timeout)
+        await asyncio.wait_for(server.close(), timeout=timeout)
+        durations.append(time.perf_counter() - start)
+        await asyncio.wait_for(server_task, timeout=timeout)
+    duration = min(durations)
+    result = loop_capabilities(loop)
+    if transport == 'udp':
+        buffered_read = False
+    elif buffered_read is None:
+        buffered_read = result['buffered_protocol']
+    result.update({
+        'transport': transport,
+        'duplex': 'twoway' if twoway else 'oneway',
+        'buffered_read': buffered_read,
+        'clients': num_clients,
+        'msgs': num_clients * num_msgs,
+        'seconds': round(duration, 4),
+        'msgs_per_second': round(num_clients * num_msgs / duration, 1)
+    })
+    return result
+
+
+def run_matrix(args, extra_args) -> None:
+    print(f"{'loop':<10}{'transport':<10}{'duplex':<8}{'buffered':<10}{'msgs/s':>12}{'seconds':>10}")
+    for loop, transport, twoway in itertools.product(loops, transports, (False, True)):
+        cmd = [sys.executable, __file__, '--loop', loop, '--transport', transport, '--json',
+               '--clients', str(args.clients), '--num', str(args.num), '--times', str(args.times),
+               '--timeout', str(args.timeout)] + extra_args
+        if twoway:
+            cmd.append('--twoway')
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        duplex = 'twoway' if twoway else 'oneway'
+        if proc.returncode:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f'exit code {proc.returncode}'
+            print(f"{loop:<10}{transport:<10}{duplex:<8}{'':<10}{'failed':>12}  {error}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{result['loop']:<10}{transport:<10}{duplex:<8}{str(result['buffered_read']):<10}"
+              f"{result['msgs_per_second']:>12}{result['seconds']:>10}")
 
 
 def asyncio_formatter() -> logging.Formatter:
@@ -289,15 +303,30 @@ if __name__ == '__main__':
                         help='use aiofile (aio.h)')
     parser.add_argument('-w', '--twoway', action='store_true',
                         help='two-way server')
+    parser.add_argument('-x', '--transport', default='tcp', choices=transports,
+                        help='transport to benchmark')
+    parser.add_argument('-b', '--buffered-read', default='auto', choices=('auto', 'on', 'off'),
+                        help='read stream connections into reusable buffers, auto if supported by the loop')
+    parser.add_argument('-j', '--json', action='store_true',
+                        help='print result as json')
+    parser.add_argument('-m', '--matrix', action='store_true',
+                        help='compare each loop across transports, one-way and two-way, each in a new process')
     args, kw = parser.parse_known_args()
+    if args.matrix:
+        extra_args = ['--buffered-read', args.buffered_read]
+        if args.pause_on_size is not None:
+            extra_args += ['--pause_on_size', str(args.pause_on_size)]
+        run_matrix(args, extra_args)
+        sys.exit(0)
     setup_logging(args.loglevel, args.senderloglevel, args.asyncio_debug, args.twoway)
     if aiofile:
         settings.FILE_OPENER = aiofile.AIOFile if args.aioh else aiofiles.open
     set_loop_policy(posix_loop_type=args.loop, windows_loop_type=args.loop)
-    params = (args.clients, args.num, args.slow_duration, args.asyncio_debug, args.pause_on_size, args.times, args.timeout)
-    if args.twoway:
-        coro = run_two_way(*params)
+    buffered_read = {'auto': None, 'on': True, 'off': False}[args.buffered_read]
+    coro = run(args.transport, args.twoway, args.clients, args.num, args.slow_duration, args.asyncio_debug,
+               args.pause_on_size, args.times, args.timeout, buffered_read)
+    result = asyncio.run(coro)
+    if args.json:
+        print(json.dumps(result))
     else:
-        coro = run_one_way(*params)
-    asyncio.run(coro)
-
+        print(', '.join(f'{k}: {v}' for k, v in result.items()))
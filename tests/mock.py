@@ -56,6 +56,31 @@ class MockSFTPConn:
         return self._extra.get(item, default)
 
 
+class MockSFTPRemoteFile:
+
+    def __init__(self):
+        self.writes = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def write(self, data: bytes, offset: int = None) -> int:
+        self.writes.append((data, offset))
+        return len(data)
+
+
+class QueueDatagramProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.queue.put_nowait(data)
+
+
 class MockTCPTransport(MockTransportMixin, Transport):
 
     def __init__(self, queue: asyncio.Queue, *args, **kwargs):
@@ -36,6 +36,11 @@ class TestJsonCodec:
         obj = await json_codec.one_from_file(file_containing_multi_json, system_timestamp=timestamp)
         assert obj == json_object
 
+    @pytest.mark.asyncio
+    async def test_06_encode_many(self, json_codec, json_decoded_multi, json_encoded_multi):
+        encoded = await json_codec.encode_many(json_decoded_multi)
+        assert encoded == json_encoded_multi
+
 
 class TestJsonObject:
     def test_00_get_codec(self, json_buffer, json_codec, context):
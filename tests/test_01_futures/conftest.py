@@ -1,7 +1,7 @@
 import pytest
 import asyncio
 from aionetworking.compatibility import supports_task_name, create_task
-from aionetworking import Counters, Counter, TaskScheduler
+from aionetworking import Counters, Counter, TaskScheduler, WorkQueue, KeyedExecutor
 
 from typing import Callable, Union
 
@@ -52,3 +52,27 @@ async def task() -> asyncio.Task:
         task = create_task(coro())
     yield task
     await task
+
+
+@pytest.fixture
+async def work_queue() -> WorkQueue:
+    queue = WorkQueue(workers=2, max_queue_size=2)
+    queue.start()
+    yield queue
+    await asyncio.wait_for(queue.close(), timeout=1)
+
+
+@pytest.fixture
+async def ordered_work_queue() -> WorkQueue:
+    queue = WorkQueue(workers=2, max_queue_size=10, ordered=True)
+    queue.start()
+    yield queue
+    await asyncio.wait_for(queue.close(), timeout=1)
+
+
+@pytest.fixture
+async def keyed_executor() -> KeyedExecutor:
+    executor = KeyedExecutor(max_pending_per_key=2)
+    executor.start()
+    yield executor
+    await asyncio.wait_for(executor.close(), timeout=1)
@@ -2,7 +2,8 @@ import pytest   # noinspection PyPackageRequirements
 import asyncio
 
 from aionetworking.compatibility import (supports_task_name, get_task_name, get_current_task_name, set_task_name,
-                                         set_current_task_name, current_task)
+                                         set_current_task_name, current_task, get_loop_name, is_uvloop,
+                                         loop_capabilities, supports_buffered_protocol, py37)
 
 
 class TestTaskNames:
@@ -58,3 +59,22 @@ class TestTaskNames:
         else:
             assert str(id(task)) == get_task_name(task)
         await task
+
+
+class TestLoopCapabilities:
+    @pytest.mark.asyncio
+    async def test_00_get_loop_name(self, pytestconfig):
+        loop_type = pytestconfig.getoption("--loop")
+        assert get_loop_name() == loop_type
+        assert is_uvloop() == (loop_type == 'uvloop')
+
+    @pytest.mark.asyncio
+    async def test_01_supports_buffered_protocol(self):
+        assert supports_buffered_protocol() == py37
+
+    @pytest.mark.asyncio
+    async def test_02_loop_capabilities(self):
+        capabilities = loop_capabilities()
+        assert capabilities['loop'] == get_loop_name()
+        assert capabilities['buffered_protocol'] == supports_buffered_protocol()
+        assert {'sock_recvfrom_into', 'datagram', 'unix_sockets'}.issubset(capabilities)
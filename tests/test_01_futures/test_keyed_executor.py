@@ -0,0 +1,83 @@
+import pytest   # noinspection PyPackageRequirements
+import asyncio
+from types import SimpleNamespace
+
+from aionetworking import KeyedExecutor
+
+
+class TestKeyedExecutor:
+    @pytest.mark.asyncio
+    async def test_00_sequential_per_key_parallel_across_keys(self, keyed_executor):
+        done = []
+        running = set()
+        max_running = 0
+
+        async def work(key: str, i: int, delay: float) -> int:
+            nonlocal max_running
+            running.add(key)
+            max_running = max(max_running, len(running))
+            await asyncio.sleep(delay)
+            running.discard(key)
+            done.append((key, i))
+            return i
+
+        futs = []
+        for i in range(2):
+            futs.append(await keyed_executor.put('peer1', work, 'peer1', i, 0.03 - i * 0.02))
+            futs.append(await keyed_executor.put('peer2', work, 'peer2', i, 0.01))
+        assert keyed_executor.num_keys == 2
+        assert await asyncio.wait_for(asyncio.gather(*futs), 1) == [0, 0, 1, 1]
+        assert [i for key, i in done if key == 'peer1'] == [0, 1]
+        assert [i for key, i in done if key == 'peer2'] == [0, 1]
+        assert max_running == 2
+        assert keyed_executor.num_keys == 0
+
+    @pytest.mark.asyncio
+    async def test_01_bounded_per_key(self, keyed_executor):
+        event = asyncio.Event()
+        futs = [await keyed_executor.put('peer1', event.wait) for _ in range(3)]
+        assert keyed_executor.full('peer1')
+        assert not keyed_executor.full('peer2')
+        put_task = asyncio.ensure_future(keyed_executor.put('peer1', event.wait))
+        futs.append(await keyed_executor.put('peer2', asyncio.sleep, 0))
+        await asyncio.sleep(0.01)
+        assert not put_task.done()
+        event.set()
+        futs.append(await asyncio.wait_for(put_task, 1))
+        await asyncio.wait_for(asyncio.gather(*futs), 1)
+
+    @pytest.mark.asyncio
+    async def test_02_exception_does_not_stop_key(self, keyed_executor):
+        async def fail():
+            raise ValueError()
+
+        fut1 = await keyed_executor.put('peer1', fail)
+        fut2 = await keyed_executor.put('peer1', asyncio.sleep, 0, 'ok')
+        with pytest.raises(ValueError):
+            await fut1
+        assert await fut2 == 'ok'
+
+    @pytest.mark.asyncio
+    async def test_03_max_concurrency(self):
+        executor = KeyedExecutor(max_concurrency=1)
+        executor.start()
+        running = 0
+        max_running = 0
+
+        async def work():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(running, max_running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        futs = [await executor.put(key, work) for key in range(3)]
+        await asyncio.wait_for(asyncio.gather(*futs), 1)
+        assert max_running == 1
+        await executor.close()
+
+    def test_04_get_key(self):
+        msg = SimpleNamespace(method='login')
+        assert KeyedExecutor(key_attr='method').get_key(msg, 'peer') == 'login'
+        assert KeyedExecutor(key_attr='missing').get_key(msg, 'peer') == 'peer'
+        assert KeyedExecutor().get_key(msg, 'peer') == 'peer'
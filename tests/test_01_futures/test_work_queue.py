@@ -0,0 +1,83 @@
+import pytest   # noinspection PyPackageRequirements
+import asyncio
+
+from aionetworking import WorkQueue
+
+
+class TestWorkQueue:
+    @pytest.mark.asyncio
+    async def test_00_concurrency_limit(self, work_queue):
+        running = []
+        max_running = 0
+
+        async def work(i: int) -> int:
+            nonlocal max_running
+            running.append(i)
+            max_running = max(max_running, len(running))
+            await asyncio.sleep(0.01)
+            running.remove(i)
+            return i * 2
+
+        futs = [await work_queue.put(None, work, i) for i in range(6)]
+        assert await asyncio.gather(*futs) == [0, 2, 4, 6, 8, 10]
+        assert max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_01_bounded_queue(self, work_queue):
+        event = asyncio.Event()
+        futs = [await work_queue.put(None, event.wait) for _ in range(4)]
+        assert work_queue.qsize == 2
+        assert work_queue.full()
+        put_task = asyncio.ensure_future(work_queue.put(None, event.wait))
+        await asyncio.sleep(0.01)
+        assert not put_task.done()
+        event.set()
+        futs.append(await asyncio.wait_for(put_task, 1))
+        await asyncio.wait_for(asyncio.gather(*futs), 1)
+
+    @pytest.mark.asyncio
+    async def test_02_exception(self, work_queue):
+        async def fail():
+            raise ValueError()
+
+        fut = await work_queue.put(None, fail)
+        with pytest.raises(ValueError):
+            await fut
+        fut = await work_queue.put(None, asyncio.sleep, 0, 'ok')
+        assert await fut == 'ok'
+
+    @pytest.mark.asyncio
+    async def test_03_ordered_per_key(self, ordered_work_queue):
+        done = []
+
+        async def work(key: str, i: int, delay: float):
+            await asyncio.sleep(delay)
+            done.append((key, i))
+
+        futs = []
+        for i in range(3):
+            futs.append(await ordered_work_queue.put('peer1', work, 'peer1', i, 0.03 - i * 0.01))
+            futs.append(await ordered_work_queue.put('peer2', work, 'peer2', i, 0))
+        await asyncio.wait_for(asyncio.gather(*futs), 1)
+        assert [i for key, i in done if key == 'peer1'] == [0, 1, 2]
+        assert [i for key, i in done if key == 'peer2'] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_04_close_waits_for_queued(self):
+        queue = WorkQueue(workers=1, max_queue_size=0)
+        queue.start()
+        done = []
+
+        async def work(i: int):
+            await asyncio.sleep(0.01)
+            done.append(i)
+
+        for i in range(3):
+            await queue.put(None, work, i)
+        await asyncio.wait_for(queue.close(), 1)
+        assert done == [0, 1, 2]
+        assert not queue.is_started
+
+    def test_05_workers_required(self):
+        with pytest.raises(ValueError):
+            WorkQueue(workers=0)
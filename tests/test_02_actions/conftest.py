@@ -1,7 +1,11 @@
 from tests.test_00_formats.conftest import *
+import asyncio
+from dataclasses import dataclass, field
 import pytest
+import json
 from aionetworking import FileStorage, BufferedFileStorage
-from aionetworking.actions import ManagedFile, EchoAction
+from aionetworking.actions import ManagedFile, EchoAction, Broadcaster, BroadcastAction, Subscriber, BaseAction, Route, \
+    RouterAction, ResponseCache
 from aionetworking import Logger
 from aionetworking.formats import get_recording_from_file, JSONObject
 from aionetworking.utils import alist
@@ -9,7 +13,7 @@ from tests.test_02_actions.actions import file_storage_actions, duplex_actions,
 
 from pathlib import Path
 from aionetworking.types.formats import MessageObjectType
-from typing import List, Dict, Optional, Union, Coroutine, Any
+from typing import List, Dict, Optional, Union, Coroutine, Any, Callable
 
 
 @pytest.fixture
@@ -292,3 +296,109 @@ def keepalive_object(keep_alive_request_encoded, keep_alive_request_decoded, con
     return JSONObjectWithKeepAlive(keep_alive_request_encoded, keep_alive_request_decoded, context=context,
                                    system_timestamp=timestamp)
 
+
+
+@dataclass
+class PubSubAction(BroadcastAction):
+    async def do_one(self, msg: MessageObjectType) -> Any:
+        method, params = msg.decoded['method'], msg.decoded.get('params', [])
+        if method == 'subscribe':
+            self.subscribe(msg, params[0])
+        elif method == 'publish':
+            await self.publish(params[0], {'topic': params[0], 'result': params[1]})
+
+
+@pytest.fixture
+def broadcaster() -> Broadcaster:
+    return Broadcaster(max_buffer_size=10)
+
+
+@pytest.fixture
+def subscriber_buffer_sizes() -> Dict[str, int]:
+    return {'peer1': 0, 'peer2': 0}
+
+
+@pytest.fixture
+def subscriber_outputs() -> Dict[str, List[bytes]]:
+    return {'peer1': [], 'peer2': []}
+
+
+@pytest.fixture
+def subscribers(subscriber_buffer_sizes, subscriber_outputs) -> List[Subscriber]:
+    return [Subscriber(peer, JSONObject, subscriber_outputs[peer].append, close=subscriber_outputs[peer].clear,
+                       write_buffer_size=lambda peer=peer: subscriber_buffer_sizes[peer])
+            for peer in subscriber_outputs]
+
+
+@pytest.fixture
+async def pubsub_action() -> PubSubAction:
+    action = PubSubAction()
+    await action.start()
+    yield action
+    await action.close()
+
+
+@pytest.fixture
+def pubsub_request_encoded() -> Callable[[str, List[Any]], bytes]:
+    def encode(method: str, params: List[Any]) -> bytes:
+        return json.dumps({'method': method, 'params': params}).encode()
+    return encode
+
+
+@dataclass
+class RecordingAction(BaseAction):
+    result: Any = None
+    delay: float = 0
+    msgs: List[MessageObjectType] = field(default_factory=list, init=False, compare=False)
+    in_flight: int = field(default=0, init=False, compare=False)
+    max_in_flight: int = field(default=0, init=False, compare=False)
+
+    async def do_one(self, msg: MessageObjectType) -> Any:
+        self.in_flight += 1
+        self.max_in_flight = max(self.in_flight, self.max_in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if msg.decoded.get('method') == 'fail':
+                raise ValueError('fail')
+            self.msgs.append(msg)
+            return self.result
+        finally:
+            self.in_flight -= 1
+
+    def on_exception(self, msg: MessageObjectType, exc: BaseException) -> dict:
+        return {'error': exc.__class__.__name__, 'result': self.result}
+
+
+@pytest.fixture
+def json_rpc_request_object() -> Callable[..., JSONObject]:
+    def make(method: str, id_: int = 1, **context) -> JSONObject:
+        decoded = {'jsonrpc': '2.0', 'id': id_, 'method': method}
+        return JSONObject(json.dumps(decoded).encode(), decoded, context=context)
+    return make
+
+
+@pytest.fixture
+async def router_action() -> RouterAction:
+    action = RouterAction(routes=[
+        Route(RecordingAction(result='fast'), name='fast', methods=['login', 'fail']),
+        Route(RecordingAction(result='slow', delay=0.2), name='slow', methods=['store'], concurrency=2,
+              respond=False),
+        Route(RecordingAction(result='local'), name='local', peers=['127.0.0.0/8'])],
+        default=RecordingAction(result='default'))
+    await action.start()
+    yield action
+    await action.close()
+
+
+@pytest.fixture
+async def quiet_router_action() -> RouterAction:
+    action = RouterAction(routes=[Route(RecordingAction(), name='quiet', methods=['fail', 'login'], respond=False,
+                                        concurrency=1)])
+    await action.start()
+    yield action
+    await action.close()
+
+
+@pytest.fixture
+def response_cache() -> ResponseCache:
+    return ResponseCache(max_entries=2, max_bytes=100)
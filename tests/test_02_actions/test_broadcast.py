@@ -0,0 +1,90 @@
+import pytest
+import asyncio
+
+from aionetworking.actions import Broadcaster
+from aionetworking.formats import JSONObject
+from aionetworking.networking import ReceiverAdaptor
+
+
+class TestBroadcaster:
+    @pytest.mark.asyncio
+    async def test_00_publish_encodes_once(self, broadcaster, subscribers, subscriber_outputs):
+        for subscriber in subscribers:
+            broadcaster.add_subscriber(subscriber)
+            broadcaster.subscribe(subscriber.peer, 'prices')
+        broadcaster.subscribe('peer1', 'news')
+        assert await broadcaster.publish('prices', {'price': 1}) == 2
+        assert await broadcaster.publish('news', {'headline': 'a'}) == 1
+        assert await broadcaster.publish('other', {'headline': 'b'}) == 0
+        assert subscriber_outputs['peer1'] == [b'{"price": 1}', b'{"headline": "a"}']
+        assert subscriber_outputs['peer2'] == [b'{"price": 1}']
+        assert subscriber_outputs['peer1'][0] is subscriber_outputs['peer2'][0]
+        assert broadcaster.subscriptions('peer1') == {'prices', 'news'}
+
+    def test_01_unsubscribe(self, broadcaster, subscribers):
+        broadcaster.add_subscriber(subscribers[0])
+        broadcaster.subscribe('peer1', 'prices')
+        broadcaster.unsubscribe('peer1', 'prices')
+        assert broadcaster.num_subscribers('prices') == 0
+        broadcaster.subscribe('peer1', 'prices')
+        broadcaster.remove_subscriber('peer1')
+        assert broadcaster.num_subscribers('prices') == 0
+        with pytest.raises(KeyError):
+            broadcaster.subscribe('peer1', 'prices')
+
+    def test_02_slow_subscriber_drop(self, broadcaster, subscribers, subscriber_outputs, subscriber_buffer_sizes):
+        for subscriber in subscribers:
+            broadcaster.add_subscriber(subscriber)
+            broadcaster.subscribe(subscriber.peer, 'prices')
+        subscriber_buffer_sizes['peer2'] = 11
+        assert broadcaster.publish_encoded('prices', b'1') == 1
+        subscriber_buffer_sizes['peer2'] = 0
+        assert broadcaster.publish_encoded('prices', b'2') == 2
+        assert subscriber_outputs['peer2'] == [b'2']
+        assert subscribers[1].dropped == 1
+
+    def test_03_slow_subscriber_disconnect(self, subscribers, subscriber_outputs, subscriber_buffer_sizes):
+        broadcaster = Broadcaster(slow_subscriber_policy='disconnect', max_buffer_size=10)
+        for subscriber in subscribers:
+            broadcaster.add_subscriber(subscriber)
+            broadcaster.subscribe(subscriber.peer, 'prices')
+        subscriber_outputs['peer2'].append(b'0')
+        subscriber_buffer_sizes['peer2'] = 11
+        assert broadcaster.publish_encoded('prices', b'1') == 1
+        assert subscriber_outputs['peer2'] == []
+        assert broadcaster.num_subscribers('prices') == 1
+
+    def test_04_invalid_policy(self):
+        with pytest.raises(ValueError):
+            Broadcaster(slow_subscriber_policy='block')
+
+    def test_05_slow_subscriber_disconnect_no_close(self, subscribers, subscriber_outputs, subscriber_buffer_sizes):
+        broadcaster = Broadcaster(slow_subscriber_policy='disconnect', max_buffer_size=10)
+        subscribers[1].close = None
+        for subscriber in subscribers:
+            broadcaster.add_subscriber(subscriber)
+            broadcaster.subscribe(subscriber.peer, 'prices')
+        subscriber_outputs['peer2'].append(b'0')
+        subscriber_buffer_sizes['peer2'] = 11
+        assert broadcaster.publish_encoded('prices', b'1') == 1
+        assert subscriber_outputs['peer2'] == [b'0']
+        assert broadcaster.num_subscribers('prices') == 1
+        assert broadcaster.subscriptions('peer2') == set()
+
+
+@pytest.mark.connections('tcp_twoway_server')
+class TestBroadcastAction:
+    @pytest.mark.asyncio
+    async def test_00_adaptors_subscribe(self, pubsub_action, pubsub_request_encoded, context, timestamp):
+        queues = [asyncio.Queue(), asyncio.Queue()]
+        contexts = [dict(context, peer=f'127.0.0.1:{i}') for i in range(2)]
+        adaptors = [ReceiverAdaptor(JSONObject, context=ctx, action=pubsub_action, send=queue.put_nowait)
+                    for ctx, queue in zip(contexts, queues)]
+        await adaptors[0].on_data_received(pubsub_request_encoded('subscribe', ['prices']), timestamp)
+        await adaptors[1].on_data_received(pubsub_request_encoded('publish', ['prices', 5]), timestamp)
+        assert queues[0].get_nowait() == b'{"topic": "prices", "result": 5}'
+        assert queues[1].empty()
+        assert not any(adaptor._notifications_task for adaptor in adaptors)
+        for adaptor in adaptors:
+            await adaptor.close()
+        assert pubsub_action.broadcaster.num_subscribers('prices') == 0
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+import yaml
+
+from aionetworking.actions import ResponseCache
+from aionetworking.conf import load_all_tags
+from aionetworking.formats import JSONCodec, JSONObject
+
+
+class TestResponseCache:
+    def test_00_key(self, response_cache, json_rpc_request_object):
+        login = json_rpc_request_object('login')
+        assert response_cache.get_key(login) == response_cache.get_key(json_rpc_request_object('login', id_=2))
+        assert response_cache.get_key(login) != response_cache.get_key(json_rpc_request_object('logout'))
+        login_params = json_rpc_request_object('login')
+        login_params.decoded['params'] = {'user': 'user1', 'ids': [1, 2]}
+        other_params = json_rpc_request_object('login')
+        other_params.decoded['params'] = {'ids': [1, 2], 'user': 'user1'}
+        assert response_cache.get_key(login_params) == response_cache.get_key(other_params)
+        other_params.decoded['params'] = {'ids': [True, 2], 'user': 'user1'}
+        assert response_cache.get_key(login_params) != response_cache.get_key(other_params)
+        assert response_cache.get_key(login) != response_cache.get_key(login_params)
+
+    def test_01_methods(self, json_rpc_request_object):
+        response_cache = ResponseCache(methods=['login'])
+        assert response_cache.get_key(json_rpc_request_object('login')) is not None
+        assert response_cache.get_key(json_rpc_request_object('logout')) is None
+
+    def test_02_get_put(self, response_cache):
+        assert response_cache.get('a') is None
+        response_cache.put('a', (b'{"id": ', b'}'))
+        assert response_cache.get('a') == (b'{"id": ', b'}')
+        assert (response_cache.hits, response_cache.misses) == (1, 1)
+        assert response_cache.size == 8
+
+    def test_03_lru(self, response_cache):
+        response_cache.put('a', (b'a', None))
+        response_cache.put('b', (b'b', None))
+        response_cache.get('a')
+        response_cache.put('c', (b'c', None))
+        assert len(response_cache) == 2
+        assert response_cache.get('b') is None
+        assert response_cache.get('a') == (b'a', None)
+
+    def test_04_max_bytes(self, response_cache):
+        response_cache.put('a', (b'a' * 60, None))
+        response_cache.put('b', (b'b' * 60, None))
+        assert response_cache.get('a') is None
+        assert response_cache.size == 60
+        response_cache.put('c', (b'c' * 101, None))
+        assert response_cache.get('c') is None
+        assert response_cache.get('b')
+
+    @pytest.mark.asyncio
+    async def test_05_ttl(self):
+        response_cache = ResponseCache(ttl=0.01)
+        response_cache.put('a', (b'a', None))
+        await asyncio.sleep(0.02)
+        assert response_cache.get('a') is None
+        assert len(response_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_06_json_template(self):
+        codec = JSONCodec(JSONObject)
+        template = await codec.encode_template({'id': 1, 'result': 'echo'}, 1)
+        assert codec.fill_template(template, 'abc') == b'{"id": "abc", "result": "echo"}'
+        template = await codec.encode_template({'result': 'ok'}, 1)
+        assert codec.fill_template(template, 2) == b'{"result": "ok"}'
+        assert await codec.encode_template({'id': 2, 'result': 'echo'}, 1) is None
+        assert await codec.encode_template(['echo'], 1) is None
+
+    def test_07_yaml(self):
+        load_all_tags()
+        response_cache = yaml.safe_load('!ResponseCache\nmethods: [echo]\nttl: 10\nmax_bytes: 1000')
+        assert response_cache == ResponseCache(methods=['echo'], ttl=10, max_bytes=1000)
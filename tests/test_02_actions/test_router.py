@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+import yaml
+
+from aionetworking.actions import EchoAction, Route, RouterAction
+from aionetworking.conf import load_all_tags
+from aionetworking.utils import filter_from_string
+
+
+class TestRouterAction:
+    @pytest.mark.asyncio
+    async def test_00_route_by_method(self, router_action, json_rpc_request_object):
+        assert await router_action.do_one(json_rpc_request_object('login')) == 'fast'
+        assert await router_action.do_one(json_rpc_request_object('logout')) == 'default'
+        fast, slow, local = router_action.routes
+        assert len(fast.action.msgs) == 1
+        assert len(router_action.default.msgs) == 1
+
+    @pytest.mark.asyncio
+    async def test_01_route_by_peer(self, router_action, json_rpc_request_object):
+        assert await router_action.do_one(json_rpc_request_object('logout', address='127.0.0.1')) == 'local'
+        assert await router_action.do_one(json_rpc_request_object('logout', address='10.0.0.1')) == 'default'
+
+    @pytest.mark.asyncio
+    async def test_02_slow_route_does_not_block(self, router_action, json_rpc_request_object):
+        fast, slow, local = router_action.routes
+        msgs = [json_rpc_request_object('store', id_=i) for i in range(5)]
+        results = await asyncio.wait_for(asyncio.gather(*[router_action.do_one(msg) for msg in msgs]), 0.1)
+        assert results == [None] * 5
+        assert await asyncio.wait_for(router_action.do_one(json_rpc_request_object('login')), 0.1) == 'fast'
+        assert slow.queue_size == 3
+        await router_action.close()
+        assert len(slow.action.msgs) == 5
+        assert slow.action.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_03_on_exception(self, router_action, json_rpc_request_object):
+        msg = json_rpc_request_object('fail')
+        with pytest.raises(ValueError):
+            await router_action.do_one(msg)
+        assert router_action.on_exception(msg, ValueError()) == {'error': 'ValueError', 'result': 'fast'}
+        assert router_action.routes[0].failed == 1
+
+    @pytest.mark.asyncio
+    async def test_04_fan_out(self, router_action, json_rpc_request_object):
+        router_action.fan_out = True
+        assert await router_action.do_one(json_rpc_request_object('login', address='127.0.0.1')) == 'fast'
+        fast, slow, local = router_action.routes
+        assert len(fast.action.msgs) == 1
+        assert len(local.action.msgs) == 1
+
+    @pytest.mark.asyncio
+    async def test_05_route_stats(self, router_action, json_rpc_request_object):
+        for _ in range(3):
+            await router_action.do_one(json_rpc_request_object('login'))
+        stats = router_action.route_stats()
+        assert stats['fast']['processed'] == 3
+        assert stats['fast']['mean_latency'] > 0
+        assert stats['slow'] == {'processed': 0, 'failed': 0, 'queued': 0, 'mean_latency': 0.0, 'p99_latency': 0.0}
+
+    @pytest.mark.asyncio
+    async def test_06_route_when(self, json_rpc_request_object):
+        route = Route(EchoAction(), when=filter_from_string('id > 5'), message_types=['JSON'])
+        assert route.name == 'EchoAction'
+        assert route.matches(json_rpc_request_object('login', id_=6)) is True
+        assert route.matches(json_rpc_request_object('login', id_=5)) is False
+
+    def test_07_yaml(self):
+        load_all_tags()
+        action = yaml.safe_load("""
+!RouterAction
+fan_out: true
+routes:
+  - !Route
+    action: !EchoAction
+    name: echo
+    methods: [echo]
+    peers: [10.0.0.0/8]
+    concurrency: 2
+  - !Route
+    action: !EchoAction
+    when: !Filter method = store
+    respond: false
+default: !EchoAction
+""")
+        assert action == RouterAction(routes=[
+            Route(EchoAction(), name='echo', methods=['echo'], peers=['10.0.0.0/8'], concurrency=2),
+            Route(EchoAction(), when=filter_from_string('method = store'), respond=False)],
+            default=EchoAction(), fan_out=True)
+
+    @pytest.mark.asyncio
+    async def test_08_failing_route_no_response(self, quiet_router_action, json_rpc_request_object):
+        router_action = quiet_router_action
+        route = router_action.routes[0]
+        assert await router_action.do_one(json_rpc_request_object('fail')) is None
+        await asyncio.wait_for(route._queue.join(), 1)
+        route.action.logger = None
+        assert await router_action.do_one(json_rpc_request_object('fail')) is None
+        assert await router_action.do_one(json_rpc_request_object('login')) is None
+        await asyncio.wait_for(router_action.close(), 1)
+        assert route.failed == 2
+        assert len(route.action.msgs) == 1
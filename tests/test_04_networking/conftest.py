@@ -11,14 +11,16 @@ from socket import AddressFamily, SocketKind
 import logging
 from aionetworking import (StreamServerProtocolFactory, StreamClientProtocolFactory, DatagramServerProtocolFactory,
                            DatagramClientProtocolFactory)
-from aionetworking import Logger
+from aionetworking import KeyedExecutor, Logger, WorkQueue
 from aionetworking.actions.file_storage import BufferedFileStorage
 from aionetworking.formats.contrib.json import JSONObject
 from aionetworking.networking import ReceiverAdaptor, SenderAdaptor
-from aionetworking.networking import ConnectionsManager
+from aionetworking.networking import (ConnectionsManager, SharedMemoryRing, SharedMemoryWorkerPool, HostnameResolver,
+                                      AllowedSenders, Deduplicator)
 from aionetworking.networking.connections_manager import clear_unique_names
 from aionetworking.networking import (TCPServerConnection, TCPClientConnection,
-                                      UDPServerConnection, UDPClientConnection)
+                                      UDPServerConnection, UDPClientConnection, BufferedTCPServerConnection,
+                                      BufferedTCPClientConnection)
 from aionetworking.networking.sftp import SFTPClientProtocolFactory, SFTPFactory, SFTPClientProtocol
 from aionetworking.networking.sftp_os_auth import SFTPOSAuthProtocolFactory, SFTPServerOSAuthProtocol
 from aionetworking.networking import ServerSideSSL, ClientSideSSL
@@ -408,6 +410,26 @@ async def connection_connected(connection, transport):
     yield connection
 
 
+@pytest.fixture
+async def buffered_connection(endpoint, action_started, preaction_started, parent_name, peer_prefix,
+                              requester_started, hostname_lookup, receiver_logger) -> BufferedTCPServerConnection:
+    connection_cls = BufferedTCPServerConnection if endpoint == 'server' else BufferedTCPClientConnection
+    conn = connection_cls(dataformat=JSONObject, action=action_started, preaction=preaction_started,
+                          requester=requester_started, parent_name=parent_name, peer_prefix=peer_prefix,
+                          hostname_lookup=hostname_lookup, logger=receiver_logger, timeout=5, read_buffer_size=256)
+    yield conn
+    if conn.transport and not conn.transport.is_closing():
+        conn.transport.close()
+    await asyncio.wait_for(conn.wait_closed(), 1)
+
+
+@pytest.fixture
+async def buffered_connection_connected(buffered_connection, transport):
+    buffered_connection.connection_made(transport)
+    transport.set_protocol(buffered_connection)
+    yield buffered_connection
+
+
 @pytest.fixture
 async def sftp_connection_connected(connection, endpoint, sftp_conn, sftp_factory):
     connection.connection_made(sftp_conn)
@@ -895,3 +917,173 @@ def reset_endpoint_names():
     yield
     clear_unique_names()
 
+
+
+@pytest.fixture
+def shared_memory_ring() -> SharedMemoryRing:
+    ring = SharedMemoryRing(slots=2, slot_size=64)
+    yield ring
+    ring.close()
+
+
+@pytest.fixture
+async def shared_memory_worker_pool(echo_action) -> SharedMemoryWorkerPool:
+    pool = SharedMemoryWorkerPool(num_workers=1, slots=2, slot_size=4096)
+    await pool.start(JSONObject, echo_action)
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture
+async def adaptor_worker_pool(context, echo_action, queue, receiver_logger,
+                              shared_memory_worker_pool) -> ReceiverAdaptor:
+    logger = receiver_logger.get_connection_logger(extra=context)
+    adaptor = ReceiverAdaptor(JSONObject, context=context, action=echo_action, send=queue.put_nowait, logger=logger,
+                              worker_pool=shared_memory_worker_pool)
+    yield adaptor
+    await asyncio.wait_for(adaptor.close(), 3)
+
+
+@pytest.fixture
+def hostname_resolver() -> HostnameResolver:
+    return HostnameResolver(ttl=60, negative_ttl=10, max_size=2, timeout=0.5)
+
+
+@pytest.fixture
+def getnameinfo(hostname_resolver) -> AsyncMock:
+    hostname_resolver._getnameinfo = AsyncMock(return_value='localhost')
+    return hostname_resolver._getnameinfo
+
+
+@pytest.fixture
+def access_log(tmp_path) -> Path:
+    path = tmp_path / 'access.log'
+    path.write_text("2020-01-01 10:20:30.123 INFO Connection opened from 127.0.0.1:60000\n"
+                    "2020-01-01 10:20:31.456 INFO Connection opened from [::1]:60001\n"
+                    "2020-01-01 10:20:32.789 INFO Connection opened from 127.0.0.1:60002 to 10.0.0.1:8888\n"
+                    "2020-01-01 10:20:33.000 INFO Version 1.2.3.4.5 started\n")
+    return path
+
+
+@pytest.fixture
+async def tcp_server_hostname_allowed_senders(echo_action, hostname_resolver,
+                                              receiver_logger) -> Tuple[StreamServerProtocolFactory, int]:
+    factory = StreamServerProtocolFactory(action=echo_action, dataformat=JSONObject, hostname_lookup=True,
+                                          hostname_resolver=hostname_resolver,
+                                          allowed_senders=(IPNetwork('10.10.10.10'), IPNetwork('localhost')))
+    factory.set_name('TCP Server 127.0.0.1:0', 'tcp')
+    await factory.start(logger=receiver_logger)
+    server = await asyncio.get_event_loop().create_server(factory, '127.0.0.1', 0)
+    yield factory, server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+    factory.close_all_connections(None)
+    await factory.close()
+
+
+@pytest.fixture
+async def udp_server_hostname_allowed_senders(echo_action, hostname_resolver,
+                                              receiver_logger) -> Tuple[DatagramServerProtocolFactory, int]:
+    factory = DatagramServerProtocolFactory(action=echo_action, dataformat=JSONObject, hostname_lookup=True,
+                                            hostname_resolver=hostname_resolver,
+                                            allowed_senders=(IPNetwork('10.10.10.10'), IPNetwork('localhost')))
+    factory.set_name('UDP Server 127.0.0.1:0', 'udp')
+    await factory.start(logger=receiver_logger)
+    transport, protocol = await asyncio.get_event_loop().create_datagram_endpoint(factory,
+                                                                                 local_addr=('127.0.0.1', 0))
+    yield factory, transport.get_extra_info('sockname')[1]
+    await factory.close()
+    transport.close()
+
+
+@pytest.fixture
+def allowed_senders_file(tmp_path) -> Path:
+    path = tmp_path / 'allowed_senders.txt'
+    path.write_text("# Internal networks\n"
+                    "10.0.0.0/8\n"
+                    "\n"
+                    "192.168.1.0/24  # office\n"
+                    "2001:db8::/32\n"
+                    "localhost\n")
+    return path
+
+
+@pytest.fixture
+def compiled_allowed_senders(allowed_senders_file) -> AllowedSenders:
+    return AllowedSenders(['127.0.0.1', '10.1.0.0/16'], path=allowed_senders_file, cache_size=2)
+
+
+@pytest.fixture
+async def tcp_server_work_queue(receiver_logger) -> Tuple[StreamServerProtocolFactory, int]:
+    factory = StreamServerProtocolFactory(action=RecordingAction(result={'result': 'ok'}, delay=0.05),
+                                          dataformat=JSONObject,
+                                          work_queue=WorkQueue(workers=2, max_queue_size=2, ordered=True))
+    factory.set_name('TCP Server 127.0.0.1:0', 'tcp')
+    await factory.start(logger=receiver_logger)
+    server = await asyncio.get_event_loop().create_server(factory, '127.0.0.1', 0)
+    yield factory, server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+    factory.close_all_connections(None)
+    await factory.close()
+
+
+@pytest.fixture
+async def tcp_server_keyed_executor(receiver_logger) -> Tuple[StreamServerProtocolFactory, int]:
+    factory = StreamServerProtocolFactory(action=RecordingAction(result={'result': 'ok'}, delay=0.05),
+                                          dataformat=JSONObject,
+                                          work_queue=KeyedExecutor(max_pending_per_key=2))
+    factory.set_name('TCP Server 127.0.0.1:0', 'tcp')
+    await factory.start(logger=receiver_logger)
+    server = await asyncio.get_event_loop().create_server(factory, '127.0.0.1', 0)
+    yield factory, server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+    factory.close_all_connections(None)
+    await factory.close()
+
+
+@pytest.fixture(params=['keyed_executor', 'ordered_work_queue'])
+async def adaptor_full_work_queue(request, context, queue, receiver_logger) -> ReceiverAdaptor:
+    if request.param == 'keyed_executor':
+        work_queue = KeyedExecutor(max_pending_per_key=1, shared=False)
+    else:
+        work_queue = WorkQueue(workers=1, max_queue_size=1, ordered=True, shared=False)
+    logger = receiver_logger.get_connection_logger(extra=context)
+    adaptor = ReceiverAdaptor(JSONObject, context=context, action=RecordingAction(delay=0.01), send=queue.put_nowait,
+                              logger=logger, work_queue=work_queue)
+    yield adaptor
+    await asyncio.wait_for(adaptor.close(), 3)
+
+
+@pytest.fixture
+def deduplicator() -> Deduplicator:
+    return Deduplicator(window=60, buckets=3, max_size=6)
+
+
+@pytest.fixture
+async def tcp_server_deduplicator(receiver_logger) -> Tuple[StreamServerProtocolFactory, int]:
+    factory = StreamServerProtocolFactory(action=RecordingAction(result={'result': 'ok'}), dataformat=JSONObject,
+                                          deduplicator=Deduplicator())
+    factory.set_name('TCP Server 127.0.0.1:0', 'tcp')
+    await factory.start(logger=receiver_logger)
+    server = await asyncio.get_event_loop().create_server(factory, '127.0.0.1', 0)
+    yield factory, server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+    factory.close_all_connections(None)
+    await factory.close()
+
+
+@pytest.fixture
+async def tcp_server_response_cache(receiver_logger) -> Tuple[StreamServerProtocolFactory, int]:
+    factory = StreamServerProtocolFactory(action=EchoAction(response_cache=ResponseCache(methods=['echo'])),
+                                          dataformat=JSONObject)
+    factory.set_name('TCP Server 127.0.0.1:0', 'tcp')
+    await factory.start(logger=receiver_logger)
+    server = await asyncio.get_event_loop().create_server(factory, '127.0.0.1', 0)
+    yield factory, server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+    factory.close_all_connections(None)
+    await factory.close()
@@ -61,3 +61,17 @@ class TestSenderAdaptorOneWay:
         time_taken = await time_coro(coro)
         assert [await asyncio.wait_for(queue.get(), 1), await asyncio.wait_for(queue.get(), 1)] == json_encoded_multi
         assert time_taken > 1.1
+
+    @pytest.mark.asyncio
+    async def test_06_send_data_many(self, adaptor, json_encoded_multi, queue):
+        adaptor.send_many = lambda msgs: queue.put_nowait(b''.join(msgs))
+        adaptor.send_data_many(json_encoded_multi)
+        assert queue.get_nowait() == b''.join(json_encoded_multi)
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_07_encode_and_send_msgs_one_write(self, adaptor, json_decoded_multi, json_encoded_multi, queue):
+        adaptor.send_many = lambda msgs: queue.put_nowait(b''.join(msgs))
+        await asyncio.wait_for(adaptor.encode_and_send_msgs(json_decoded_multi), 1)
+        assert queue.get_nowait() == b''.join(json_encoded_multi)
+        assert queue.empty()
@@ -1,8 +1,10 @@
 import pytest
 import asyncio
+import json
 
 from aionetworking.actions.echo import InvalidRequestError
 from aionetworking.compatibility import create_task, py38
+from aionetworking.logging import SlowMessageSampler
 from aionetworking.networking.exceptions import MethodNotFoundError
 
 
@@ -49,6 +51,29 @@ class TestTwoWayReceiverAdaptor:
         assert task.done()
         assert msg == echo_decode_error_response_encoded
 
+    @pytest.mark.asyncio
+    async def test_04_timing_hooks(self, adaptor, echo_encoded, echo_response_encoded, timestamp, queue, context):
+        sampler = SlowMessageSampler(interval=0)
+        stages = []
+        adaptor.timing_hooks = (sampler, lambda stage, seconds, msg_obj, ctx: stages.append((stage, ctx['peer'])))
+        adaptor.on_data_received(echo_encoded, timestamp)
+        msg = await queue.get()
+        await adaptor.close()
+        assert msg == echo_response_encoded
+        assert sorted(stages) == [(stage, context['peer']) for stage in ('decode', 'do_one', 'encode', 'filter')]
+        slowest = sampler.slowest()
+        assert len(slowest) == 4
+        assert all(sample.peer == context['peer'] for sample in slowest)
+        assert slowest[0].seconds >= slowest[-1].seconds
+
+    @pytest.mark.asyncio
+    async def test_05_work_queue_order_when_full(self, adaptor_full_work_queue, timestamp):
+        buffers = [b''.join(json.dumps({'id': i, 'method': 'login'}).encode() for i in ids)
+                   for ids in (range(1, 5), range(5, 9))]
+        tasks = [adaptor_full_work_queue.on_data_received(buffer, timestamp) for buffer in buffers]
+        await asyncio.wait_for(asyncio.gather(*tasks), 10)
+        assert [msg.decoded['id'] for msg in adaptor_full_work_queue.action.msgs] == list(range(1, 9))
+
 
 @pytest.mark.connections('all_twoway_client')
 class TestSenderAdaptorTwoWay:
@@ -143,3 +168,59 @@ class TestSenderAdaptorTwoWay:
     async def test_10_no_method(self, adaptor):
         with pytest.raises(MethodNotFoundError):
             adaptor.ech()
+
+    @pytest.mark.asyncio
+    async def test_11_send_data_and_wait_timeout(self, adaptor, echo_encoded, echo_response_encoded, timestamp,
+                                                 queue):
+        with pytest.raises(asyncio.TimeoutError):
+            await adaptor.send_data_and_wait(1, echo_encoded, timeout=0.1)
+        assert not adaptor._scheduler._futures
+        await adaptor.on_data_received(echo_response_encoded, timestamp=timestamp)
+        assert adaptor._notification_queue.empty()
+
+    @staticmethod
+    async def respond_in_reverse(adaptor, queue, timestamp, batch_size: int, num: int):
+        in_flight = []
+        for _ in range(num // batch_size):
+            batch = [json.loads(await queue.get()) for _ in range(batch_size)]
+            in_flight.append(len(adaptor._scheduler._futures))
+            for request in reversed(batch):
+                response = json.dumps({'id': request['id'], 'result': 'echo'}).encode()
+                await adaptor.on_data_received(response, timestamp=timestamp)
+        return in_flight
+
+    @pytest.mark.asyncio
+    async def test_12_pipeline_ordered(self, adaptor, timestamp, queue):
+        requests = [{'id': i, 'method': 'echo'} for i in range(1, 7)]
+        responder = create_task(self.respond_in_reverse(adaptor, queue, timestamp, 2, 6))
+        responses = [msg async for msg in adaptor.pipeline(requests, window=2)]
+        assert [msg.request_id for msg in responses] == [1, 2, 3, 4, 5, 6]
+        assert await responder == [2, 2, 2]
+        assert not adaptor._scheduler._futures
+
+    @pytest.mark.asyncio
+    async def test_13_pipeline_unordered(self, adaptor, timestamp, queue):
+        requests = [{'id': i, 'method': 'echo'} for i in range(1, 5)]
+        responder = create_task(self.respond_in_reverse(adaptor, queue, timestamp, 2, 4))
+        responses = [msg async for msg in adaptor.pipeline(requests, window=2, ordered=False)]
+        assert [msg.request_id for msg in responses] == [2, 1, 4, 3]
+        await responder
+
+    @pytest.mark.asyncio
+    async def test_14_pipeline_timeout(self, adaptor, queue):
+        requests = [{'id': i, 'method': 'echo'} for i in range(1, 3)]
+        responses = [msg async for msg in adaptor.pipeline(requests, timeout=0.1, return_exceptions=True)]
+        assert all(isinstance(response, asyncio.TimeoutError) for response in responses)
+        assert not adaptor._scheduler._futures
+
+    @pytest.mark.asyncio
+    async def test_15_expired_requests_bounded(self, adaptor, echo_encoded):
+        adaptor.max_expired_requests = 2
+        for request_id in range(1, 4):
+            with pytest.raises(asyncio.TimeoutError):
+                await adaptor.send_data_and_wait(request_id, echo_encoded, timeout=0.01)
+        assert list(adaptor._expired_requests) == [2, 3]
+        adaptor._expired_requests[2] = adaptor._expired_requests[3] = 0
+        with pytest.raises(asyncio.TimeoutError):
+            await adaptor.send_data_and_wait(4, echo_encoded, timeout=0.01)
+        assert list(adaptor._expired_requests) == [4]
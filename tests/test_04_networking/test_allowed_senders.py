@@ -0,0 +1,137 @@
+import asyncio
+import pickle
+import pytest
+import yaml
+from ipaddress import IPv4Address, IPv6Address
+
+from aionetworking.conf import load_all_tags
+from aionetworking.networking import AllowedSenders, PrefixTrie, StreamServerProtocolFactory
+from aionetworking.utils import IPNetwork
+
+
+class TestPrefixTrie:
+    def test_00_contains(self):
+        trie = PrefixTrie(32)
+        trie.add(int(IPv4Address('10.1.0.0')), 16)
+        trie.add(int(IPv4Address('192.168.1.5')), 32)
+        assert int(IPv4Address('10.1.200.3')) in trie
+        assert int(IPv4Address('192.168.1.5')) in trie
+        assert int(IPv4Address('10.2.0.1')) not in trie
+        assert int(IPv4Address('192.168.1.4')) not in trie
+
+    def test_01_covered_prefix_not_stored(self):
+        trie = PrefixTrie(32)
+        trie.add(int(IPv4Address('10.0.0.0')), 8)
+        trie.add(int(IPv4Address('10.1.0.0')), 16)
+        assert len(trie) == 1
+        trie = PrefixTrie(32)
+        trie.add(int(IPv4Address('10.1.0.0')), 16)
+        trie.add(int(IPv4Address('10.0.0.0')), 8)
+        assert int(IPv4Address('10.200.0.1')) in trie
+        assert len(trie) == 1
+
+    def test_02_ipv6(self):
+        trie = PrefixTrie(128)
+        trie.add(int(IPv6Address('2001:db8::')), 32)
+        assert int(IPv6Address('2001:db8:1::1')) in trie
+        assert int(IPv6Address('2001:db9::1')) not in trie
+
+    def test_03_all(self):
+        trie = PrefixTrie(32)
+        trie.add(0, 0)
+        assert int(IPv4Address('8.8.8.8')) in trie
+
+    @pytest.mark.parametrize('reverse', [False, True])
+    def test_04_len_covering_prefix(self, reverse):
+        networks = [('10.1.0.0', 16), ('10.2.3.0', 24), ('10.0.0.0', 8), ('192.168.0.0', 16), ('10.0.0.0', 8)]
+        trie = PrefixTrie(32)
+        for network, prefixlen in reversed(networks) if reverse else networks:
+            trie.add(int(IPv4Address(network)), prefixlen)
+        assert len(trie) == 2
+
+
+class TestAllowedSenders:
+    def test_00_is_allowed(self, compiled_allowed_senders):
+        assert compiled_allowed_senders.is_allowed('127.0.0.1') is True
+        assert compiled_allowed_senders.is_allowed('10.1.2.3') is True
+        assert compiled_allowed_senders.is_allowed('192.168.1.200') is True
+        assert compiled_allowed_senders.is_allowed('2001:db8::1') is True
+        assert compiled_allowed_senders.is_allowed('127.0.0.2') is False
+        assert compiled_allowed_senders.is_allowed('::1') is False
+
+    def test_01_hostname(self, compiled_allowed_senders):
+        assert compiled_allowed_senders.has_hostnames
+        assert compiled_allowed_senders.is_allowed('127.0.0.2', 'localhost') is True
+        assert compiled_allowed_senders.is_allowed('127.0.0.2', 'otherhost') is False
+
+    def test_02_verdict_cache(self, compiled_allowed_senders):
+        compiled_allowed_senders.is_allowed('10.1.2.3')
+        compiled_allowed_senders.is_allowed('127.0.0.2')
+        compiled_allowed_senders.is_allowed('127.0.0.1')
+        assert list(compiled_allowed_senders._verdicts) == [('127.0.0.2', None), ('127.0.0.1', None)]
+
+    def test_03_compiled_matches_supernet_of(self):
+        networks = [IPNetwork('10.0.0.0/8'), IPNetwork('127.0.0.1'), IPNetwork('::1'), IPNetwork('localhost')]
+        allowed_senders = AllowedSenders(networks)
+        assert len(allowed_senders) == 4
+        assert list(allowed_senders) == networks
+        assert allowed_senders.is_allowed('::1') is True
+        assert allowed_senders.is_allowed('10.255.255.255') is True
+        assert allowed_senders.is_allowed('11.0.0.0') is False
+        assert not AllowedSenders()
+
+    @pytest.mark.asyncio
+    async def test_04_reload(self, compiled_allowed_senders, allowed_senders_file):
+        assert compiled_allowed_senders.is_allowed('192.168.2.1') is False
+        allowed_senders_file.write_text('192.168.2.0/24\n')
+        assert await compiled_allowed_senders.reload() is True
+        assert compiled_allowed_senders.is_allowed('192.168.2.1') is True
+        assert compiled_allowed_senders.is_allowed('192.168.1.1') is False
+        assert compiled_allowed_senders.is_allowed('127.0.0.1') is True
+        assert not compiled_allowed_senders.has_hostnames
+
+    @pytest.mark.asyncio
+    async def test_05_reload_invalid_file_keeps_list(self, compiled_allowed_senders, allowed_senders_file):
+        allowed_senders_file.write_text('10.0.0.1/8\n')
+        assert await compiled_allowed_senders.reload() is False
+        assert compiled_allowed_senders.is_allowed('10.2.3.4') is True
+
+    @pytest.mark.asyncio
+    async def test_06_reload_when_file_changes(self, compiled_allowed_senders, allowed_senders_file):
+        compiled_allowed_senders.reload_interval = 0.01
+        compiled_allowed_senders.start()
+        compiled_allowed_senders._mtime = None
+        allowed_senders_file.write_text('172.16.0.0/12\n')
+        await asyncio.sleep(0.1)
+        assert compiled_allowed_senders.is_allowed('172.16.5.5') is True
+        await compiled_allowed_senders.close()
+
+    def test_07_pickle(self, compiled_allowed_senders):
+        allowed_senders = pickle.loads(pickle.dumps(compiled_allowed_senders))
+        assert allowed_senders == compiled_allowed_senders
+        assert allowed_senders.is_allowed('192.168.1.1') is True
+
+    def test_08_yaml(self, allowed_senders_file):
+        load_all_tags()
+        allowed_senders = yaml.safe_load('!AllowedSenders [127.0.0.1, "::1"]')
+        assert allowed_senders == AllowedSenders([IPNetwork('127.0.0.1'), IPNetwork('::1')])
+        allowed_senders = yaml.safe_load(f'!AllowedSenders\npath: {allowed_senders_file}\nreload_interval: 30')
+        assert allowed_senders == AllowedSenders(path=allowed_senders_file, reload_interval=30)
+        assert allowed_senders.is_allowed('10.0.0.1') is True
+
+    @pytest.mark.asyncio
+    async def test_09_protocol_factory_reload(self, echo_action, allowed_senders_file, receiver_logger):
+        factory = StreamServerProtocolFactory(action=echo_action, allowed_senders=AllowedSenders(
+            path=allowed_senders_file))
+        factory.set_name('TCP Server 127.0.0.1:0', 'tcp')
+        await factory.start(logger=receiver_logger)
+        allowed_senders = factory.allowed_senders
+        allowed_senders_file.write_text('172.16.0.0/12\n')
+        new = StreamServerProtocolFactory(action=echo_action, allowed_senders=AllowedSenders(path=allowed_senders_file))
+        assert await factory.reload(new) == set()
+        assert factory.allowed_senders is allowed_senders
+        assert allowed_senders.is_allowed('172.16.0.1') is True
+        new = StreamServerProtocolFactory(action=echo_action, allowed_senders=[IPNetwork('127.0.0.1')])
+        assert await factory.reload(new) == {'allowed_senders'}
+        assert factory.allowed_senders.is_allowed('172.16.0.1') is False
+        await factory.close()
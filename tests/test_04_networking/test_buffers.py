@@ -0,0 +1,37 @@
+from aionetworking.networking.buffers import ReadBufferPool
+
+
+class TestReadBufferPool:
+    def test_00_read_into_buffer(self):
+        pool = ReadBufferPool(16)
+        view = pool.get_buffer(-1)
+        assert len(view) == 16
+        view[:5] = b'hello'
+        data, buf = pool.buffer_updated(5)
+        assert bytes(data) == b'hello'
+        assert len(pool.get_buffer(-1)) == 11
+
+    def test_01_rewind_when_released(self):
+        pool = ReadBufferPool(16)
+        pool.get_buffer(-1)[:5] = b'hello'
+        data, buf = pool.buffer_updated(5)
+        pool.release(buf)
+        assert len(pool.get_buffer(-1)) == 16
+        assert pool.num_allocated == 1
+
+    def test_02_rotate_when_leased(self):
+        pool = ReadBufferPool(16)
+        pool.get_buffer(-1)[:14] = b'hello world!!!'
+        data, buf = pool.buffer_updated(14)
+        view = pool.get_buffer(-1)
+        assert len(view) == 16
+        assert pool.num_allocated == 2
+        assert bytes(data) == b'hello world!!!'
+        view[:3] = b'abc'
+        data2, buf2 = pool.buffer_updated(3)
+        pool.release(buf)
+        pool.release(buf2)
+        assert len(pool.get_buffer(-1)) == 16
+        pool.buffer_updated(14)
+        pool.get_buffer(-1)
+        assert pool.num_allocated == 2
@@ -18,6 +18,8 @@ class TestConnectionShared:
         connection.connection_made(transport)
         transport.set_protocol(connection)
         await connection.wait_connected()
+        if connection._hostname_task:
+            await connection._hostname_task
         assert connection.is_connected()
         assert not transport.is_closing()
         assert connection._adaptor.context == adaptor.context
@@ -91,6 +93,12 @@ class TestConnectionTwoWayServer:
         assert receiver == peer
         assert msg == echo_notification_server_encoded
 
+    def test_02_close_connection_not_shared(self, connection_connected, connection_type):
+        if connection_type == 'udp':
+            assert connection_connected._adaptor.close_connection is None
+        else:
+            assert connection_connected._adaptor.close_connection == connection_connected.close
+
 
 @pytest.mark.connections('all_twoway_client')
 class TestConnectionTwoWayClient:
@@ -141,6 +149,48 @@ class TestConnectionTwoWayClient:
             connection_connected.ech()
 
 
+def feed_buffered(connection, data: bytes) -> None:
+    buffer = connection.get_buffer(-1)
+    buffer[:len(data)] = data
+    connection.buffer_updated(len(data))
+
+
+@pytest.mark.connections('tcp_twoway_server')
+class TestBufferedConnectionTwoWayServer:
+    @pytest.mark.asyncio
+    async def test_00_buffer_updated(self, buffered_connection_connected, echo_encoded, echo_response_encoded,
+                                     fixed_timestamp, queue, peer):
+        feed_buffered(buffered_connection_connected, echo_encoded)
+        receiver, msg = await asyncio.wait_for(queue.get(), timeout=1)
+        assert receiver == peer
+        assert msg == echo_response_encoded
+        assert buffered_connection_connected._read_buffers.num_allocated == 1
+
+    @pytest.mark.asyncio
+    async def test_01_buffer_reused(self, buffered_connection_connected, echo_encoded, echo_response_encoded,
+                                    fixed_timestamp, queue):
+        for _ in range(10):
+            feed_buffered(buffered_connection_connected, echo_encoded)
+            receiver, msg = await asyncio.wait_for(queue.get(), timeout=1)
+            assert msg == echo_response_encoded
+        await buffered_connection_connected.wait_current_tasks()
+        assert buffered_connection_connected._read_buffers.num_allocated == 1
+
+
+@pytest.mark.connections('tcp_twoway_client')
+class TestBufferedConnectionTwoWayClient:
+    @pytest.mark.asyncio
+    async def test_00_send_data_and_wait(self, buffered_connection_connected, echo_encoded, echo_response_encoded,
+                                         echo_response_object, queue):
+        task = create_task(buffered_connection_connected.send_data_and_wait(1, echo_encoded))
+        receiver, msg = await asyncio.wait_for(queue.get(), timeout=1)
+        assert msg == echo_encoded
+        feed_buffered(buffered_connection_connected, echo_response_encoded)
+        result = await asyncio.wait_for(task, timeout=1)
+        assert result == echo_response_object
+        assert isinstance(result.encoded, bytes)
+
+
 class TestConnectionAllowedSenders:
     @pytest.mark.asyncio
     async def test_00_sender_valid_ok(self, connection_allowed_senders, allowed_sender):
@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import json
+import pytest
+import yaml
+
+from aionetworking.conf import load_all_tags
+from aionetworking.formats.contrib.json import JSONObject
+from aionetworking.networking import Deduplicator
+
+
+def json_msg(decoded: dict, address: str = '127.0.0.1') -> JSONObject:
+    return JSONObject(json.dumps(decoded).encode(), decoded, context={'address': address})
+
+
+class TestDeduplicator:
+    def test_00_uid(self, deduplicator):
+        assert not deduplicator.is_duplicate(json_msg({'id': 1, 'method': 'login'}))
+        assert deduplicator.is_duplicate(json_msg({'id': 1, 'method': 'logout'}))
+        assert not deduplicator.is_duplicate(json_msg({'id': 2, 'method': 'login'}))
+        assert deduplicator.duplicates == 1
+
+    def test_01_per_sender(self, deduplicator):
+        assert not deduplicator.is_duplicate(json_msg({'id': 1}, '10.0.0.1'))
+        assert not deduplicator.is_duplicate(json_msg({'id': 1}, '10.0.0.2'))
+        deduplicator.per_sender = False
+        deduplicator.clear()
+        assert not deduplicator.is_duplicate(json_msg({'id': 1}, '10.0.0.1'))
+        assert deduplicator.is_duplicate(json_msg({'id': 1}, '10.0.0.2'))
+
+    def test_02_no_id_never_duplicate(self, deduplicator):
+        assert not deduplicator.is_duplicate(json_msg({'method': 'subscribe'}))
+        assert not deduplicator.is_duplicate(json_msg({'method': 'subscribe'}))
+        assert deduplicator.size == 0
+
+    @pytest.mark.parametrize('hash_name', ['blake2b', 'sha1'])
+    def test_03_encoded(self, hash_name):
+        deduplicator = Deduplicator(key='encoded', hash_name=hash_name)
+        assert not deduplicator.is_duplicate(json_msg({'id': 1, 'method': 'login'}))
+        assert not deduplicator.is_duplicate(json_msg({'id': 1, 'method': 'logout'}))
+        assert deduplicator.is_duplicate(json_msg({'id': 1, 'method': 'login'}))
+
+    def test_04_invalid(self):
+        with pytest.raises(ValueError):
+            Deduplicator(key='method')
+        with pytest.raises(ValueError):
+            Deduplicator(key='encoded', hash_name='nohash')
+
+    def test_05_max_size(self, deduplicator):
+        for i in range(7):
+            assert not deduplicator.is_duplicate(json_msg({'id': i}))
+        assert deduplicator.size <= 6
+        assert json_msg({'id': 0}) not in deduplicator
+        assert json_msg({'id': 6}) in deduplicator
+
+    def test_06_window_expired(self, deduplicator):
+        msg = json_msg({'id': 1})
+        assert not deduplicator.is_duplicate(msg)
+        deduplicator._rotate_at -= deduplicator.window
+        assert msg not in deduplicator
+        assert not deduplicator.is_duplicate(msg)
+        assert deduplicator.is_duplicate(msg)
+
+    def test_07_discard(self, deduplicator):
+        msg = json_msg({'id': 1})
+        deduplicator.is_duplicate(msg)
+        deduplicator.discard(msg)
+        assert not deduplicator.is_duplicate(msg)
+
+    def test_08_response(self, deduplicator):
+        msg = json_msg({'id': 1})
+        deduplicator.is_duplicate(msg)
+        assert deduplicator.get_response(msg) is None
+        deduplicator.set_response(msg, b'{"result": "ok"}')
+        assert deduplicator.get_response(json_msg({'id': 1})) == b'{"result": "ok"}'
+        deduplicator.discard(msg)
+        assert deduplicator.get_response(msg) is None
+        deduplicator.set_response(msg, b'{"result": "ok"}')
+        assert msg not in deduplicator
+
+    def test_09_yaml(self):
+        load_all_tags()
+        deduplicator = yaml.safe_load('!Deduplicator\nkey: encoded\nhash_name: md5\nwindow: 30')
+        assert deduplicator == Deduplicator(key='encoded', hash_name='md5', window=30)
+
+    def test_10_encoded_default_digest(self):
+        deduplicator = Deduplicator(key='encoded')
+        msg = json_msg({'id': 1, 'method': 'login'})
+        assert deduplicator.get_key(msg) == ('127.0.0.1', hashlib.blake2b(msg.encoded).digest())
+
+
+class TestDeduplicatorConnection:
+    @pytest.mark.asyncio
+    async def test_00_duplicates_dropped(self, tcp_server_deduplicator):
+        factory, port = tcp_server_deduplicator
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        login = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'login'}).encode()
+        writer.write(login)
+        assert json.loads(await asyncio.wait_for(reader.readuntil(b'}'), 2)) == {'result': 'ok'}
+        writer.write(login + json.dumps({'jsonrpc': '2.0', 'id': 2, 'method': 'logout'}).encode())
+        for _ in range(2):
+            assert json.loads(await asyncio.wait_for(reader.readuntil(b'}'), 2)) == {'result': 'ok'}
+        assert [msg.decoded['id'] for msg in factory.action.msgs] == [1, 2]
+        assert factory.deduplicator.duplicates == 1
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_01_failed_msg_retried(self, tcp_server_deduplicator):
+        factory, port = tcp_server_deduplicator
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        fail = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'fail'}).encode()
+        for _ in range(2):
+            writer.write(fail)
+            assert json.loads(await asyncio.wait_for(reader.read(1024), 2))['error'] == 'ValueError'
+        assert factory.deduplicator.duplicates == 0
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_02_duplicate_gets_original_response(self, tcp_server_deduplicator):
+        factory, port = tcp_server_deduplicator
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        login = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'login'}).encode()
+        writer.write(login)
+        response = await asyncio.wait_for(reader.readuntil(b'}'), 2)
+        writer.write(login)
+        assert await asyncio.wait_for(reader.readuntil(b'}'), 2) == response
+        assert [msg.decoded['id'] for msg in factory.action.msgs] == [1]
+        assert factory.deduplicator.duplicates == 1
+        writer.close()
@@ -0,0 +1,150 @@
+import asyncio
+import pytest
+import socket
+import yaml
+
+from aionetworking.conf import load_all_tags
+from aionetworking.networking import HostnameResolver
+from aionetworking.networking.dns import addresses_in_text
+from tests.mock import QueueDatagramProtocol
+
+
+class TestHostnameResolver:
+    @pytest.mark.asyncio
+    async def test_00_resolve_cached(self, hostname_resolver, getnameinfo):
+        assert hostname_resolver.get_cached('127.0.0.1') is None
+        assert await hostname_resolver.resolve('127.0.0.1') == 'localhost'
+        assert await hostname_resolver.resolve('127.0.0.1') == 'localhost'
+        assert hostname_resolver.get_cached('127.0.0.1') == 'localhost'
+        getnameinfo.assert_awaited_once_with('127.0.0.1')
+
+    @pytest.mark.asyncio
+    async def test_01_negative_cache(self, hostname_resolver, getnameinfo):
+        getnameinfo.side_effect = socket.gaierror
+        assert await hostname_resolver.resolve('10.0.0.1') == '10.0.0.1'
+        assert await hostname_resolver.resolve('10.0.0.1') == '10.0.0.1'
+        getnameinfo.assert_awaited_once_with('10.0.0.1')
+
+    @pytest.mark.asyncio
+    async def test_02_ttl_expired(self, hostname_resolver, getnameinfo):
+        hostname_resolver.ttl = 0
+        await hostname_resolver.resolve('127.0.0.1')
+        assert hostname_resolver.get_cached('127.0.0.1') is None
+        await hostname_resolver.resolve('127.0.0.1')
+        assert getnameinfo.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_03_concurrent_lookups_shared(self, hostname_resolver):
+        calls = []
+
+        async def getnameinfo(address: str) -> str:
+            calls.append(address)
+            await asyncio.sleep(0.05)
+            return 'localhost'
+
+        hostname_resolver._getnameinfo = getnameinfo
+        hosts = await asyncio.gather(*[hostname_resolver.resolve('127.0.0.1') for _ in range(5)])
+        assert hosts == ['localhost'] * 5
+        assert calls == ['127.0.0.1']
+
+    @pytest.mark.asyncio
+    async def test_04_timeout(self, hostname_resolver):
+        async def getnameinfo(address: str) -> str:
+            await asyncio.sleep(5)
+
+        hostname_resolver._getnameinfo = getnameinfo
+        hostname_resolver.timeout = 0.01
+        assert await asyncio.wait_for(hostname_resolver.resolve('10.0.0.1'), 1) == '10.0.0.1'
+        assert hostname_resolver.get_cached('10.0.0.1') == '10.0.0.1'
+
+    @pytest.mark.asyncio
+    async def test_05_max_size(self, hostname_resolver, getnameinfo):
+        await hostname_resolver.prefetch(['10.0.0.1', '10.0.0.2'])
+        hostname_resolver.get_cached('10.0.0.1')
+        await hostname_resolver.resolve('10.0.0.3')
+        assert hostname_resolver.cache_size == 2
+        assert hostname_resolver.get_cached('10.0.0.1') == 'localhost'
+        assert hostname_resolver.get_cached('10.0.0.2') is None
+
+    def test_06_addresses_in_text(self, access_log):
+        assert addresses_in_text(access_log.read_text()) == {'127.0.0.1', '::1', '10.0.0.1'}
+
+    @pytest.mark.asyncio
+    async def test_07_prefetch_from_log(self, hostname_resolver, getnameinfo, access_log):
+        hostname_resolver.max_size = 10
+        assert await hostname_resolver.prefetch_from_log(access_log) == 3
+        assert getnameinfo.await_count == 3
+        assert hostname_resolver.get_cached('::1') == 'localhost'
+
+    @pytest.mark.asyncio
+    async def test_08_start_prefetch_logs(self, hostname_resolver, getnameinfo, access_log, tmp_path):
+        hostname_resolver.max_size = 10
+        hostname_resolver.prefetch_logs = (tmp_path / 'missing.log', access_log)
+        hostname_resolver.start()
+        await hostname_resolver._prefetch_task
+        assert hostname_resolver.cache_size == 3
+        await hostname_resolver.close()
+
+    def test_09_yaml(self):
+        load_all_tags()
+        resolver = yaml.safe_load('!HostnameResolver\nttl: 600\nnegative_ttl: 30\nprefetch_logs:\n  - /tmp/a.log')
+        assert resolver == HostnameResolver(ttl=600, negative_ttl=30, prefetch_logs=['/tmp/a.log'])
+
+
+class TestHostnameLookupConnection:
+    @pytest.mark.asyncio
+    async def test_00_lookup_does_not_block(self, tcp_server_hostname_allowed_senders, hostname_resolver,
+                                            echo_encoded, echo_response_encoded):
+        factory, port = tcp_server_hostname_allowed_senders
+        lookup_done = asyncio.Event()
+
+        async def getnameinfo(address: str) -> str:
+            await lookup_done.wait()
+            return 'localhost'
+
+        hostname_resolver._getnameinfo = getnameinfo
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(echo_encoded)
+        await asyncio.sleep(0.1)
+        assert factory.num_connections == 0
+        lookup_done.set()
+        response = await asyncio.wait_for(reader.read(1024), 5)
+        assert response == echo_response_encoded
+        assert factory.num_connections == 1
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_01_sender_not_allowed_after_lookup(self, tcp_server_hostname_allowed_senders, hostname_resolver,
+                                                      getnameinfo, echo_encoded):
+        factory, port = tcp_server_hostname_allowed_senders
+        getnameinfo.return_value = 'otherhost'
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(echo_encoded)
+        with pytest.raises(ConnectionResetError):
+            await asyncio.wait_for(reader.read(1024), 5)
+        assert factory.num_connections == 0
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_02_datagram_rejected_until_lookup(self, udp_server_hostname_allowed_senders, hostname_resolver,
+                                                     echo_encoded, echo_response_encoded):
+        factory, port = udp_server_hostname_allowed_senders
+        lookup_done = asyncio.Event()
+
+        async def getnameinfo(address: str) -> str:
+            await lookup_done.wait()
+            return 'localhost'
+
+        hostname_resolver._getnameinfo = getnameinfo
+        transport, protocol = await asyncio.get_event_loop().create_datagram_endpoint(
+            QueueDatagramProtocol, remote_addr=('127.0.0.1', port))
+        transport.sendto(echo_encoded)
+        await asyncio.sleep(0.1)
+        assert factory.num_connections == 0
+        lookup_done.set()
+        await hostname_resolver.resolve('127.0.0.1')
+        transport.sendto(echo_encoded)
+        assert await asyncio.wait_for(protocol.queue.get(), 5) == echo_response_encoded
+        assert factory.num_connections == 1
+        assert protocol.queue.empty()
+        transport.close()
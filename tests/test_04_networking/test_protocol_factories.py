@@ -2,7 +2,8 @@ import asyncio
 import datetime
 import pytest
 import pickle
-from aionetworking.compatibility import create_task
+import json
+from aionetworking.compatibility import create_task, supports_buffered_protocol
 from aionetworking.compatibility_os import is_mac_os
 
 
@@ -74,6 +75,34 @@ class TestStreamProtocolFactories:
         assert new_connection.is_closing()
         await protocol_factory_expire_connections.wait_all_closed()
 
+    @pytest.mark.connections('tcp_twoway_all')
+    @pytest.mark.asyncio
+    async def test_03_buffered_read(self, protocol_factory_started, transport):
+        protocol_factory_started.buffered_read = True
+        protocol_factory_started.read_buffer_size = 1024
+        new_connection = protocol_factory_started()
+        assert isinstance(new_connection, protocol_factory_started.buffered_connection_cls)
+        assert isinstance(new_connection, asyncio.BufferedProtocol)
+        assert new_connection.read_buffer_size == 1024
+        new_connection.connection_made(transport)
+        new_connection.transport.set_protocol(new_connection)
+        await asyncio.wait_for(new_connection.wait_connected(), timeout=1)
+        assert len(new_connection.get_buffer(-1)) == 1024
+        new_connection.transport.close()
+        await asyncio.wait_for(protocol_factory_started.close(), timeout=1)
+        await asyncio.wait_for(new_connection.wait_closed(), timeout=1)
+
+    @pytest.mark.connections('tcp_twoway_all')
+    @pytest.mark.asyncio
+    async def test_04_buffered_read_auto(self, protocol_factory_started):
+        protocol_factory_started.buffered_read = None
+        new_connection = protocol_factory_started()
+        if supports_buffered_protocol():
+            assert isinstance(new_connection, protocol_factory_started.buffered_connection_cls)
+        else:
+            assert isinstance(new_connection, protocol_factory_started.connection_cls)
+        await asyncio.wait_for(protocol_factory_started.close(), timeout=1)
+
 
 @pytest.mark.connections('udp_oneway_server')
 class TestOneWayServerDatagramProtocolFactory:
@@ -219,3 +248,55 @@ class TestTwoWayClientDatagramProtocolFactory:
         await asyncio.wait_for(new_connection.wait_closed(), timeout=1)
         assert connections_manager.total == 0
 
+
+
+class TestWorkQueue:
+    @pytest.mark.asyncio
+    async def test_00_work_queue_limits_concurrency(self, tcp_server_work_queue, connections_manager):
+        factory, port = tcp_server_work_queue
+        msgs = b''.join(json.dumps({'jsonrpc': '2.0', 'id': i, 'method': 'login'}).encode() for i in range(8))
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(msgs)
+        await factory.wait_num_has_connected(1)
+        await asyncio.sleep(0.02)
+        conn = next(conn for conn in connections_manager if factory.is_owner(conn))
+        assert conn._reading_paused is True
+        for _ in range(8):
+            assert json.loads(await asyncio.wait_for(reader.readuntil(b'}'), 2)) == {'result': 'ok'}
+        assert factory.action.max_in_flight == 1
+        assert [msg.decoded['id'] for msg in factory.action.msgs] == list(range(8))
+        assert conn._reading_paused is False
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_01_keyed_executor_ordered_per_peer(self, tcp_server_keyed_executor):
+        factory, port = tcp_server_keyed_executor
+        connections = [await asyncio.open_connection('127.0.0.1', port) for _ in range(2)]
+        for n, (reader, writer) in enumerate(connections):
+            writer.write(b''.join(json.dumps({'jsonrpc': '2.0', 'id': n * 10 + i, 'method': 'login'}).encode()
+                                  for i in range(4)))
+        for reader, writer in connections:
+            for _ in range(4):
+                assert json.loads(await asyncio.wait_for(reader.readuntil(b'}'), 2)) == {'result': 'ok'}
+        ids = [msg.decoded['id'] for msg in factory.action.msgs]
+        assert [i for i in ids if i < 10] == list(range(4))
+        assert [i for i in ids if i >= 10] == list(range(10, 14))
+        assert factory.action.max_in_flight == 2
+        for reader, writer in connections:
+            writer.close()
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_00_cached_response_id_patched(self, tcp_server_response_cache):
+        factory, port = tcp_server_response_cache
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for i in range(3):
+            writer.write(json.dumps({'jsonrpc': '2.0', 'id': i, 'method': 'echo'}).encode())
+            assert json.loads(await asyncio.wait_for(reader.readuntil(b'}'), 2)) == {'id': i, 'result': 'echo'}
+        writer.write(json.dumps({'jsonrpc': '2.0', 'id': 3, 'method': 'send_notification'}).encode())
+        assert json.loads(await asyncio.wait_for(reader.readuntil(b'}'), 2)) == {'result': 'notification'}
+        response_cache = factory.action.response_cache
+        assert (response_cache.hits, response_cache.misses) == (2, 1)
+        assert len(response_cache) == 1
+        writer.close()
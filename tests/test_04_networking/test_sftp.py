@@ -1,8 +1,13 @@
 import asyncio
+import asyncssh
 import pytest
 import pickle
 from pathlib import Path
+from unittest.mock import Mock, call
 from aionetworking.compatibility import py37
+from aionetworking.networking.sftp import StreamingSFTPFactory
+
+from tests.mock import MockSFTPRemoteFile
 
 
 @pytest.mark.connections('sftp_oneway_all')
@@ -57,6 +62,25 @@ class TestConnectionServer:
         await assert_recordings_ok
 
 
+@pytest.mark.connections('sftp_oneway_server')
+class TestStreamingSFTPFactory:
+    def test_00_blocks_reassembled_in_memory(self, sftp_connection_connected, sftp_conn, tmpdir,
+                                             json_rpc_login_request_encoded):
+        upload_dir = Path(tmpdir) / "sftp_received"
+        factory = StreamingSFTPFactory(sftp_conn, base_upload_dir=upload_dir)
+        received = []
+        sftp_connection_connected.data_received = received.append
+        file_obj = factory.open(b'/FILE1', asyncssh.FXF_WRITE | asyncssh.FXF_CREAT | asyncssh.FXF_TRUNC,
+                                asyncssh.SFTPAttrs())
+        half = len(json_rpc_login_request_encoded) // 2
+        factory.write(file_obj, half, json_rpc_login_request_encoded[half:])
+        factory.write(file_obj, 0, json_rpc_login_request_encoded[:half])
+        assert received == []
+        factory.close(file_obj)
+        assert received == [json_rpc_login_request_encoded]
+        assert not [path for path in upload_dir.rglob('*') if path.is_file()]
+
+
 @pytest.mark.connections('sftp_oneway_server')
 class TestConnectionServerOSAuth:
 
@@ -98,6 +122,55 @@ class TestConnectionClient:
                                              remotepath='/')
 
 
+    @pytest.mark.asyncio
+    async def test_02_send_streaming(self, sftp_connection_connected, sftp_factory, fixed_timestamp,
+                                     json_rpc_login_request_encoded, tmpdir):
+        remote_file = MockSFTPRemoteFile()
+        sftp_factory.open = Mock(return_value=remote_file)
+        sftp_connection_connected.streaming = True
+        await sftp_connection_connected.send(json_rpc_login_request_encoded)
+        sftp_factory.open.assert_called_with('/FILE201901010101000000000000', 'wb', block_size=16384,
+                                             max_requests=128)
+        assert remote_file.writes == [(json_rpc_login_request_encoded, 0)]
+        sftp_factory.put.assert_not_awaited()
+        assert not list((Path(tmpdir) / "sftp_sent").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_03_send_batch(self, sftp_connection_connected, sftp_factory, fixed_timestamp,
+                                 json_rpc_login_request_encoded, json_rpc_logout_request_encoded):
+        remote_file = MockSFTPRemoteFile()
+        sftp_factory.open = Mock(return_value=remote_file)
+        sftp_connection_connected.streaming = True
+        sftp_connection_connected.batching = True
+        sftp_connection_connected.batch_max_msgs = 2
+        logger = sftp_connection_connected._adaptor.logger
+        logger.on_batch_sent = Mock()
+        fut1 = sftp_connection_connected.send(json_rpc_login_request_encoded)
+        fut2 = sftp_connection_connected.send(json_rpc_logout_request_encoded)
+        fut3 = sftp_connection_connected.send(json_rpc_login_request_encoded)
+        assert fut1 is fut2
+        assert fut3 is not fut1
+        await fut1
+        assert remote_file.writes == [(json_rpc_login_request_encoded + json_rpc_logout_request_encoded, 0)]
+        await sftp_connection_connected.wait_tasks_done()
+        assert remote_file.writes[1] == (json_rpc_login_request_encoded, 0)
+        sftp_factory.open.assert_called_with('/FILE201901010101000000000001', 'wb', block_size=16384,
+                                             max_requests=128)
+        assert logger.on_batch_sent.call_args_list == [
+            call(2, len(json_rpc_login_request_encoded + json_rpc_logout_request_encoded)),
+            call(1, len(json_rpc_login_request_encoded))]
+
+    @pytest.mark.asyncio
+    async def test_04_send_batch_interval(self, sftp_connection_connected, sftp_factory,
+                                          json_rpc_login_request_encoded, json_rpc_logout_request_encoded):
+        sftp_connection_connected.batching = True
+        sftp_connection_connected.batch_interval = 0.01
+        sftp_connection_connected.send(json_rpc_login_request_encoded)
+        fut = sftp_connection_connected.send(json_rpc_logout_request_encoded)
+        await asyncio.wait_for(fut, timeout=1)
+        sftp_factory.put.assert_awaited_once()
+
+
 @pytest.mark.connections('sftp_oneway_all')
 class TestSFTPProtocolFactories:
 
@@ -0,0 +1,108 @@
+import pytest
+import asyncio
+
+from aionetworking.logging import Logger, MetricsRegistry
+from aionetworking.networking.shared_memory import supports_shared_memory
+
+
+pytestmark = pytest.mark.skipif(not supports_shared_memory(), reason='Shared memory requires python 3.8 or later')
+
+
+class TestSharedMemoryRing:
+    def test_00_write_read(self, shared_memory_ring):
+        shared_memory_ring.write(0, b'hello')
+        shared_memory_ring.write(1, b'world!')
+        view = shared_memory_ring.read(0)
+        assert bytes(view) == b'hello'
+        view.release()
+        view = shared_memory_ring.read(1)
+        assert bytes(view) == b'world!'
+        view.release()
+
+    def test_01_buffer_too_large(self, shared_memory_ring):
+        with pytest.raises(ValueError):
+            shared_memory_ring.write(0, b'a' * shared_memory_ring.slot_size)
+
+    def test_02_attach_by_name(self, shared_memory_ring):
+        shared_memory_ring.write(1, b'shared')
+        ring = type(shared_memory_ring)(shared_memory_ring.slots, shared_memory_ring.slot_size,
+                                        name=shared_memory_ring.name)
+        view = ring.read(1)
+        assert bytes(view) == b'shared'
+        view.release()
+        ring.close()
+
+
+@pytest.mark.connections('tcp_twoway_server')
+class TestSharedMemoryWorkerPool:
+    @pytest.mark.asyncio
+    async def test_00_submit(self, shared_memory_worker_pool, context, echo_encoded, echo_exception_request_encoded):
+        results = await asyncio.gather(*[shared_memory_worker_pool.submit(echo_encoded, context) for _ in range(5)])
+        assert [(result.responses, result.failed) for result in results] == [([{'id': 1, 'result': 'echo'}], [])] * 5
+        result = await shared_memory_worker_pool.submit(echo_exception_request_encoded, context)
+        assert result.responses == [{'id': 1, 'error': 'InvalidRequestError'}]
+        assert [(encoded, error.split(':')[0]) for encoded, decoded, error in result.failed] == [
+            (echo_exception_request_encoded, 'InvalidRequestError')]
+        assert shared_memory_worker_pool._free_slots.qsize() == shared_memory_worker_pool.slots
+
+    @pytest.mark.asyncio
+    async def test_01_adaptor(self, adaptor_worker_pool, echo_encoded, echo_response_encoded, timestamp, queue):
+        task = adaptor_worker_pool.on_data_received(echo_encoded, timestamp)
+        msg = await asyncio.wait_for(queue.get(), 10)
+        await task
+        assert msg == echo_response_encoded
+
+    @pytest.mark.asyncio
+    async def test_02_failed_msg_does_not_fail_buffer(self, shared_memory_worker_pool, context, echo_encoded,
+                                                      echo_exception_request_encoded):
+        buffer = echo_exception_request_encoded + echo_encoded
+        result = await shared_memory_worker_pool.submit(buffer, context)
+        assert result.responses == [{'id': 1, 'error': 'InvalidRequestError'}, {'id': 1, 'result': 'echo'}]
+        assert len(result.failed) == 1
+
+    @pytest.mark.asyncio
+    async def test_03_full_size_buffer(self, shared_memory_worker_pool, context):
+        buffer = b'{"id": 1, "method": "echo", "pad": ""}'
+        buffer = buffer[:-2] + b'a' * (shared_memory_worker_pool.slot_size - len(buffer)) + buffer[-2:]
+        result = await shared_memory_worker_pool.submit(buffer, context)
+        assert result.responses == [{'id': 1, 'result': 'echo'}]
+        with pytest.raises(ValueError):
+            await shared_memory_worker_pool.submit(buffer + b'{}', context)
+
+    @pytest.mark.asyncio
+    async def test_04_submit_timeout(self, shared_memory_worker_pool, context, echo_encoded):
+        shared_memory_worker_pool.submit_timeout = 0.000001
+        with pytest.raises(asyncio.TimeoutError):
+            await shared_memory_worker_pool.submit(echo_encoded, context)
+        for _ in range(100):
+            if shared_memory_worker_pool._free_slots.qsize() == shared_memory_worker_pool.slots:
+                break
+            await asyncio.sleep(0.05)
+        assert shared_memory_worker_pool._free_slots.qsize() == shared_memory_worker_pool.slots
+
+    @pytest.mark.asyncio
+    async def test_05_adaptor_failed_msg(self, adaptor_worker_pool, echo_exception_request_encoded,
+                                         echo_exception_response_encoded, timestamp, queue):
+        task = adaptor_worker_pool.on_data_received(echo_exception_request_encoded, timestamp)
+        msg = await asyncio.wait_for(queue.get(), 10)
+        await task
+        assert msg == echo_exception_response_encoded
+
+    @pytest.mark.asyncio
+    async def test_06_processed_counts(self, shared_memory_worker_pool, context, echo_encoded,
+                                       echo_exception_request_encoded):
+        result = await shared_memory_worker_pool.submit(echo_encoded * 2 + echo_exception_request_encoded, context)
+        assert (result.num_processed, result.processed_bytes) == (2, len(echo_encoded) * 2)
+        assert (result.num_filtered, result.filtered_bytes) == (0, 0)
+        assert [interval for interval, seconds in result.latencies].count('decode_latency') == 3
+        assert [interval for interval, seconds in result.latencies].count('action_latency') == 2
+
+    @pytest.mark.asyncio
+    async def test_07_adaptor_logs_processed(self, adaptor_worker_pool, context, echo_encoded, timestamp):
+        metrics = MetricsRegistry()
+        adaptor_worker_pool.logger = Logger('receiver', metrics=metrics).get_connection_logger(extra=context)
+        await adaptor_worker_pool.on_data_received(echo_encoded * 2, timestamp)
+        connection_metrics = metrics.connection_metrics('receiver')
+        assert (connection_metrics.msgs_processed, connection_metrics.bytes_processed) == (2, len(echo_encoded) * 2)
+        assert connection_metrics.latencies['decode_latency'].count == 2
+        assert connection_metrics.latencies['action_latency'].count == 2
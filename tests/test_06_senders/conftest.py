@@ -4,7 +4,7 @@ import os
 import pytest
 from dataclasses import replace
 
-from aionetworking import TCPClient, UDPClient, PipeClient, TCPServer
+from aionetworking import TCPClient, UDPClient, PipeClient, TCPServer, ClientPool
 from aionetworking.senders import BaseNetworkClient
 from aionetworking.senders.sftp import SFTPClient
 
@@ -247,3 +247,8 @@ async def tcp_client_connections_expire(protocol_factory_client_connections_expi
                                         actual_server_sock_expired_connections, client_sock) -> TCPServer:
     yield TCPClient(protocol_factory=protocol_factory_client_connections_expire, host=actual_server_sock_expired_connections[0],
                     port=actual_server_sock_expired_connections[1], srcip=client_sock[0], srcport=0)
+
+
+@pytest.fixture
+def client_pool(client) -> ClientPool:
+    return ClientPool(client=client, size=3, health_check_interval=0.1, reconnect_initial_delay=0.05)
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+
+
+@pytest.mark.connections('tcp_twoway_all')
+class TestClientPool:
+    @pytest.mark.asyncio
+    async def test_00_pool_connect_close(self, server_started, client_pool, connections_manager):
+        async with client_pool as pool:
+            assert pool.is_started()
+            assert len(pool.connections) == 3
+            await asyncio.wait_for(server_started.wait_num_connections(3), 1)
+        assert not pool.is_started()
+        await asyncio.wait_for(server_started.wait_num_connections(0), 1)
+
+    @pytest.mark.asyncio
+    async def test_01_pool_least_loaded(self, server_started, client_pool, echo, echo_response_object):
+        async with client_pool as pool:
+            responses = await asyncio.wait_for(asyncio.gather(*[pool.encode_send_wait(echo) for _ in range(3)]), 2)
+            assert responses == [echo_response_object] * 3
+            assert pool.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_02_pool_requester_method(self, server_started, client_pool, echo_response_object):
+        async with client_pool as pool:
+            response = await asyncio.wait_for(pool.echo(), 1)
+            assert response.decoded['result'] == echo_response_object.decoded['result']
+
+    @pytest.mark.asyncio
+    async def test_03_pool_reconnect(self, server_started, client_pool, echo, echo_response_object):
+        async with client_pool as pool:
+            pool.connections[0].transport.abort()
+            await asyncio.sleep(0.3)
+            assert len(pool.connections) == 3
+            response = await asyncio.wait_for(pool.encode_send_wait(echo), 1)
+            assert response == echo_response_object
+
+    @pytest.mark.asyncio
+    async def test_04_pool_connection_refused(self, server_started, client_pool):
+        await server_started.close()
+        with pytest.raises(ConnectionRefusedError):
+            await client_pool.connect()
+        assert not client_pool.is_started()
@@ -6,6 +6,7 @@ import logging.config
 
 from aionetworking.compatibility import create_task
 from aionetworking.logging import PeerFilter, MessageFilter, Logger, ConnectionLogger, ConnectionLoggerStats, StatsTracker, StatsLogger
+from aionetworking.logging import MetricsRegistry, MetricsServer
 from aionetworking.conf import load_all_tags, get_paths, SignalServerManager
 from aionetworking.receivers import TCPServer
 from aionetworking.types.networking import AFINETContext
@@ -302,6 +303,15 @@ async def stats_logger(context) -> StatsLogger:
     await logger.wait_closed()
 
 
+@pytest.fixture
+async def aggregate_stats_logger(caplog) -> Logger:
+    caplog.set_level(logging.INFO, "receiver.stats")
+    logger = Logger('receiver', stats_interval=0, stats_aggregate=True, stats_top_peers=1)
+    yield logger
+    await logger.wait_closed()
+    caplog.set_level(logging.ERROR, "receiver.stats")
+
+
 @pytest.fixture
 def stats_formatter() -> logging.Formatter:
     # noinspection PyPep8
@@ -336,3 +346,54 @@ async def signal_server_manager_started(tmp_config_file) -> SignalServerManager:
     await server_manager.wait_server_stopped()
     await task
 
+
+@pytest.fixture
+def metrics_port(server_port) -> int:
+    return server_port + 100
+
+
+@pytest.fixture
+def tmp_config_file_metrics(tmp_config_file, metrics_port) -> Path:
+    with open(str(tmp_config_file), 'rt') as f:
+        data = f.read()
+    data = data.replace('protocol_factory:', f'metrics: !MetricsServer\n  port: {metrics_port}\nprotocol_factory:', 1)
+    with open(str(tmp_config_file), 'wt') as f:
+        f.write(data)
+    return tmp_config_file
+
+
+@pytest.fixture
+async def signal_server_manager_metrics_started(tmp_config_file_metrics) -> SignalServerManager:
+    server_manager = SignalServerManager(tmp_config_file_metrics)
+    task = create_task(server_manager.serve_until_stopped())
+    await server_manager.wait_server_started()
+    yield server_manager
+    server_manager.close()
+    await server_manager.wait_server_stopped()
+    await task
+
+
+
+@pytest.fixture
+def metrics_registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+@pytest.fixture
+async def metrics_connection_logger(metrics_registry, tcp_server_context_fixed_port) -> ConnectionLogger:
+    logger = Logger('receiver', metrics=metrics_registry)
+    yield logger.get_connection_logger(extra=tcp_server_context_fixed_port)
+
+
+@pytest.fixture
+async def tcp_server_metrics(echo_action, server_sock) -> TCPServer:
+    protocol_factory = StreamServerProtocolFactory(action=echo_action, dataformat=JSONObject, hostname_lookup=False)
+    server = TCPServer(protocol_factory=protocol_factory, host=server_sock[0], port=0, metrics=MetricsServer(port=0))
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+def metrics_yaml() -> str:
+    return "!MetricsServer\nhost: 127.0.0.1\nport: 9101\npath: /stats\n"
@@ -1,7 +1,12 @@
 import logging
 import operator
+import pickle
 import pytest
-from aionetworking.utils import Expression, in_
+import yaml
+from aionetworking.actions import EchoAction
+from aionetworking.conf import load_all_tags
+from aionetworking.logging import MessageFilter
+from aionetworking.utils import Expression, AllOf, AnyOf, filter_from_string, in_
 
 
 class TestExpression:
@@ -50,6 +55,75 @@ class TestExpression:
         assert expr(json_rpc_logout_request_object) is logout
 
 
+class TestCompiledFilters:
+    @pytest.mark.parametrize('expression', ('method = login', 'method i= Login', 'id > 1', 'received', 'not received',
+                                            'method icontains Out', 'method iin Logins'))
+    def test_00_compiled_matches_expression(self, json_rpc_login_request_object, json_rpc_logout_request_object,
+                                            expression):
+        expr = Expression.from_string(expression)
+        compiled = expr.compile()
+        for obj in (json_rpc_login_request_object, json_rpc_logout_request_object):
+            assert compiled(obj) is expr(obj)
+
+    @pytest.mark.parametrize('string,login,logout', (
+        ['method = login and id = 1', True, False],
+        ['method = login and id = 2', False, False],
+        ['method = login or id = 2', True, True],
+        ['method = nothing or method = login and not received', True, False],
+    ))
+    def test_01_and_or(self, json_rpc_login_request_object, json_rpc_logout_request_object, string, login, logout):
+        expr = filter_from_string(string)
+        assert expr(json_rpc_login_request_object) is login
+        assert expr(json_rpc_logout_request_object) is logout
+
+    def test_02_filter_from_string(self):
+        expr = filter_from_string('method = login and id > 1 or method i= LOGOUT')
+        assert expr == AnyOf([AllOf([Expression.from_string('method = login'), Expression.from_string('id > 1')]),
+                              Expression.from_string('method i= LOGOUT')])
+        assert filter_from_string('method = login') == Expression.from_string('method = login')
+        assert filter_from_string('') is None
+
+    def test_03_filter_many(self, json_rpc_login_request_object, json_rpc_logout_request_object):
+        expr = filter_from_string('method = login or id > 5')
+        msgs = [json_rpc_login_request_object, json_rpc_logout_request_object, json_rpc_login_request_object]
+        assert expr.filter_many(msgs) == [True, False, True]
+
+    def test_04_pickle(self, json_rpc_login_request_object):
+        expr = filter_from_string('method = login and id = 1')
+        expr(json_rpc_login_request_object)
+        expr = pickle.loads(pickle.dumps(expr))
+        assert expr(json_rpc_login_request_object) is True
+
+    def test_05_message_filter_from_string(self, log_record_msg_object, log_record_msg_object_not_included):
+        message_filter = MessageFilter('method = login or method = nothing')
+        assert message_filter.filter(log_record_msg_object) is True
+        assert message_filter.filter(log_record_msg_object_not_included) is False
+
+    def test_06_action_exclude(self, json_rpc_login_request_object, json_rpc_logout_request_object):
+        load_all_tags()
+        action = yaml.safe_load('!EchoAction\nexclude: !Filter method = logout or id > 5')
+        assert action == EchoAction(exclude=filter_from_string('method = logout or id > 5'))
+        assert action.filter(json_rpc_login_request_object) is False
+        assert action.filter(json_rpc_logout_request_object) is True
+        assert action.filter_many([json_rpc_logout_request_object, json_rpc_login_request_object]) == [True, False]
+
+    def test_07_quoted_and_or(self):
+        expr = filter_from_string('name = "rock and roll" or name = \'this or that\' and id > 1')
+        this_or_that = Expression.from_string("name = 'this or that'")
+        assert expr == AnyOf([Expression.from_string('name = "rock and roll"'),
+                              AllOf([this_or_that, Expression.from_string('id > 1')])])
+        assert expr.expressions[0].value == 'rock and roll'
+
+    @pytest.mark.parametrize('string,bad', (
+        ['method = login and id > 1 2', "'id > 1 2'"],
+        ['method = login or id ~ 1', "'id ~ 1'"],
+        ['method = login and', 'Empty expression'],
+    ))
+    def test_08_invalid(self, string, bad):
+        with pytest.raises(ValueError, match=bad):
+            filter_from_string(string)
+
+
 class TestPeerFilter:
     def test_00_peer_filter_log_record_included(self, peer_filter, log_record):
         assert peer_filter.filter(log_record) is True
@@ -0,0 +1,143 @@
+import pytest
+import asyncio
+import yaml
+
+from aionetworking.conf import load_all_tags
+from aionetworking.logging import MetricsRegistry, MetricsServer
+
+
+async def http_get(host: str, port: int, path: str) -> bytes:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode())
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+class TestMetricsRegistry:
+    def test_00_render_empty(self, metrics_registry):
+        text = metrics_registry.render()
+        assert '# TYPE aionetworking_msgs_processed_total counter' in text
+        assert '# TYPE aionetworking_latency_seconds histogram' in text
+
+    def test_01_render_counters(self, metrics_registry):
+        metrics = metrics_registry.connection_metrics('receiver')
+        assert metrics_registry.connection_metrics('receiver') is metrics
+        metrics.msgs_processed += 3
+        metrics.latencies['decode_latency'].record(0.002)
+        text = metrics_registry.render()
+        assert 'aionetworking_msgs_processed_total{logger="receiver"} 3' in text
+        assert 'aionetworking_latency_seconds_bucket{logger="receiver",interval="decode",le="+Inf"} 1' in text
+        assert 'aionetworking_latency_seconds_count{logger="receiver",interval="decode"} 1' in text
+
+    def test_02_render_gauge(self, metrics_registry):
+        metrics_registry.add_gauge('queue_depth', 'Queue depth', lambda: [({'path': 'a"b'}, 2)])
+        text = metrics_registry.render()
+        assert '# TYPE aionetworking_queue_depth gauge' in text
+        assert 'aionetworking_queue_depth{path="a\\"b"} 2' in text
+
+    def test_03_custom_prefix(self):
+        registry = MetricsRegistry(prefix='myapp')
+        registry.connection_metrics('sender').msgs_sent += 1
+        assert 'myapp_msgs_sent_total{logger="sender"} 1' in registry.render()
+
+    def test_04_gauge_family(self, metrics_registry):
+        metrics_registry.add_gauge('connections', 'Connections', lambda: [({'server': 'a'}, 1)], key='a')
+        metrics_registry.add_gauge('connections', 'Connections', lambda: [({'server': 'b'}, 2)], key='b')
+        metrics_registry.add_gauge('connections', 'Connections', lambda: [({'server': 'b'}, 3)], key='b')
+        text = metrics_registry.render()
+        assert text.count('# TYPE aionetworking_connections gauge') == 1
+        assert text.count('# HELP aionetworking_connections ') == 1
+        assert 'aionetworking_connections{server="a"} 1' in text
+        assert 'aionetworking_connections{server="b"} 3' in text
+        assert 'aionetworking_connections{server="b"} 2' not in text
+
+    def test_05_remove_gauges(self, metrics_registry):
+        metrics_registry.add_gauge('connections', 'Connections', lambda: [({'server': 'a'}, 1)], key='a')
+        metrics_registry.add_gauge('connections', 'Connections', lambda: [({'server': 'b'}, 2)], key='b')
+        metrics_registry.remove_gauges('a')
+        text = metrics_registry.render()
+        assert 'aionetworking_connections{server="a"}' not in text
+        assert 'aionetworking_connections{server="b"} 2' in text
+        metrics_registry.remove_gauges('b')
+        assert '# TYPE aionetworking_connections gauge' not in metrics_registry.render()
+
+
+class TestConnectionLoggerMetrics:
+    @pytest.mark.asyncio
+    async def test_00_counters(self, metrics_connection_logger, metrics_registry, json_object,
+                               json_rpc_login_request_encoded, zero_division_exception):
+        metrics_connection_logger.new_connection()
+        metrics_connection_logger.on_buffer_received(json_rpc_login_request_encoded)
+        metrics_connection_logger.on_msg_processed(json_object)
+        metrics_connection_logger.on_msg_filtered(json_object)
+        metrics_connection_logger.on_msg_failed(json_object, zero_division_exception)
+        metrics_connection_logger.on_msg_duplicate(json_object)
+        metrics_connection_logger.on_msgs_sent([b'abc', b'de'])
+        metrics_connection_logger.on_batch_sent(2, 5)
+        metrics_connection_logger.record_latency('action_latency', 0.001)
+        metrics_connection_logger.connection_finished()
+        metrics = metrics_registry.connection_metrics('receiver')
+        assert metrics.connections_opened == metrics.connections_closed == 1
+        assert metrics.buffers_received == 1
+        assert metrics.bytes_received == len(json_rpc_login_request_encoded)
+        assert metrics.msgs_processed == metrics.msgs_filtered == metrics.msgs_failed == 1
+        assert metrics.bytes_processed == len(json_object.encoded)
+        assert (metrics.msgs_sent, metrics.bytes_sent) == (2, 5)
+        assert metrics.msgs_duplicate == 1
+        assert metrics.batches_sent == 1
+        assert metrics.latencies['action_latency'].count == 1
+
+    @pytest.mark.asyncio
+    async def test_01_counters_many(self, metrics_connection_logger, metrics_registry):
+        metrics_connection_logger.on_msgs_processed(2, 100)
+        metrics_connection_logger.on_msgs_filtered(1, 40)
+        metrics = metrics_registry.connection_metrics('receiver')
+        assert (metrics.msgs_processed, metrics.bytes_processed) == (2, 100)
+        assert metrics.msgs_filtered == 1
+
+
+class TestMetricsServer:
+    @pytest.mark.asyncio
+    async def test_00_scrape(self, tcp_server_metrics, echo_encoded):
+        reader, writer = await asyncio.open_connection(*tcp_server_metrics.listening_on_sockets[0][0:2])
+        writer.write(echo_encoded)
+        await reader.read(1024)
+        writer.close()
+        await asyncio.wait_for(tcp_server_metrics.protocol_factory.wait_all_closed(), timeout=2)
+        host, port = tcp_server_metrics.metrics.listening_on
+        response = await http_get(host, port, '/metrics')
+        assert response.startswith(b'HTTP/1.1 200 OK')
+        assert b'aionetworking_connections_opened_total{logger="receiver"} 1' in response
+        assert b'aionetworking_msgs_processed_total{logger="receiver"} 1' in response
+        assert b'aionetworking_connections{server="' in response
+        assert b'aionetworking_scheduler_tasks{server="' in response
+
+    @pytest.mark.asyncio
+    async def test_01_not_found(self, tcp_server_metrics):
+        host, port = tcp_server_metrics.metrics.listening_on
+        response = await http_get(host, port, '/other')
+        assert response.startswith(b'HTTP/1.1 404 Not Found')
+
+    @pytest.mark.asyncio
+    async def test_02_closed_with_server(self, tcp_server_metrics):
+        metrics = tcp_server_metrics.metrics
+        await tcp_server_metrics.close()
+        assert metrics.listening_on is None
+
+    def test_03_yaml(self, metrics_yaml):
+        load_all_tags()
+        metrics = yaml.safe_load(metrics_yaml)
+        assert metrics == MetricsServer(host='127.0.0.1', port=9101, path='/stats')
+
+    @pytest.mark.asyncio
+    async def test_04_add_remove_server(self, tcp_server_metrics):
+        metrics = tcp_server_metrics.metrics
+        metrics.add_server(tcp_server_metrics)
+        text = metrics.registry.render()
+        assert text.count('# TYPE aionetworking_connections gauge') == 1
+        assert text.count('aionetworking_connections{server="') == 1
+        await tcp_server_metrics.close()
+        text = metrics.registry.render()
+        assert 'aionetworking_connections{server="' not in text
+        assert '# TYPE aionetworking_file_queue_depth gauge' in text
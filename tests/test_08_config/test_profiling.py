@@ -0,0 +1,42 @@
+import pytest
+import pstats
+
+from aionetworking.logging import SlowMessageSampler, SignalProfiler
+
+
+class TestSlowMessageSampler:
+    def test_00_keeps_slowest(self, context, json_object):
+        sampler = SlowMessageSampler(top=2, interval=0)
+        for seconds in (0.1, 0.3, 0.2, 0.05):
+            sampler('do_one', seconds, json_object, context)
+        assert [sample.seconds for sample in sampler.slowest()] == [0.3, 0.2]
+        sample = sampler.slowest()[0]
+        assert (sample.stage, sample.peer, sample.uid) == ('do_one', context['peer'], json_object.uid)
+
+    def test_01_threshold(self, context, json_object):
+        sampler = SlowMessageSampler(threshold=0.1, interval=0)
+        sampler('decode', 0.01, json_object, context)
+        sampler('decode', 0.2, json_object, context)
+        assert [sample.seconds for sample in sampler.slowest()] == [0.2]
+
+    @pytest.mark.asyncio
+    async def test_02_log_slowest(self, context, json_object, receiver_logger, caplog):
+        caplog.set_level('WARNING', 'receiver')
+        sampler = SlowMessageSampler(interval=0)
+        sampler.start(logger=receiver_logger)
+        sampler('encode', 0.0125, json_object, context)
+        await sampler.close()
+        assert caplog.record_tuples[-1][2] == f'Slow encode for msg {json_object.uid} from {context["peer"]} took 12.500ms'
+        assert sampler.slowest() == []
+
+
+class TestSignalProfiler:
+    def test_00_toggle(self, tmp_path):
+        profiler = SignalProfiler(directory=tmp_path)
+        assert profiler.toggle() is None
+        assert profiler.is_running
+        sum(range(1000))
+        path = profiler.toggle()
+        assert not profiler.is_running
+        assert path.parent == tmp_path
+        assert pstats.Stats(str(path)).total_calls > 0
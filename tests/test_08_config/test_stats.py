@@ -1,6 +1,8 @@
 import logging
 import pytest   # noinspection PyPackageRequirements
 import asyncio
+from aionetworking.logging import ConnectionLoggerStats, StatsTracker
+from aionetworking.logging.utils_logging import LatencyHistogram, LoggingDatetime, BytesSize, LazyInflectEngine
 try:
     import psutil   # noinspection PyPackageRequirements
 except ImportError:
@@ -53,9 +55,163 @@ class TestStatsTracker:
         expected_keys = ['start', 'end', 'msgs', 'sent', 'received', 'processed', 'filtered', 'failed',
                          'largest_buffer', 'send_rate', 'processing_rate', 'receive_rate', 'interval',
                          'average_buffer_size', 'average_sent', 'msgs_per_buffer', 'not_decoded', 'not_decoded_rate',
-                         'total_done']
+                         'total_done', 'batches', 'msgs_per_batch', 'duplicates', 'decode_latency',
+                         'action_latency', 'response_latency', 'request_latency', 'upload_latency']
         assert sorted(list(d)) == sorted(expected_keys)
 
+    def test_04_on_msgs_sent(self, stats_tracker, json_encoded_multi):
+        stats_tracker.on_msgs_sent(json_encoded_multi)
+        assert stats_tracker.msgs.sent == 2
+        assert stats_tracker.msgs.first_sent
+        assert stats_tracker.sent == 126
+
+    def test_05_record_latency(self, stats_tracker):
+        stats_tracker.record_latency('decode_latency', 0.001)
+        stats_tracker.record_latency('action_latency', 0.002)
+        stats_tracker.record_latency('action_latency', 0.004)
+        assert stats_tracker.decode_latency.count == 1
+        assert stats_tracker.action_latency.count == 2
+        assert stats_tracker.response_latency.count == 0
+        assert stats_tracker.request_latency.count == 0
+        assert 1.0 <= stats_tracker.decode_latency.p50 <= 1.1
+        assert stats_tracker.action_latency.p999 == 4.0
+
+    def test_06_plain_counters(self, stats_tracker, json_buffer, json_rpc_login_request_encoded):
+        assert not hasattr(stats_tracker, '__dict__')
+        stats_tracker.on_buffer_received(json_buffer)
+        stats_tracker.on_msg_processed(json_rpc_login_request_encoded)
+        stats_tracker.on_msg_sent(json_rpc_login_request_encoded)
+        assert type(stats_tracker._received) is int
+        assert type(stats_tracker._last_received) is float
+        assert isinstance(stats_tracker.received, BytesSize)
+        assert isinstance(stats_tracker.msgs.first_received, LoggingDatetime)
+        assert stats_tracker.start <= stats_tracker.msgs.first_received <= stats_tracker.msgs.first_sent
+        assert stats_tracker.msgs.first_sent == stats_tracker.msgs.last_sent
+        assert stats_tracker.largest_buffer == 126
+
+    def test_07_merge_clear(self, stats_tracker, json_buffer, json_rpc_login_request_encoded):
+        other = StatsTracker()
+        stats_tracker.on_msg_sent(json_rpc_login_request_encoded)
+        other.on_buffer_received(json_buffer)
+        other.on_msg_processed(json_rpc_login_request_encoded)
+        other.record_latency('decode_latency', 0.001)
+        stats_tracker.merge(other)
+        assert stats_tracker.received == 126
+        assert stats_tracker.processed == 79
+        assert stats_tracker.sent == 79
+        assert stats_tracker.msgs.received == stats_tracker.msgs.processed == stats_tracker.msgs.sent == 1
+        assert stats_tracker.largest_buffer == 126
+        assert stats_tracker.msgs.first_received == other.msgs.first_received
+        assert stats_tracker.decode_latency.count == 1
+        stats_tracker.clear()
+        assert stats_tracker.received == 0
+        assert stats_tracker.msgs.first_received is None
+        assert stats_tracker.msgs.sent == 0
+
+    def test_08_on_batch_sent(self, stats_tracker):
+        assert stats_tracker.batches == 0
+        assert stats_tracker.msgs_per_batch == 0
+        stats_tracker.on_batch_sent(3)
+        stats_tracker.on_batch_sent(2)
+        stats_tracker.record_latency('upload_latency', 0.01)
+        assert stats_tracker.batches == 2
+        assert stats_tracker.msgs_per_batch == 2.5
+        assert stats_tracker.upload_latency.count == 1
+        other = StatsTracker()
+        other.on_batch_sent(1)
+        stats_tracker.merge(other)
+        assert stats_tracker.batches == 3
+        stats_tracker.clear()
+        assert stats_tracker.batches == 0
+
+    def test_09_on_msg_duplicate(self, stats_tracker, json_buffer, json_rpc_login_request_encoded):
+        stats_tracker.on_buffer_received(json_buffer)
+        stats_tracker.on_msg_processed(json_rpc_login_request_encoded)
+        stats_tracker.on_msg_duplicate(json_rpc_login_request_encoded)
+        assert stats_tracker.duplicates == 1
+        assert stats_tracker.msgs.processed == 1
+        assert stats_tracker.total_done == 158
+        other = StatsTracker()
+        other.on_msg_duplicate(json_rpc_login_request_encoded)
+        stats_tracker.merge(other)
+        assert stats_tracker.duplicates == 2
+        stats_tracker.clear()
+        assert stats_tracker.duplicates == 0
+
+    def test_10_on_msgs_processed_filtered(self, stats_tracker, json_buffer):
+        stats_tracker.on_buffer_received(json_buffer)
+        stats_tracker.on_msgs_processed(2, 100)
+        stats_tracker.on_msgs_filtered(1, 40)
+        assert stats_tracker.msgs.processed == 2
+        assert stats_tracker.processed == 100
+        assert stats_tracker.msgs.filtered == 1
+        assert stats_tracker.filtered == 40
+        assert stats_tracker.msgs.last_processed is not None
+
+
+class TestLatencyHistogram:
+    def test_00_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.count == 0
+        assert histogram.p50 == histogram.p999 == 0.0
+        assert str(histogram) == 'p50=0.000ms p90=0.000ms p99=0.000ms p999=0.000ms'
+
+    def test_01_percentiles(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.record(i / 1000000)
+        assert histogram.count == 1000
+        assert histogram.max == 0.001
+        assert 0.5 <= histogram.p50 <= 0.5 * 2 ** (1 / 8)
+        assert 0.9 <= histogram.p90 <= 0.9 * 2 ** (1 / 8)
+        assert 0.99 <= histogram.p99 <= 1.0
+        assert histogram.p999 == 1.0
+        assert histogram.p50 < histogram.p90 < histogram.p99 <= histogram.p999
+        assert 0.5 <= histogram.mean <= 0.501
+
+    def test_02_tail(self):
+        histogram = LatencyHistogram()
+        for _ in range(990):
+            histogram.record(0.0001)
+        for _ in range(10):
+            histogram.record(0.5)
+        assert histogram.p50 < 0.11
+        assert histogram.p90 < 0.11
+        assert histogram.p99 < 0.11
+        assert histogram.p999 == 500.0
+
+    def test_03_out_of_range(self):
+        histogram = LatencyHistogram(max_seconds=1)
+        histogram.record(0)
+        histogram.record(5)
+        assert histogram.counts[0] == 1
+        assert histogram.counts[-1] == 1
+        assert histogram.p50 == 0.001
+        assert histogram.p999 == 5000.0
+
+    def test_04_merge_reset(self):
+        histogram1 = LatencyHistogram()
+        histogram2 = LatencyHistogram()
+        histogram1.record(0.001)
+        histogram2.record(0.003)
+        histogram1.merge(histogram2)
+        assert histogram1.count == 2
+        assert histogram1.max == 0.003
+        assert histogram1.p999 == 3.0
+        histogram1.reset()
+        assert histogram1.count == 0
+        assert sum(histogram1.counts) == 0
+        assert histogram1.max == 0.0
+
+
+class TestLazyInflectEngine:
+    @pytest.mark.asyncio
+    async def test_00_load(self):
+        engine = LazyInflectEngine()
+        await engine.load()
+        assert LazyInflectEngine._engine is not None
+        assert engine.no('message', 2) == '2 messages'
+
 
 class TestStatsLogger:
     @pytest.mark.asyncio
@@ -67,7 +223,9 @@ class TestStatsLogger:
                          'filtered', 'host', 'interval', 'largest_buffer', 'msgs', 'msgs_per_buffer',
                          'not_decoded', 'not_decoded_rate', 'own', 'peer', 'port', 'processed', 'processing_rate',
                          'protocol_name', 'receive_rate', 'received', 'send_rate', 'sent', 'server',
-                         'start', 'taskname', 'total_done']
+                         'start', 'taskname', 'total_done', 'batches', 'msgs_per_batch', 'duplicates',
+                         'decode_latency',
+                         'action_latency', 'response_latency', 'request_latency', 'upload_latency']
         if psutil:
             expected_keys.append('system')
         assert sorted(keys) == sorted(expected_keys)
@@ -143,3 +301,75 @@ class TestStatsLogger:
         stats_logger.on_msg_processed(json_rpc_login_request_encoded)
         stats_logger.connection_finished()
         assert caplog.text.startswith(f'{client_sock_str} END 0 1 0.00KB 0.08KB')
+
+    @pytest.mark.asyncio
+    async def test_06_interval_latency(self, stats_logger, caplog):
+        caplog.clear()
+        caplog.set_level(logging.INFO, logger=stats_logger.logger_name)
+        caplog.handler.setFormatter(logging.Formatter(
+            "{msg} {decode_latency.count} {action_latency.p99:.3f} {response_latency}", style='{'))
+        stats_logger.record_latency('decode_latency', 0.001)
+        stats_logger.record_latency('action_latency', 0.002)
+        stats_logger.periodic_log()
+        assert caplog.text.startswith(
+            'INTERVAL 1 2.000 p50=0.000ms p90=0.000ms p99=0.000ms p999=0.000ms')
+        assert stats_logger.decode_latency.count == 0
+
+
+class TestStatsAggregator:
+    @pytest.mark.asyncio
+    async def test_00_shared_aggregator(self, aggregate_stats_logger, context):
+        conn1 = aggregate_stats_logger.get_connection_logger(extra=dict(context, peer='127.0.0.1:60001'))
+        conn2 = aggregate_stats_logger.get_connection_logger(extra=dict(context, peer='127.0.0.1:60002'))
+        assert isinstance(conn1, ConnectionLoggerStats)
+        assert conn1._stats_aggregator is conn2._stats_aggregator is aggregate_stats_logger._stats_aggregator
+        assert isinstance(conn1._stats_logger, StatsTracker)
+        assert conn1._stats_aggregator.num_connections == 2
+        assert not conn1._stats_aggregator._scheduler.task_count
+        conn1.connection_finished()
+        conn2.connection_finished()
+        assert aggregate_stats_logger._stats_aggregator.num_connections == 0
+
+    @pytest.mark.asyncio
+    async def test_01_periodic_log(self, aggregate_stats_logger, context, json_buffer, json_rpc_login_request_encoded,
+                                   caplog):
+        conn1 = aggregate_stats_logger.get_connection_logger(extra=dict(context, peer='127.0.0.1:60001'))
+        conn2 = aggregate_stats_logger.get_connection_logger(extra=dict(context, peer='127.0.0.1:60002'))
+        conn1.on_buffer_received(json_rpc_login_request_encoded)
+        conn2.on_buffer_received(json_buffer)
+        conn2.record_latency('action_latency', 0.002)
+        caplog.clear()
+        aggregate_stats_logger._stats_aggregator.periodic_log()
+        records = [r for r in caplog.records if r.name == 'receiver.stats']
+        assert len(records) == 1
+        record = records[0]
+        assert record.msg == 'INTERVAL'
+        assert record.connections == 2
+        assert record.received == 205
+        assert record.msgs.received == 2
+        assert record.action_latency.p50 == 2.0
+        assert record.top_peers == [('127.0.0.1:60002', 1, 126)]
+        assert conn1._stats_logger.received == 0
+        assert conn2._stats_logger.action_latency.count == 0
+
+    @pytest.mark.asyncio
+    async def test_02_connection_finished(self, aggregate_stats_logger, context, json_rpc_login_request_encoded,
+                                          caplog):
+        conn1 = aggregate_stats_logger.get_connection_logger(extra=dict(context, peer='127.0.0.1:60001'))
+        conn2 = aggregate_stats_logger.get_connection_logger(extra=dict(context, peer='127.0.0.1:60002'))
+        conn1.on_buffer_received(json_rpc_login_request_encoded)
+        caplog.clear()
+        conn1.connection_finished()
+        records = [r for r in caplog.records if r.name == 'receiver.stats']
+        assert [(r.msg, r.peer, r.received) for r in records] == [('ALL', '127.0.0.1:60001', 79)]
+        caplog.clear()
+        aggregate_stats_logger._stats_aggregator.log_connection_stats('127.0.0.1:60002')
+        records = [r for r in caplog.records if r.name == 'receiver.stats']
+        assert [(r.msg, r.peer, r.received) for r in records] == [('DETAIL', '127.0.0.1:60002', 0)]
+        caplog.clear()
+        conn2.connection_finished()
+        await aggregate_stats_logger.wait_closed()
+        records = [r for r in caplog.records if r.name == 'receiver.stats']
+        assert [(r.msg, r.received) for r in records] == [('ALL', 0), ('END', 79)]
+        assert records[1].connections == 0
+        assert aggregate_stats_logger._stats_aggregator is None
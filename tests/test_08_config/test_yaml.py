@@ -6,6 +6,7 @@ import os
 from unittest.mock import call
 from aionetworking.compatibility import create_task
 from aionetworking.conf.yaml_config import node_from_config_file
+from aionetworking.networking.connections_manager import connections_manager
 from aionetworking.utils import port_from_out
 
 
@@ -240,3 +241,94 @@ class TestSignalServerManager:
             daemon.notify.assert_has_calls(
                 [status_call(port), ready_call, stopping_call])
             assert daemon.notify.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_08_reload_touched_no_change(self, signal_server_manager_started, tmp_config_file, reset_logging):
+        current_server_id = id(signal_server_manager_started.server)
+        modified = signal_server_manager_started.modified_time + 1
+        os.utime(str(tmp_config_file), (modified, modified))
+        signal_server_manager_started.check_reload()
+        await asyncio.wait_for(signal_server_manager_started._reload_task, timeout=2)
+        assert not signal_server_manager_started._restart_event.is_set()
+        assert signal_server_manager_started.server_is_started()
+        assert id(signal_server_manager_started.server) == current_server_id
+
+    @pytest.mark.asyncio
+    async def test_09_reload_action_in_place(self, signal_server_manager_started, tmp_config_file, reset_logging):
+        server = signal_server_manager_started.server
+        old_action = server.protocol_factory.action
+        port = server.listening_on_sockets[0][1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await server.wait_num_connections(1)
+        with open(str(tmp_config_file), "rt") as f:
+            data = f.read().replace('close_file_after_inactivity: 2', 'close_file_after_inactivity: 3', 1)
+        with open(str(tmp_config_file), 'wt') as f:
+            f.write(data)
+        signal_server_manager_started.check_reload()
+        await asyncio.wait_for(signal_server_manager_started._reload_task, timeout=2)
+        assert not signal_server_manager_started._restart_event.is_set()
+        assert signal_server_manager_started.server is server
+        assert server.is_started
+        assert server.protocol_factory.action is not old_action
+        assert server.protocol_factory.action.close_file_after_inactivity == 3
+        conn = next(filter(server.protocol_factory.is_owner, connections_manager))
+        assert conn._adaptor.action is server.protocol_factory.action
+        writer.close()
+        await asyncio.wait_for(server.wait_all_connections_closed(), timeout=2)
+
+    @pytest.mark.asyncio
+    async def test_10_reload_listener_handoff(self, signal_server_manager_started, tmp_config_file, reset_logging):
+        old_server = signal_server_manager_started.server
+        port = old_server.listening_on_sockets[0][1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await old_server.wait_num_connections(1)
+        self.modify_config_file(tmp_config_file)
+        signal_server_manager_started.check_reload()
+        await asyncio.wait_for(signal_server_manager_started._reload_task, timeout=2)
+        new_server = signal_server_manager_started._next_server
+        assert new_server.is_started
+        assert old_server.protocol_factory.num_connections == 1
+        new_port = new_server.listening_on_sockets[0][1]
+        reader2, writer2 = await asyncio.open_connection('::1', new_port)
+        await new_server.wait_num_connections(1)
+        writer.close()
+        writer2.close()
+        await asyncio.wait_for(signal_server_manager_started.wait_server_stopped(), timeout=2)
+        await asyncio.wait_for(signal_server_manager_started.wait_server_started(), timeout=2)
+        assert signal_server_manager_started.server is new_server
+
+    @staticmethod
+    async def scrape_metrics(port: int) -> bytes:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'GET /metrics HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n')
+        response = await reader.read()
+        writer.close()
+        return response
+
+    @pytest.mark.asyncio
+    async def test_11_reload_listener_handoff_metrics(self, signal_server_manager_metrics_started,
+                                                      tmp_config_file_metrics, metrics_port, reset_logging):
+        manager = signal_server_manager_metrics_started
+        old_server = manager.server
+        metrics = old_server.metrics
+        assert metrics.listening_on == ('127.0.0.1', metrics_port)
+        port = old_server.listening_on_sockets[0][1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await old_server.wait_num_connections(1)
+        self.modify_config_file(tmp_config_file_metrics)
+        manager.check_reload()
+        await asyncio.wait_for(manager._reload_task, timeout=2)
+        new_server = manager._next_server
+        assert new_server.is_started
+        assert new_server.metrics is metrics
+        assert metrics.listening_on == ('127.0.0.1', metrics_port)
+        assert old_server.protocol_factory.num_connections == 1
+        assert (await self.scrape_metrics(metrics_port)).startswith(b'HTTP/1.1 200 OK')
+        writer.close()
+        await asyncio.wait_for(old_server.wait_stopped(), timeout=2)
+        await asyncio.wait_for(manager.wait_server_started(), timeout=2)
+        assert manager.server is new_server
+        assert metrics.listening_on == ('127.0.0.1', metrics_port)
+        response = await self.scrape_metrics(metrics_port)
+        assert response.count(b'aionetworking_connections{server="') == 1
+        assert b'aionetworking_connections{server="TCP Server ::1' in response
@@ -0,0 +1,62 @@
+import pytest
+
+from benchmarks import compare, regressions, run_benchmark, select_benchmarks, percentile
+from benchmarks.startup import loaded_modules
+
+
+def run(**results) -> dict:
+    return {'meta': {}, 'results': [dict(name=name, error=None, **values) for name, values in results.items()]}
+
+
+class TestBenchmarks:
+    def test_00_select_benchmarks(self):
+        assert select_benchmarks(['codecs'], ['json']) == ['codec.json.encode', 'codec.json.decode']
+        assert 'network.tcp.oneway.ssl' in select_benchmarks(['network'])
+
+    def test_01_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 51
+        assert percentile(values, 99) == 99
+        assert percentile([], 99) is None
+
+    @pytest.mark.asyncio
+    async def test_02_run_benchmark(self):
+        result = await run_benchmark('codec.json.decode', 250)
+        assert result.error is None
+        assert result.msgs == 250
+        assert result.msgs_per_second > 0
+        assert 0 < result.p50_ms <= result.p99_ms
+        assert result.rss_mb > 0
+
+    def test_03_compare_no_regressions(self):
+        base = run(a={'msgs_per_second': 1000, 'p50_ms': 1, 'p99_ms': 2, 'rss_mb': 30})
+        new = run(a={'msgs_per_second': 950, 'p50_ms': 1.05, 'p99_ms': 2.1, 'rss_mb': 31})
+        comparisons = compare(base, new)
+        assert len(comparisons) == 4
+        assert regressions(comparisons) == []
+
+    def test_04_compare_regressions(self):
+        base = run(a={'msgs_per_second': 1000, 'p50_ms': 1, 'p99_ms': 2, 'rss_mb': 30},
+                   b={'msgs_per_second': 1000, 'p50_ms': None, 'p99_ms': None, 'rss_mb': 30})
+        new = run(a={'msgs_per_second': 800, 'p50_ms': 1, 'p99_ms': 3, 'rss_mb': 30},
+                  b={'msgs_per_second': 1200, 'p50_ms': None, 'p99_ms': None, 'rss_mb': 30})
+        found = regressions(compare(base, new))
+        assert [(c.name, c.metric) for c in found] == [('a', 'msgs_per_second'), ('a', 'p99_ms')]
+
+    def test_05_compare_new_error(self):
+        base = run(a={'msgs_per_second': 1000})
+        new = run(a={'msgs_per_second': 0})
+        new['results'][0]['error'] = 'TimeoutError: '
+        found = regressions(compare(base, new))
+        assert [(c.name, c.metric) for c in found] == [('a', 'error')]
+
+    def test_06_startup_defers_optional_imports(self):
+        assert loaded_modules() == []
+        assert loaded_modules('import aionetworking; aionetworking.TCPServer') == []
+
+    @pytest.mark.asyncio
+    async def test_07_startup_benchmark(self):
+        result = await run_benchmark('startup.import', 2)
+        assert result.error is None
+        assert result.msgs == 2
+        assert result.p50_ms > 0